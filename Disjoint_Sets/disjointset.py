@@ -30,16 +30,25 @@ would give us a structure like this
 2   6   9
 |
 3
+
+Positions are great when our data is already numbered 0 to n - 1, but most of the
+time we want to ask about the data itself (a vertex in a graph, a word, ...). For that
+we keep a hash table (slots) that maps every element to its position in the array.
+findItem, unionItems and makeSet work with the elements directly and only cost one extra
+hash table lookup on top of find and union. Elements have to be hashable and unique.
 '''
 class DisjointSet():
     def __init__(self, lst = None):
         '''
         We only need to keep track of the array in a disjoint set. Each element 
-        can be mapped to an integer.
+        can be mapped to an integer. The slots hash table maps each element
+        to that integer.
         '''
         self.array = []
+        self.slots = {}
         if lst:
             self.array = [datanode.DataNode(data) for data in lst]
+            self.slots = {node.data: position for position, node in enumerate(self.array)}
 
     def insertelements(self, x):
         '''
@@ -102,6 +111,50 @@ class DisjointSet():
         self.array[position].index = index
         return index
 
+    def makeSet(self, item):
+        '''
+        Adds a new element to our disjoint set in its own set. Does nothing if
+        the element is already in the disjoint set.
+        INPUT:
+            item: Element we are adding
+        OUTPUT:
+            Position of the element in our array
+
+        Runtime -- O(1) amortized
+        '''
+
+        if item not in self.slots:
+            self.slots[item] = len(self.array)
+            self.array.append(datanode.DataNode(item))
+        return self.slots[item]
+
+    def findItem(self, item):
+        '''
+        Same as find but works with an element instead of its position.
+        INPUT:
+            item: Element we are looking for
+        OUTPUT:
+            Representative element of the set that contains item
+
+        Runtime -- O(1)* -- One hash table lookup plus find.
+        '''
+
+        return self.array[self.find(self.slots[item])].data
+
+    def unionItems(self, item1, item2):
+        '''
+        Same as union but works with elements instead of positions.
+        INPUT:
+            item1: Element in the first set
+            item2: Element in the second set
+        OUTPUT:
+            Smart unioned set.
+
+        Runtime -- O(1)* -- Two hash table lookups plus union.
+        '''
+
+        self.union(self.slots[item1], self.slots[item2])
+
     def size(self, index):
         '''
         This function will return the size of our uptree or set. First
@@ -1,3 +1,21 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__))) # The modules below import each other by name
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # and the other packages by name
 from Graphs import graph
 from Graphs import edge
-from Graphs import vertex
\ No newline at end of file
+from Graphs import vertex
+from Graphs import csrgraph
+from Graphs import allpairs
+from Graphs import multisource
+from Graphs import edgelist
+from Graphs import snapshot
+from Graphs import contraction
+from Graphs import centrality
+from Graphs import matrixgraph
+from Graphs import boruvka
+from Graphs import maxflow
+from Graphs import triangles
+from Graphs import landmarks
+from Graphs import dynamicpaths
+from Graphs import communities
@@ -0,0 +1,230 @@
+import numpy as np
+import csrgraph # Used for Dijkstra's in Johnson's algorithm
+
+'''
+Written by David Terpay
+All pairs shortest paths on a dense distance matrix. Graph.floydWarshall builds the
+matrices out of its list of edges and hands them to the functions in this file.
+
+We keep two n x n matrices indexed by vertex id:
+    distance[i, j]: length of the shortest path from i to j we know of so far
+        (0 on the diagonal, inf if there is no path)
+    nextHop[i, j]: id of the vertex right after i on that path (-1 if there is no path)
+
+Floyd Warshall's algorithm runs n rounds. In round k we allow paths to go through
+vertex k, so every entry becomes
+    distance[i, j] = min(distance[i, j], distance[i, k] + distance[k, j])
+Instead of looping over i and j in python, we do the whole round at once with NumPy:
+distance[:, k] is a column and distance[k, :] is a row, adding them with broadcasting
+gives every distance[i, k] + distance[k, j] in one n x n matrix. This is a min-plus
+version of a rank one update. Whenever going through k is shorter, the next hop
+from i towards j becomes the next hop from i towards k.
+
+For large matrices we can also process the matrix in square tiles (blocked Floyd
+Warshall). For every block of b pivots K we
+    1. update the rows and columns that belong to K, one pivot at a time
+    2. update every other tile (I, J) with a single min-plus product of the tiles
+        (I, K) and (K, J), which only touches three b x b tiles at a time
+Both versions give the same distances.
+
+Runtime -- O(n ^ 3) -- but every round is a handful of vectorized passes over the matrix.
+Memory -- O(n ^ 2)
+
+On sparse graphs Johnson's algorithm fills the same two matrices with one run of
+Dijkstra's algorithm per vertex on the CSR arrays (see csrgraph.py) instead. The edges
+are reweighted first with the potentials from Bellman Ford's algorithm (see
+Graph.johnson) so that none of them is negative.
+
+Runtime -- O(n(n + m)lg(n))
+'''
+
+
+def buildMatrices(n, edges, directed = False):
+    '''
+    Builds the starting distance and next hop matrices.
+    INPUT:
+        n: Number of vertices
+        edges: Iterable of (origin id, destination id, weight) tuples
+        directed: If False every edge can be used in both directions
+    OUTPUT:
+        (distance, nextHop) matrices
+    '''
+
+    distance = np.full((n, n), np.inf)
+    nextHop = np.full((n, n), -1, dtype=np.int64)
+    for i, j, w in edges:
+        if w < distance[i, j]:
+            distance[i, j] = w
+            nextHop[i, j] = j
+        if not directed and w < distance[j, i]:
+            distance[j, i] = w
+            nextHop[j, i] = i
+    diagonal = np.arange(n)
+    selfLoops = distance[diagonal, diagonal] < 0
+    distance[diagonal, diagonal] = np.where(selfLoops, distance[diagonal, diagonal], 0)
+    nextHop[diagonal, diagonal] = diagonal
+    return distance, nextHop
+
+
+def floydWarshall(distance, nextHop, blockSize = None):
+    '''
+    Runs Floyd Warshall's algorithm in place on the matrices from buildMatrices.
+    INPUT:
+        distance: n x n distance matrix
+        nextHop: n x n next hop matrix
+        blockSize: Size of the tiles for the blocked version (None runs one
+            vectorized update of the whole matrix per pivot)
+    OUTPUT:
+        (distance, nextHop) with the shortest paths between every pair of vertices
+
+    Raises ValueError if the graph has a negative cycle.
+    '''
+
+    n = distance.shape[0]
+    if blockSize is None or blockSize >= n:
+        for k in range(n):
+            _relax(distance, nextHop, slice(None), slice(None), k)
+    else:
+        for low in range(0, n, blockSize):
+            pivots = slice(low, min(low + blockSize, n))
+            for k in range(pivots.start, pivots.stop):
+                _relax(distance, nextHop, pivots, slice(None), k)
+                _relax(distance, nextHop, slice(None), pivots, k)
+            for rowLow in range(0, n, blockSize):
+                rows = slice(rowLow, min(rowLow + blockSize, n))
+                if rows == pivots:
+                    continue
+                for columnLow in range(0, n, blockSize):
+                    columns = slice(columnLow, min(columnLow + blockSize, n))
+                    if columns == pivots:
+                        continue
+                    _minPlusTile(distance, nextHop, rows, columns, pivots)
+
+    if (np.diagonal(distance) < 0).any():
+        raise ValueError('graph contains a negative cycle')
+    return distance, nextHop
+
+
+def _relax(distance, nextHop, rows, columns, k):
+    '''
+    Lets every path from rows to columns go through vertex k.
+    INPUT:
+        distance: Distance matrix
+        nextHop: Next hop matrix
+        rows: Slice of rows we are updating
+        columns: Slice of columns we are updating
+        k: Pivot vertex
+    '''
+
+    through = np.add.outer(distance[rows, k], distance[k, columns])
+    tile = distance[rows, columns]
+    better = through < tile
+    changed = np.flatnonzero(better.any(axis=1))
+    if changed.size:
+        np.minimum(tile, through, out=tile)
+        hops = nextHop[rows, columns]
+        hops[changed] = np.where(better[changed], nextHop[rows, k][changed, None], hops[changed])
+
+
+def _minPlusTile(distance, nextHop, rows, columns, pivots):
+    '''
+    Updates the tile (rows, columns) with the min-plus product of the tiles
+    (rows, pivots) and (pivots, columns).
+    INPUT:
+        distance: Distance matrix
+        nextHop: Next hop matrix
+        rows: Slice of rows of the tile
+        columns: Slice of columns of the tile
+        pivots: Slice of pivots
+    '''
+
+    through = distance[rows, pivots][:, :, None] + distance[pivots, columns][None, :, :]
+    best = through.argmin(axis=1)
+    shortest = np.take_along_axis(through, best[:, None, :], axis=1)[:, 0, :]
+    tile = distance[rows, columns]
+    better = shortest < tile
+    np.copyto(tile, shortest, where=better)
+    rowIds = np.arange(best.shape[0])[:, None]
+    np.copyto(nextHop[rows, columns], nextHop[rows, pivots][rowIds, best], where=better)
+
+
+def johnson(offsets, targets, weights, potential):
+    '''
+    Runs Dijkstra's algorithm from every vertex on reweighted CSR arrays.
+    INPUT:
+        offsets: CSR offsets
+        targets: CSR targets
+        weights: CSR weights
+        potential: Potential h(v) of every vertex from Bellman Ford's algorithm
+    OUTPUT:
+        (distance, nextHop) matrices
+    '''
+
+    n = len(offsets) - 1
+    potential = np.asarray(potential, dtype=np.float64)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    targets = np.asarray(targets, dtype=np.int64)
+    sources = np.repeat(np.arange(n), np.diff(offsets))
+    # Rounding can leave -1e-16 where the new weight should be 0
+    reweighted = np.maximum(np.asarray(weights, dtype=np.float64) + potential[sources] - potential[targets], 0)
+    offsets = offsets.tolist()
+    targets = targets.tolist()
+    reweighted = reweighted.tolist()
+
+    distance = np.empty((n, n))
+    nextHop = np.empty((n, n), dtype=np.int64)
+    for s in range(n):
+        shortest, predecessor = csrgraph.dijkstraArrays(offsets, targets, reweighted, s)
+        distance[s] = np.asarray(shortest) - potential[s] + potential
+        nextHop[s] = _nextHops(predecessor, s)
+    return distance, nextHop
+
+
+def _nextHops(predecessor, s):
+    '''
+    Turns the predecessor array of a shortest path tree rooted at s into the row of
+    the next hop matrix for s. Every vertex walks up the tree until it reaches a vertex
+    whose next hop we already know, then every vertex on the way gets the same one.
+    Vertices that cannot be reached keep -1.
+    '''
+
+    n = len(predecessor)
+    hops = [-1] * n
+    known = bytearray(n)
+    hops[s] = s
+    known[s] = True
+    for t in range(n):
+        path = []
+        u = t
+        while not known[u] and predecessor[u] >= 0:
+            path.append(u)
+            u = predecessor[u]
+        known[u] = True
+        for v in reversed(path):
+            if hops[u] >= 0:
+                hops[v] = v if u == s else hops[u]
+            known[v] = True
+            u = v
+    return hops
+
+
+def reconstructPath(nextHop, origin, destination):
+    '''
+    Follows the next hop matrix from origin to destination.
+    INPUT:
+        nextHop: Next hop matrix from floydWarshall
+        origin: Id of the first vertex
+        destination: Id of the last vertex
+    OUTPUT:
+        List of vertex ids on the shortest path, empty if there is no path
+
+    Runtime -- O(length of the path)
+    '''
+
+    if nextHop[origin, destination] < 0:
+        return []
+    path = [origin]
+    while origin != destination:
+        origin = int(nextHop[origin, destination])
+        path.append(origin)
+    return path
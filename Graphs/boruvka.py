@@ -0,0 +1,223 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.sharedctypes import RawArray # Shared with the workers instead of pickled
+import numpy as np
+import os
+
+'''
+Written by David Terpay
+Borůvka's algorithm for minimum spanning trees (the oldest one, from 1926). Kruskal's
+algorithm looks at the edges one at a time in sorted order and Prim's grows a single
+tree one vertex at a time, so both are sequential by nature. Borůvka's works in rounds
+over the whole graph at once:
+    1. Every component (at the start, every vertex) picks the cheapest edge leaving it.
+    2. All of those edges belong to the minimum spanning tree, so we add them and merge
+        the components they connect.
+    3. Repeat until no component has an edge leaving it.
+Every round at least halves the number of components (every component merges with at
+least one other), so there are at most lg(n) rounds. To make sure the picked edges never
+form a cycle when several edges have the same weight, we break ties by the position of
+the edge in the list, which is the same as sorting the edges by (weight, position) once
+and comparing their ranks.
+
+Step 1 is where all of the work is, and it does not depend on the order we look at the
+edges in. With NumPy it is a single np.minimum.at: every edge offers its rank to the
+component of both of its vertices and every component keeps the smallest offer. With
+workers > 1 the edges are split into chunks, every worker process finds the cheapest
+edge of every component in its own chunk, and we keep the smallest of their answers.
+The edges and the component labels live in shared memory that the workers map when
+they start. Every round we overwrite the labels in place, so a task is only the bounds
+of its chunk and nothing of size n or m is pickled. A worker answers with the cheapest
+edge of the components that appear in its chunk only. Edges inside a component can
+never be picked again, so in the single process version we drop them after every round.
+
+Step 2 is vectorized too. The picked edges connect component labels, and we find the
+components of that small graph by hooking: every label points at the smallest label it
+is connected to so far (np.minimum.at over the picked edges) and we follow the pointers
+until they stop changing (pointer jumping), and repeat while a picked edge still
+connects two different labels. Labels only ever get smaller, so the pointers form a
+forest and we never call union or find in python. Every pointer jumping pass halves
+the length of every path in the forest, so it stops after O(lg(c)) passes for c
+components. A label that still has a picked edge to another label either hooks onto
+a smaller one or is the smallest of its neighbors. In the second case it gains a
+child, or all of its neighbors hooked elsewhere and it hooks onto one of them in the
+next pass. So the number of labels halves every two hooking passes and there are
+O(lg(c)) of them. Merging the c components of a round therefore takes
+O(n + clg^2(c)) time, and since c at least halves every round the merges add up to
+O(nlg^2(n)) over the whole algorithm.
+
+Runtime -- O(mlg(n) + nlg^2(n)) -- lg(n) rounds that each look at every edge once,
+plus the merges
+'''
+
+_shared = None
+
+
+def _initializeWorker(origins, destinations, ranks, component):
+    '''
+    Runs once in every worker process and maps the shared edges and component labels.
+    '''
+
+    global _shared
+    _shared = tuple(np.frombuffer(values, dtype=np.int64) for values in (origins, destinations, ranks, component))
+
+
+def _cheapestInChunk(low, high):
+    '''
+    Task run by a worker. Finds the cheapest edge leaving every component among the
+    edges low to high, using the labels the parent wrote for this round.
+    OUTPUT:
+        (components, ranks) arrays, only for components with an edge in the chunk
+    '''
+
+    origins, destinations, ranks, component = _shared
+    first = component[origins[low:high]]
+    second = component[destinations[low:high]]
+    leaving = first != second
+    ends = np.concatenate((first[leaving], second[leaving]))
+    offers = np.concatenate((ranks[low:high][leaving], ranks[low:high][leaving]))
+    components, inverse = np.unique(ends, return_inverse=True)
+    best = np.full(len(components), np.iinfo(np.int64).max, dtype=np.int64)
+    np.minimum.at(best, inverse, offers)
+    return components, best
+
+
+def _cheapest(component, origins, destinations, ranks):
+    '''
+    Returns an array with the rank of the cheapest edge leaving every component (the
+    largest int64 if a component has none).
+    '''
+
+    best = np.full(len(component), np.iinfo(np.int64).max, dtype=np.int64)
+    first = component[origins]
+    second = component[destinations]
+    leaving = first != second
+    np.minimum.at(best, first[leaving], ranks[leaving])
+    np.minimum.at(best, second[leaving], ranks[leaving])
+    return best
+
+
+def _share(values):
+    '''
+    Copies an int64 array into shared memory.
+    OUTPUT:
+        (shared buffer for the workers, NumPy view of it)
+    '''
+
+    shared = RawArray('q', len(values))
+    view = np.frombuffer(shared, dtype=np.int64)
+    view[:] = values
+    return shared, view
+
+
+def minimumSpanningForest(n, origins, destinations, weights, workers = 1, chunkSize = None):
+    '''
+    Runs Borůvka's algorithm on a list of undirected edges.
+    INPUT:
+        n: Number of vertices
+        origins: Id of the first vertex of every edge
+        destinations: Id of the second vertex of every edge
+        weights: Weight of every edge
+        workers: Number of worker processes for step 1 (None uses every core)
+        chunkSize: Number of edges per task when workers > 1 (default splits the edges
+            into 4 chunks per worker)
+    OUTPUT:
+        NumPy array with the positions of the edges in the minimum spanning forest
+    '''
+
+    origins = np.asarray(origins, dtype=np.int64)
+    destinations = np.asarray(destinations, dtype=np.int64)
+    m = len(origins)
+    order = np.lexsort((np.arange(m), np.asarray(weights, dtype=np.float64)))
+    ranks = np.empty(m, dtype=np.int64)
+    ranks[order] = np.arange(m)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers == 1:
+        live = np.arange(m)
+        def cheapest(component):
+            nonlocal live
+            live = live[component[origins[live]] != component[destinations[live]]]
+            return _cheapest(component, origins[live], destinations[live], ranks[live])
+        return _rounds(n, origins, destinations, order, cheapest)
+
+    chunkSize = chunkSize or max(1, -(-m // (4 * workers)))
+    lows = list(range(0, m, chunkSize))
+    highs = [min(low + chunkSize, m) for low in lows]
+    shared = [_share(values)[0] for values in (origins, destinations, ranks)]
+    labels, sharedComponent = _share(np.arange(n))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_initializeWorker,
+                             initargs=(*shared, labels)) as pool:
+        def cheapest(component):
+            sharedComponent[:] = component # The workers see the new labels right away
+            best = np.full(n, np.iinfo(np.int64).max, dtype=np.int64)
+            for components, offers in pool.map(_cheapestInChunk, lows, highs):
+                np.minimum.at(best, components, offers)
+            return best
+        return _rounds(n, origins, destinations, order, cheapest)
+
+
+def _rounds(n, origins, destinations, order, cheapest):
+    '''
+    The rounds of Borůvka's algorithm.
+    INPUT:
+        n: Number of vertices
+        origins: Id of the first vertex of every edge
+        destinations: Id of the second vertex of every edge
+        order: Positions of the edges sorted by rank
+        cheapest: Function from component labels to the cheapest edge rank of every component
+    OUTPUT:
+        NumPy array with the positions of the chosen edges
+    '''
+
+    component = np.arange(n, dtype=np.int64)
+    chosen = []
+    while True:
+        best = cheapest(component)
+        picked = np.unique(best[best < len(order)])
+        if not picked.size:
+            break
+        positions = order[picked]
+        chosen.append(positions)
+        component = _merge(component, component[origins[positions]], component[destinations[positions]])
+    if not chosen:
+        return np.zeros(0, dtype=np.int64)
+    return np.concatenate(chosen)
+
+
+def _merge(component, first, second):
+    '''
+    Merges the components connected by a batch of edges. Every new component is labeled
+    with the smallest label it contains.
+    INPUT:
+        component: Label of every vertex
+        first: Label of the first end of every edge
+        second: Label of the second end of every edge
+    OUTPUT:
+        New label of every vertex
+
+    Runtime -- O(n + clg^2(c)) for c labels -- O(lg(c)) hooking passes that each end
+    with O(lg(c)) pointer jumping passes
+    '''
+
+    labels, ends = np.unique(np.concatenate((first, second)), return_inverse=True)
+    first, second = ends[:len(first)], ends[len(first):]
+    parent = np.arange(len(labels))
+    while True:
+        # Hook the larger root of every edge onto the smaller one
+        a, b = parent[first], parent[second]
+        apart = a != b
+        if not apart.any():
+            break
+        smaller = np.minimum(a[apart], b[apart])
+        np.minimum.at(parent, a[apart], smaller)
+        np.minimum.at(parent, b[apart], smaller)
+        # Pointer jumping until every label points at its root
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+    lookup = np.arange(len(component))
+    lookup[labels] = labels[parent]
+    return lookup[component]
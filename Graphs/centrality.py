@@ -0,0 +1,174 @@
+import numpy as np
+
+'''
+Written by David Terpay
+Link analysis (PageRank, HITS and Katz centrality). All three are iterative: every
+vertex starts with some score, and every round each vertex collects the scores of the
+vertices with an edge into it, until the scores stop changing. One round is a product
+of the adjacency matrix of the graph with a vector of n scores.
+
+Doing that with a python loop over the edges would take seconds per round on a large
+graph. Instead we build the adjacency matrix once, in coordinate form, out of the CSR
+arrays of a frozen graph (see csrgraph.py):
+    sources: the origin of every edge (vertex u repeated deg(u) times)
+    targets: the destination of every edge
+    weights: the weight of every edge
+Multiplying by the matrix is then two NumPy calls: scores[sources] * weights gives what
+every edge carries, and np.bincount(targets, weights=...) adds up what arrives at every
+vertex. Multiplying by the transpose swaps sources and targets. In an undirected graph
+every edge is stored in both directions, so both products are the same.
+
+Every function takes a tolerance (we stop once the scores move less than n * tol in
+total, measured with the L1 norm) and a maximum number of rounds, and raises ValueError
+if the scores have not converged by then. Passing the scores of a previous run as start
+(warm start) usually converges in a handful of rounds when the graph barely changed.
+
+Runtime -- O(m) per round
+Memory -- O(n + m)
+'''
+
+
+class LinkAnalysis():
+    def __init__(self, graph):
+        '''
+        Builds the coordinate form of the adjacency matrix of a CSRGraph.
+        INPUT:
+            graph: CSRGraph (use Graph.linkAnalysis to build one from a Graph)
+        '''
+
+        self.vertices = graph.vertices
+        self.index = graph.index
+        n = len(graph.vertices)
+        offsets = np.asarray(graph.offsets, dtype=np.int64)
+        self.sources = np.repeat(np.arange(n), np.diff(offsets))
+        self.targets = np.asarray(graph.targets, dtype=np.int64)
+        self.weights = np.asarray(graph.weights, dtype=np.float64)
+
+    def pagerank(self, damping = 0.85, personalization = None, start = None, weighted = True,
+                 tol = 1e-6, maxIterations = 100):
+        '''
+        PageRank is the probability that a random surfer is on a vertex. Every round the
+        surfer follows a random edge leaving its vertex (with probability proportional to
+        the weight of the edge) with probability damping, and jumps to a random vertex
+        otherwise. A vertex without edges leaving it (a dangling vertex) always jumps.
+        The jumps land on every vertex with the same probability, or according to the
+        personalization vector if we have one.
+        INPUT:
+            damping: Probability of following an edge
+            personalization: Dictionary mapping vertices to weights, or a sequence of
+                weights indexed by vertex id (None jumps uniformly)
+            start: Scores to start from, for example a previous result (None is uniform)
+            weighted: Follow edges proportionally to their weight (False treats every
+                edge the same)
+            tol: Tolerance per vertex
+            maxIterations: Most rounds we run
+        OUTPUT:
+            NumPy array of scores indexed by vertex id, adding up to 1
+        '''
+
+        n = len(self.vertices)
+        if n == 0:
+            return np.zeros(0)
+        weights = self.weights if weighted else np.ones(len(self.targets))
+        outWeight = np.bincount(self.sources, weights=weights, minlength=n)
+        edgeOut = outWeight[self.sources]
+        transition = np.divide(weights, edgeOut, out=np.zeros(len(weights)), where=edgeOut > 0)
+        dangling = outWeight <= 0
+        jump = self.__vector(personalization)
+        scores = self.__vector(start)
+        for __ in range(maxIterations):
+            previous = scores
+            spread = np.bincount(self.targets, weights=previous[self.sources] * transition, minlength=n)
+            scores = damping * (spread + previous[dangling].sum() * jump) + (1 - damping) * jump
+            if np.abs(scores - previous).sum() < n * tol:
+                return scores
+        raise ValueError(f'pagerank did not converge in {maxIterations} iterations')
+
+    def hits(self, start = None, tol = 1e-8, maxIterations = 100):
+        '''
+        HITS gives every vertex two scores. A good hub points to good authorities and a
+        good authority is pointed to by good hubs, so every round
+            authorities = A^T hubs
+            hubs = A authorities
+        and both are scaled to add up to 1.
+        INPUT:
+            start: Hub scores to start from (None is uniform)
+            tol: Tolerance per vertex
+            maxIterations: Most rounds we run
+        OUTPUT:
+            (hubs, authorities) NumPy arrays indexed by vertex id
+        '''
+
+        n = len(self.vertices)
+        if n == 0:
+            return np.zeros(0), np.zeros(0)
+        hubs = self.__vector(start)
+        for __ in range(maxIterations):
+            previous = hubs
+            authorities = _normalize(np.bincount(self.targets, weights=previous[self.sources] * self.weights, minlength=n))
+            hubs = _normalize(np.bincount(self.sources, weights=authorities[self.targets] * self.weights, minlength=n))
+            if np.abs(hubs - previous).sum() < n * tol:
+                return hubs, authorities
+        raise ValueError(f'hits did not converge in {maxIterations} iterations')
+
+    def katz(self, alpha = 0.1, beta = 1.0, start = None, tol = 1e-6, maxIterations = 1000):
+        '''
+        Katz centrality counts the walks that end at a vertex, where a walk of length k
+        counts alpha ^ k. Every round
+            scores = alpha * A^T scores + beta
+        This only converges when alpha is smaller than one over the largest eigenvalue
+        of the adjacency matrix.
+        INPUT:
+            alpha: Attenuation of every extra edge
+            beta: Score every vertex gets for free (a number, or a sequence indexed by
+                vertex id)
+            start: Scores to start from (None starts at 0)
+            tol: Tolerance per vertex
+            maxIterations: Most rounds we run
+        OUTPUT:
+            NumPy array of scores indexed by vertex id, scaled to unit length
+        '''
+
+        n = len(self.vertices)
+        if n == 0:
+            return np.zeros(0)
+        beta = np.broadcast_to(np.asarray(beta, dtype=np.float64), (n,))
+        scores = np.zeros(n) if start is None else np.array(start, dtype=np.float64)
+        for __ in range(maxIterations):
+            previous = scores
+            scores = alpha * np.bincount(self.targets, weights=previous[self.sources] * self.weights, minlength=n) + beta
+            if not np.isfinite(scores).all():
+                break
+            if np.abs(scores - previous).sum() < n * tol:
+                norm = np.sqrt((scores * scores).sum())
+                return scores / norm if norm > 0 else scores
+        raise ValueError(f'katz did not converge in {maxIterations} iterations, try a smaller alpha')
+
+    def __vector(self, values):
+        '''
+        Turns None (uniform), a dictionary mapping vertices to weights, or a sequence
+        indexed by vertex id into a vector that adds up to 1.
+        '''
+
+        n = len(self.vertices)
+        if values is None:
+            return np.full(n, 1.0 / n)
+        if isinstance(values, dict):
+            vector = np.zeros(n)
+            for v, weight in values.items():
+                vector[self.index[v]] = weight
+        else:
+            vector = np.array(values, dtype=np.float64)
+        total = vector.sum()
+        if total <= 0:
+            raise ValueError('weights have to add up to a positive number')
+        return vector / total
+
+
+def _normalize(scores):
+    '''
+    Scales scores to add up to 1 (all zeros stay zeros).
+    '''
+
+    total = scores.sum()
+    return scores / total if total > 0 else scores
@@ -0,0 +1,324 @@
+import numpy as np
+
+'''
+Written by David Terpay
+Community detection: split the vertices into groups that have many edges inside of them
+and few edges between them. Edge directions are ignored, the weight of an edge is how
+strongly it ties its two vertices together, and self loops are ignored.
+
+Label propagation starts with every vertex in its own community (its label) and then
+every vertex repeatedly takes the label that has the most weight among its neighbors.
+Dense groups quickly agree on one label, and we stop once no vertex changes its label.
+If several labels are tied, a vertex keeps its own label if it is one of them and picks
+one at random otherwise (seeded, so a run can be repeated exactly). Updating every
+vertex at the same time (synchronously) can make two groups swap labels forever, so we
+offer two other schedules:
+    semisync: color the graph so that no two neighbors share a color, and update one
+        color at a time. Vertices of the same color are not neighbors, so updating
+        them together gives the same result as updating them one at a time.
+    async: visit the vertices in a new random order every round, in small batches
+        (batch = 1 is the classic one vertex at a time version).
+Every update of a batch of vertices is a few NumPy calls: every edge (u, v) of the batch
+becomes the code u * n + label(v), np.unique groups equal codes, np.bincount adds up
+their weights, and one lexsort picks the best label of every vertex.
+
+Louvain optimizes modularity, the fraction of the weight inside communities minus what
+we would expect if the edges were placed at random:
+    Q = sum over communities c of in(c) / 2m - resolution * (tot(c) / 2m) ^ 2
+where in(c) is the weight of the edges inside c (counted from both ends), tot(c) the
+total degree of its vertices and 2m the total degree of the graph. Moving vertex i from
+its community into community c changes Q by an amount proportional to
+    k(i, c) - resolution * tot(c) * k(i) / 2m
+where k(i, c) is the weight of the edges between i and c and k(i) the degree of i. Every
+level moves vertices to the community with the best gain (a color at a time, just like
+semisync) until nothing improves, then merges every community into a single vertex and
+starts over on that smaller graph. We stop once a level leaves every vertex in a
+community of its own.
+
+Both take start, the labels of a previous run. After a batch of insertEdge calls on the
+graph, freeze it again and pass the old labels: most communities are already right, so
+we converge in a few rounds instead of starting cold. Vertices that are new since the
+previous run start in communities of their own.
+
+Runtime -- O(mlg(m)) per round
+Memory -- O(n + m)
+'''
+
+
+class CommunityDetection():
+    def __init__(self, graph):
+        '''
+        Builds the symmetric, array backed view of the adjacency of a CSRGraph.
+        INPUT:
+            graph: CSRGraph (use Graph.communityDetection to build one from a Graph)
+
+        Raises ValueError if an edge has a negative weight.
+        '''
+
+        self.vertices = graph.vertices
+        self.index = graph.index
+        n = len(graph.vertices)
+        offsets = np.asarray(graph.offsets, dtype=np.int64)
+        sources = np.repeat(np.arange(n, dtype=np.int64), np.diff(offsets))
+        targets = np.asarray(graph.targets, dtype=np.int64)
+        weights = np.asarray(graph.weights, dtype=np.float64)
+        if (weights < 0).any():
+            raise ValueError('community detection needs non negative edge weights')
+        if graph.directed:
+            sources, targets = np.concatenate((sources, targets)), np.concatenate((targets, sources))
+            weights = np.concatenate((weights, weights))
+        keep = sources != targets
+        self.sources = sources[keep]
+        self.targets = targets[keep]
+        self.weights = weights[keep]
+
+    def labelPropagation(self, mode = 'semisync', seed = None, start = None, batches = 32,
+                         maxIterations = 100):
+        '''
+        Label propagation.
+        INPUT:
+            mode: 'semisync' (one color at a time) or 'async' (random batches)
+            seed: Seed of the random choices (colors, orders and ties)
+            start: Labels of a previous run, indexed by vertex id (None starts with
+                every vertex on its own)
+            batches: Number of batches every async round is split into
+            maxIterations: Most rounds we run
+        OUTPUT:
+            NumPy array with the community of every vertex, numbered from 0 and indexed
+            by vertex id
+
+        Raises ValueError if the labels have not settled after maxIterations rounds.
+        '''
+
+        if mode not in ('semisync', 'async'):
+            raise ValueError(f'unknown label propagation mode {mode}')
+        n = len(self.vertices)
+        rng = np.random.default_rng(seed)
+        labels = self.__startLabels(start)
+        if mode == 'semisync':
+            groups = _colorClasses(n, self.sources, self.targets, rng)
+            slices = _edgesByGroup(n, self.sources, self.targets, self.weights, groups)
+        for __ in range(maxIterations):
+            if mode == 'async':
+                groups = np.array_split(rng.permutation(n), min(max(batches, 1), max(n, 1)))
+                slices = _edgesByGroup(n, self.sources, self.targets, self.weights, groups)
+            changed = 0
+            for s, t, w in slices:
+                vertices, best = _bestLabels(n, s, labels[t], w, labels, rng)
+                moved = best != labels[vertices]
+                labels[vertices[moved]] = best[moved]
+                changed += int(moved.sum())
+            if not changed:
+                return _compact(labels)
+        raise ValueError(f'label propagation did not converge in {maxIterations} iterations')
+
+    def louvain(self, resolution = 1.0, seed = None, start = None, tol = 1e-7, maxPasses = 100):
+        '''
+        Louvain modularity optimization.
+        INPUT:
+            resolution: Larger values give more and smaller communities
+            seed: Seed of the random choices (colors and ties)
+            start: Labels of a previous run, indexed by vertex id (None starts with
+                every vertex on its own)
+            tol: A level stops once a pass improves the modularity by less than this
+            maxPasses: Most passes over the vertices per level
+        OUTPUT:
+            NumPy array with the community of every vertex, numbered from 0 and indexed
+            by vertex id
+        '''
+
+        rng = np.random.default_rng(seed)
+        labels = self.__startLabels(start)
+        sources, targets, weights = self.sources, self.targets, self.weights
+        total = weights.sum()
+        if total == 0:
+            return labels
+        n = len(labels)
+        membership = np.arange(n) # Vertex of the current level every vertex belongs to
+        while True:
+            degree = np.bincount(sources, weights=weights, minlength=n)
+            tot = np.bincount(labels, weights=degree, minlength=n)
+            loops = sources == targets
+            groups = _colorClasses(n, sources, targets, rng)
+            slices = _edgesByGroup(n, sources[~loops], targets[~loops], weights[~loops], groups)
+            moves = 0
+            quality = _modularity(labels, sources, targets, weights, total, resolution)
+            for __ in range(maxPasses):
+                passMoves = 0
+                for group, (s, t, w) in zip(groups, slices):
+                    vertices, best = _bestMoves(n, group, s, t, w, labels, degree, tot, total, resolution, rng)
+                    moved = best != labels[vertices]
+                    if moved.any():
+                        movers = vertices[moved]
+                        tot -= np.bincount(labels[movers], weights=degree[movers], minlength=n)
+                        labels[movers] = best[moved]
+                        tot += np.bincount(labels[movers], weights=degree[movers], minlength=n)
+                        passMoves += int(moved.sum())
+                moves += passMoves
+                improved = _modularity(labels, sources, targets, weights, total, resolution)
+                if not passMoves or improved - quality < tol:
+                    break
+                quality = improved
+            if not moves and len(np.unique(labels)) == n:
+                return _compact(membership)
+
+            # Merge every community into one vertex
+            labels = _compact(labels)
+            membership = labels[membership]
+            n = int(labels.max()) + 1
+            codes, inverse = np.unique(labels[sources] * n + labels[targets], return_inverse=True)
+            weights = np.bincount(inverse.ravel(), weights=weights)
+            sources, targets = codes // n, codes % n
+            labels = np.arange(n)
+
+    def modularity(self, labels, resolution = 1.0):
+        '''
+        Modularity of a partition (see the top of this file).
+        INPUT:
+            labels: Community of every vertex, indexed by vertex id
+            resolution: Weight of the expected fraction
+        OUTPUT:
+            Modularity between -1 and 1
+        '''
+
+        total = self.weights.sum()
+        if total == 0:
+            return 0.0
+        return _modularity(np.asarray(labels, dtype=np.int64), self.sources, self.targets,
+                           self.weights, total, resolution)
+
+    def groups(self, labels):
+        '''
+        Turns labels into lists of vertices.
+        OUTPUT:
+            List with the list of vertices of every community
+        '''
+
+        communities = [[] for __ in range(int(max(labels, default=-1)) + 1)]
+        for position, label in enumerate(np.asarray(labels).tolist()):
+            communities[label].append(self.vertices[position])
+        return communities
+
+    def __startLabels(self, start):
+        '''
+        Labels to start from. Vertices the previous run did not know about (the graph
+        grew since) get communities of their own.
+        '''
+
+        n = len(self.vertices)
+        if start is None:
+            return np.arange(n, dtype=np.int64)
+        start = np.asarray(start, dtype=np.int64)
+        if len(start) > n:
+            raise ValueError('start has more labels than the graph has vertices')
+        fresh = int(start.max()) + 1 if len(start) else 0
+        return _compact(np.concatenate((start, np.arange(fresh, fresh + n - len(start)))))
+
+
+def _compact(labels):
+    '''
+    Renumbers labels to 0, 1, 2, ... in order of their smallest vertex id.
+    '''
+
+    __, first, inverse = np.unique(labels, return_index=True, return_inverse=True)
+    order = np.argsort(first, kind='stable')
+    rename = np.empty(len(order), dtype=np.int64)
+    rename[order] = np.arange(len(order))
+    return rename[inverse.ravel()]
+
+
+def _colorClasses(n, sources, targets, rng):
+    '''
+    Splits the vertices into groups where no two vertices of a group are neighbors.
+    Every step, the uncolored vertices whose random priority beats every uncolored
+    neighbor form the next group (Luby's algorithm).
+    '''
+
+    priority = rng.permutation(n)
+    uncolored = np.ones(n, dtype=bool)
+    live = sources != targets
+    sources, targets = sources[live], targets[live]
+    groups = []
+    while uncolored.any():
+        live = uncolored[sources] & uncolored[targets]
+        sources, targets = sources[live], targets[live]
+        strongest = np.full(n, -1, dtype=np.int64)
+        np.maximum.at(strongest, sources, priority[targets])
+        chosen = uncolored & (priority > strongest)
+        groups.append(np.flatnonzero(chosen))
+        uncolored[chosen] = False
+    return groups
+
+
+def _edgesByGroup(n, sources, targets, weights, groups):
+    '''
+    Splits the edges by the group of their source so that every group only looks at
+    its own edges.
+    OUTPUT:
+        List of (sources, targets, weights) for every group
+    '''
+
+    group = np.empty(n, dtype=np.int64)
+    for position, members in enumerate(groups):
+        group[members] = position
+    edgeGroup = group[sources]
+    order = np.argsort(edgeGroup, kind='stable')
+    bounds = np.searchsorted(edgeGroup[order], np.arange(len(groups) + 1))
+    sources, targets, weights = sources[order], targets[order], weights[order]
+    return [(sources[low:high], targets[low:high], weights[low:high])
+            for low, high in zip(bounds[:-1], bounds[1:])]
+
+
+def _pick(vertices, candidates, score, current, rng):
+    '''
+    For every vertex the candidate with the best score. Ties go to the current label of
+    the vertex, then to a random candidate. The candidates of a vertex have to be next
+    to each other (np.unique sorts them that way).
+    '''
+
+    boundary = np.append(True, vertices[1:] != vertices[:-1])
+    starts = np.flatnonzero(boundary)
+    group = np.cumsum(boundary) - 1
+    top = score >= np.maximum.reduceat(score, starts)[group]
+    priority = np.where(top, rng.random(len(candidates)) + 2 * (candidates == current[vertices]), -1)
+    chosen = np.flatnonzero(priority >= np.maximum.reduceat(priority, starts)[group])
+    chosen = chosen[np.append(True, group[chosen][1:] != group[chosen][:-1])]
+    return vertices[chosen], candidates[chosen]
+
+
+def _bestLabels(n, sources, neighborLabels, weights, labels, rng):
+    '''
+    Label with the most weight among the neighbors of every source vertex.
+    '''
+
+    if not len(sources):
+        return sources, sources
+    codes, inverse = np.unique(sources * n + neighborLabels, return_inverse=True)
+    score = np.bincount(inverse.ravel(), weights=weights)
+    return _pick(codes // n, codes % n, score, labels, rng)
+
+
+def _bestMoves(n, group, sources, targets, weights, labels, degree, tot, total, resolution, rng):
+    '''
+    Community with the best modularity gain for every vertex of a group (staying where
+    it is counts as a candidate too).
+    '''
+
+    codes, inverse = np.unique(np.concatenate((sources * n + labels[targets], group * n + labels[group])),
+                               return_inverse=True)
+    links = np.bincount(inverse.ravel(), weights=np.concatenate((weights, np.zeros(len(group)))))
+    vertices, candidates = codes // n, codes % n
+    # Without the vertex itself when it is already in the community
+    others = tot[candidates] - np.where(candidates == labels[vertices], degree[vertices], 0)
+    score = links - resolution * others * degree[vertices] / total
+    return _pick(vertices, candidates, score, labels, rng)
+
+
+def _modularity(labels, sources, targets, weights, total, resolution):
+    '''
+    Modularity of labels on symmetric edge arrays whose weights add up to total.
+    '''
+
+    inside = weights[labels[sources] == labels[targets]].sum()
+    tot = np.bincount(labels, weights=np.bincount(sources, weights=weights, minlength=len(labels)))
+    return float(inside / total - resolution * ((tot / total) ** 2).sum())
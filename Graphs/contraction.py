@@ -0,0 +1,426 @@
+import sys
+sys.path.append('../')
+from Heaps import indexedheap # Used in the witness searches and the queries
+from array import array
+from bisect import bisect_left
+import mmap as mmapModule
+import struct
+import math
+import numpy as np
+import snapshot # Used to cast the mapped arrays and encode the keys
+from vertex import Vertex
+
+'''
+Written by David Terpay
+Contraction hierarchies. Dijkstra's algorithm (even the bidirectional version in
+Graph.shortest_path) has to settle every vertex that is closer to the source than the
+target. On a road network that is most of a city for a trip across town. If the graph
+does not change we can do a lot of work once, up front, to make every query tiny.
+
+Preprocessing puts the vertices in an order of "importance" and contracts them one at a
+time, from the least important to the most important. Contracting v means removing it
+from the graph while keeping every shortest path between the remaining vertices intact:
+for every pair of neighbors u -> v -> w we check whether the path through v is the only
+shortest path from u to w. We do that with a small Dijkstra's search from u that is not
+allowed to use v (a witness search). If it finds a path at least as short we do nothing,
+otherwise we add a shortcut edge u -> w with the weight of the path through v. Every
+shortcut remembers the vertex it skips (its middle vertex) so that we can unpack it into
+the original edges later on.
+
+The order matters a lot. We use the edge difference: the number of shortcuts contracting
+v would add minus the number of edges it would remove (plus the number of neighbors that
+were already contracted, which spreads the contractions evenly over the graph). The
+vertices live in an indexed heap keyed by this number. Contracting a vertex changes the
+edge difference of its neighbors, so when we pop a vertex we recompute its edge
+difference first (lazy updates) and push it back if it is not the smallest anymore.
+
+When all the vertices are contracted, the rank of a vertex is its position in the order.
+Every edge (original or shortcut) goes either up (to a vertex with a higher rank) or down.
+A query runs a bidirectional Dijkstra's where the search from the source only follows
+upward edges and the search from the target only follows downward edges backwards. Both
+searches meet at the most important vertex of the shortest path. Since important vertices
+are few and far apart, each side settles a few hundred vertices even on huge graphs.
+
+The hierarchy is stored like a CSRGraph (see csrgraph.py):
+    up: for every vertex u the edges u -> w with rank[w] > rank[u]
+    down: for every vertex u the edges w -> u with rank[w] > rank[u], stored with u
+Each one has offsets, targets (sorted), weights and middle vertices (-1 for original
+edges). save and load write these arrays to a binary file and map them back in, exactly
+like snapshot.py does for a CSRGraph.
+
+Preprocessing -- depends on the graph, roughly O(n(witness search)) in practice
+Query -- O(klg(k)) where k is the number of vertices settled (usually a few hundred)
+'''
+
+MAGIC = b'PDSCHIER'
+FORMAT_VERSION = 2
+_HEADER = struct.Struct('<8sIIqqqq')
+_DIRECTED = 1
+
+
+class ContractionHierarchy():
+    def __init__(self, vertices, rank, up, down, directed = False):
+        '''
+        Wraps already built hierarchy arrays. Use fromGraph or load to create one.
+        INPUT:
+            vertices: List of vertices, the position of a vertex is its id
+            rank: Position of every vertex in the contraction order
+            up: (offsets, targets, weights, middle) of the upward edges
+            down: (offsets, targets, weights, middle) of the downward edges
+            directed: The hierarchy was built from a directed graph
+        '''
+
+        self.directed = directed
+        self.vertices = vertices
+        self.index = {v: i for i, v in enumerate(vertices)}
+        self.rank = rank
+        self.up = up
+        self.down = down
+
+    @classmethod
+    def fromGraph(cls, graph, witnessLimit = 500):
+        '''
+        Contracts every vertex of a graph and builds the hierarchy.
+        INPUT:
+            graph: Graph from graph.py with non negative edge weights
+            witnessLimit: Most vertices a single witness search may settle. A search that
+                gives up adds the shortcut, which is always correct but can add shortcuts
+                we did not need.
+        OUTPUT:
+            ContractionHierarchy
+
+        Raises ValueError if an edge has a negative weight.
+        '''
+
+        index = graph.index
+        edges = graph.edges.toList()
+        return cls.fromEdges(graph.vertexList, [index[e.origin] for e in edges],
+                             [index[e.destination] for e in edges], [e.weight for e in edges],
+                             graph.directed, witnessLimit)
+
+    @classmethod
+    def fromEdges(cls, vertices, origins, destinations, weights, directed = False, witnessLimit = 500):
+        '''
+        Contracts every vertex of a graph given as parallel arrays of vertex ids (the
+        same arrays as CSRGraph.fromEdges) and builds the hierarchy.
+        INPUT:
+            vertices: List of vertices, the position of a vertex is its id
+            origins: Id of the first vertex of every edge
+            destinations: Id of the second vertex of every edge
+            weights: Weight of every edge
+            directed: Edges only go from origin to destination
+            witnessLimit: See fromGraph
+        OUTPUT:
+            ContractionHierarchy
+
+        Raises ValueError if an edge has a negative weight.
+        '''
+
+        n = len(vertices)
+        outgoing = [{} for __ in range(n)]
+        incoming = [{} for __ in range(n)]
+        for u, w, weight in zip(origins, destinations, weights):
+            if weight < 0:
+                raise ValueError('contraction hierarchies need non negative edge weights')
+            pairs = [(u, w)] if directed else [(u, w), (w, u)]
+            for a, b in pairs:
+                if a != b and weight < outgoing[a].get(b, math.inf):
+                    outgoing[a][b] = weight
+                    incoming[b][a] = weight
+        middle = {} # Middle vertex of every shortcut (a, b)
+
+        contractedNeighbors = [0] * n
+        priorityQueue = indexedheap.IndexedHeap()
+        for v in range(n):
+            priorityQueue.insert(v, _edgeDifference(v, outgoing, incoming, contractedNeighbors, witnessLimit))
+        rank = array('l', [0]) * n
+        upEdges = [None] * n
+        downEdges = [None] * n
+        order = 0
+        while not priorityQueue.isEmpty():
+            v, __ = priorityQueue.pop_min()
+            priority = _edgeDifference(v, outgoing, incoming, contractedNeighbors, witnessLimit)
+            if not priorityQueue.isEmpty() and priority > priorityQueue.peek()[1]:
+                priorityQueue.insert(v, priority)
+                continue
+
+            # Every edge v still has leads to a vertex contracted after v
+            rank[v] = order
+            order += 1
+            upEdges[v] = [(w, weight, middle.get((v, w), -1)) for w, weight in outgoing[v].items()]
+            downEdges[v] = [(u, weight, middle.get((u, v), -1)) for u, weight in incoming[v].items()]
+            for u, w, weight in _shortcuts(v, outgoing, incoming, witnessLimit):
+                if weight < outgoing[u].get(w, math.inf):
+                    outgoing[u][w] = weight
+                    incoming[w][u] = weight
+                    middle[(u, w)] = v
+            for w in outgoing[v]:
+                del incoming[w][v]
+                contractedNeighbors[w] += 1
+            for u in incoming[v]:
+                del outgoing[u][v]
+                contractedNeighbors[u] += 1
+            outgoing[v] = {}
+            incoming[v] = {}
+
+        return cls(list(vertices), rank, _toArrays(upEdges), _toArrays(downEdges), directed)
+
+    @classmethod
+    def load(cls, path, mmap = True):
+        '''
+        Loads a hierarchy written by save. With mmap the arrays stay in the file and are
+        only paged in when a query touches them.
+        INPUT:
+            path: File we are reading
+            mmap: Map the arrays instead of reading them into memory
+        OUTPUT:
+            ContractionHierarchy
+        '''
+
+        with open(path, 'rb') as hierarchy:
+            if mmap:
+                buffer = memoryview(mmapModule.mmap(hierarchy.fileno(), 0, access=mmapModule.ACCESS_READ))
+            else:
+                buffer = memoryview(hierarchy.read())
+        if len(buffer) < _HEADER.size:
+            raise ValueError(f'{path} is not a contraction hierarchy')
+        magic, version, flags, n, upSlots, downSlots, keyTableLength = _HEADER.unpack_from(buffer)
+        if magic != MAGIC:
+            raise ValueError(f'{path} is not a contraction hierarchy')
+        if version != FORMAT_VERSION:
+            raise ValueError(f'{path} has hierarchy version {version}, expected {FORMAT_VERSION}')
+        position = _HEADER.size + keyTableLength
+        if len(buffer) != position + 8 * (3 * n + 2 + 3 * (upSlots + downSlots)):
+            raise ValueError(f'{path} is truncated')
+
+        keys = snapshot.decodeKeys(buffer[_HEADER.size:position])[0]
+        arrays = []
+        for length, typecode in ((n, 'q'), (n + 1, 'q'), (upSlots, 'q'), (upSlots, 'd'), (upSlots, 'q'),
+                                 (n + 1, 'q'), (downSlots, 'q'), (downSlots, 'd'), (downSlots, 'q')):
+            arrays.append(snapshot._view(buffer[position:position + 8 * length], typecode, mmap))
+            position += 8 * length
+        return cls([Vertex(key) for key in keys], arrays[0], tuple(arrays[1:5]), tuple(arrays[5:]),
+                   bool(flags & _DIRECTED))
+
+    def save(self, path):
+        '''
+        Writes the hierarchy to a binary file. The layout is a header, the keys of the
+        vertices (stored as data, see snapshot.encodeKeys), and then the rank, up and down arrays as little endian 8 byte
+        integers and doubles (see snapshot.py for the same idea applied to a CSRGraph).
+        INPUT:
+            path: File we are writing
+        '''
+
+        keyTable = snapshot.encodeKeys([v.getData() for v in self.vertices])
+        with open(path, 'wb') as hierarchy:
+            hierarchy.write(_HEADER.pack(MAGIC, FORMAT_VERSION, _DIRECTED if self.directed else 0,
+                                         len(self.vertices), len(self.up[1]), len(self.down[1]), len(keyTable)))
+            hierarchy.write(keyTable)
+            hierarchy.write(np.asarray(self.rank, dtype='<i8').tobytes())
+            for offsets, targets, weights, middle in (self.up, self.down):
+                for values, dtype in ((offsets, '<i8'), (targets, '<i8'), (weights, '<f8'), (middle, '<i8')):
+                    hierarchy.write(np.asarray(values, dtype=dtype).tobytes())
+
+    def shortest_path(self, source, target):
+        '''
+        Point to point shortest path on the hierarchy. The forward search only climbs
+        upward edges from the source and the backward search only climbs downward edges
+        (backwards) from the target. Unlike the bidirectional Dijkstra in graph.py we
+        cannot stop as soon as the searches touch, since the best meeting vertex is the
+        highest one on the path. We stop a side once its closest unsettled vertex is
+        already farther than the best path we found. The shortcuts on the path are then
+        unpacked into the original edges.
+        INPUT:
+            source: Starting vertex
+            target: Destination vertex
+        OUTPUT:
+            (path, cost) where path is the list of vertices from source to target.
+            If there is no path we return ([], inf).
+
+        Runtime -- O(klg(k)) where k is the number of vertices settled
+        '''
+
+        cost, meeting, predecessor = self.__search(self.index[source], self.index[target])
+        if meeting is None:
+            return [], math.inf
+        hops = []
+        vert = meeting
+        while predecessor[0][vert] is not None:
+            hops.append((predecessor[0][vert], vert))
+            vert = predecessor[0][vert]
+        hops.reverse()
+        vert = meeting
+        while predecessor[1][vert] is not None:
+            hops.append((vert, predecessor[1][vert]))
+            vert = predecessor[1][vert]
+
+        path = [self.index[source]]
+        for origin, destination in hops:
+            self.__unpack(origin, destination, path)
+        return [self.vertices[position] for position in path], cost
+
+    def distance(self, source, target):
+        '''
+        Same as shortest_path but only returns the cost, which saves unpacking the
+        shortcuts.
+        '''
+
+        cost, __, __ = self.__search(self.index[source], self.index[target])
+        return cost
+
+    def __search(self, source, target):
+        '''
+        Upward bidirectional Dijkstra's between two vertex ids.
+        OUTPUT:
+            (cost, meeting vertex id or None, (forward predecessors, backward predecessors))
+        '''
+
+        distance = ({source: 0}, {target: 0})
+        predecessor = ({source: None}, {target: None})
+        queues = (indexedheap.IndexedHeap(), indexedheap.IndexedHeap())
+        queues[0].insert(source, 0)
+        queues[1].insert(target, 0)
+        best = math.inf
+        meeting = None
+        while True:
+            forwardTop = queues[0].peek()[1] if not queues[0].isEmpty() else math.inf
+            backwardTop = queues[1].peek()[1] if not queues[1].isEmpty() else math.inf
+            if min(forwardTop, backwardTop) >= best:
+                break
+            side = 0 if forwardTop <= backwardTop else 1
+            vert, weight = queues[side].pop_min()
+            if vert in distance[1 - side] and weight + distance[1 - side][vert] < best:
+                best = weight + distance[1 - side][vert]
+                meeting = vert
+            offsets, targets, weights, __ = self.up if side == 0 else self.down
+            for slot in range(offsets[vert], offsets[vert + 1]):
+                adjvert = targets[slot]
+                existing_weight = weight + weights[slot]
+                if existing_weight < distance[side].get(adjvert, math.inf):
+                    distance[side][adjvert] = existing_weight
+                    predecessor[side][adjvert] = vert
+                    if queues[side].contains(adjvert):
+                        queues[side].decrease_key(adjvert, existing_weight)
+                    else:
+                        queues[side].insert(adjvert, existing_weight)
+        return best, meeting, predecessor
+
+    def __unpack(self, origin, destination, path):
+        '''
+        Replaces the edge origin -> destination with the original edges it stands for
+        and appends every vertex after origin to path. A shortcut u -> w through m is
+        the two edges u -> m and m -> w, each of which can be a shortcut again, so we
+        keep a stack of edges left to unpack.
+        '''
+
+        stack = [(origin, destination)]
+        while stack:
+            u, w = stack.pop()
+            m = self.__middle(u, w)
+            if m < 0:
+                path.append(w)
+            else:
+                stack.append((m, w))
+                stack.append((u, m))
+
+    def __middle(self, u, w):
+        '''
+        Returns the middle vertex of the edge u -> w (-1 for an original edge). The edge
+        is stored with u if it goes up and with w if it goes down.
+        '''
+
+        if self.rank[w] > self.rank[u]:
+            offsets, targets, __, middle = self.up
+            owner, other = u, w
+        else:
+            offsets, targets, __, middle = self.down
+            owner, other = w, u
+        slot = bisect_left(targets, other, offsets[owner], offsets[owner + 1])
+        return middle[slot]
+
+    def numShortcuts(self):
+        '''
+        Number of shortcut edges the preprocessing added
+        '''
+
+        return sum(1 for m in self.up[3] if m >= 0) + sum(1 for m in self.down[3] if m >= 0)
+
+    def __len__(self):
+        '''
+        Number of vertices in our hierarchy
+        '''
+
+        return len(self.vertices)
+
+
+def _witnessDistances(outgoing, source, avoid, limit, maxSettled):
+    '''
+    Dijkstra's from source that never enters avoid and stops once it passes limit or
+    settles maxSettled vertices. The distances it returns are lengths of real paths, so
+    they are valid witnesses even when the search stopped early.
+    '''
+
+    distance = {source: 0}
+    priorityQueue = indexedheap.IndexedHeap()
+    priorityQueue.insert(source, 0)
+    settled = 0
+    while not priorityQueue.isEmpty() and settled < maxSettled:
+        vert, weight = priorityQueue.pop_min()
+        if weight > limit:
+            break
+        settled += 1
+        for adjvert, edgeWeight in outgoing[vert].items():
+            if adjvert == avoid:
+                continue
+            existing_weight = weight + edgeWeight
+            if existing_weight < distance.get(adjvert, math.inf):
+                distance[adjvert] = existing_weight
+                if priorityQueue.contains(adjvert):
+                    priorityQueue.decrease_key(adjvert, existing_weight)
+                else:
+                    priorityQueue.insert(adjvert, existing_weight)
+    return distance
+
+
+def _shortcuts(v, outgoing, incoming, witnessLimit):
+    '''
+    Returns the (u, w, weight) shortcuts we need if we contract v.
+    '''
+
+    if not outgoing[v]:
+        return []
+    longest = max(outgoing[v].values())
+    result = []
+    for u, inWeight in incoming[v].items():
+        witness = _witnessDistances(outgoing, u, v, inWeight + longest, witnessLimit)
+        for w, outWeight in outgoing[v].items():
+            if w != u and witness.get(w, math.inf) > inWeight + outWeight:
+                result.append((u, w, inWeight + outWeight))
+    return result
+
+
+def _edgeDifference(v, outgoing, incoming, contractedNeighbors, witnessLimit):
+    '''
+    Priority of v in the contraction order. Smaller means contract sooner.
+    '''
+
+    added = len(_shortcuts(v, outgoing, incoming, witnessLimit))
+    return added - len(outgoing[v]) - len(incoming[v]) + contractedNeighbors[v]
+
+
+def _toArrays(edges):
+    '''
+    Packs a list of (target, weight, middle) lists into CSR arrays sorted by target.
+    '''
+
+    offsets = array('l', [0])
+    targets = array('l')
+    weights = array('d')
+    middle = array('l')
+    for neighbors in edges:
+        for target, weight, m in sorted(neighbors):
+            targets.append(target)
+            weights.append(weight)
+            middle.append(m)
+        offsets.append(len(targets))
+    return offsets, targets, weights, middle
@@ -0,0 +1,928 @@
+import sys
+sys.path.append('../')
+from Disjoint_Sets import disjointset # Used in Kruskal's algorithm
+from Heaps import indexedheap # Used in Prim's and Dijkstra's algorithms
+from array import array
+import numpy as np
+from bisect import bisect_left
+import math
+import multisource # Used in multi source Dijkstra's
+import boruvka # Used in Borůvka's algorithm
+import snapshot # Used to save and load binary snapshots
+from centrality import LinkAnalysis # Used for PageRank, HITS and Katz centrality
+from triangles import TriangleCounter # Used for triangle counting and clustering
+from communities import CommunityDetection # Used for label propagation and Louvain
+
+'''
+Written by David Terpay
+This is a frozen, array based version of our graph that uses a compressed sparse row
+(CSR) layout. Implementation 3 in graph.py (adjacency list) needs a vertex object, a linked
+list, three linked list nodes and an edge object for every edge we insert. That is great
+when we want to insert and remove in O(1) time, but every edge costs hundreds of bytes and
+every time we look at a neighbor we have to chase a chain of pointers.
+
+Once a graph stops changing, we can do much better. We give every vertex a dense id from
+0 to n - 1 and store the adjacency of all of the vertices back to back in flat arrays:
+    offsets: n + 1 integers. The neighbors of vertex u are stored in the slice
+        offsets[u] : offsets[u + 1] of the arrays below. This means degree(u) is
+        offsets[u + 1] - offsets[u].
+    targets: 2m integers. The id of the vertex on the other end of each edge.
+    weights: 2m floats. The weight of each edge, parallel to targets.
+    edgeIds: 2m integers. Which edge (0 to m - 1) each slot belongs to, this lets us
+        look up the key of an edge and recognize the two halves of an undirected edge.
+        We only keep them when the edges have keys, otherwise edgeIds is None.
+For example, the triangle 0 - 1 - 2 with an extra edge 2 - 3 looks like this:
+    offsets = [0, 2, 4, 7, 8]
+    targets = [1, 2, 0, 2, 0, 1, 3, 2]
+Every undirected edge is stored twice (once for each endpoint), which is why the arrays
+have 2m entries. In a directed graph an edge is only stored with its origin, so the
+arrays have m entries and the neighbors of a vertex are the vertices its edges lead to. The neighbors of every vertex are sorted by id, so areAdjacent can use
+binary search. The arrays are built with NumPy and stored as python array.array objects,
+but anything that supports indexing (NumPy arrays, memoryviews over a file) works just
+as well. Since the arrays hold most of the memory of a large graph, they use the
+smallest types that hold every value exactly:
+    offsets: 8 byte integers (only n + 1 of them)
+    targets and edgeIds: 4 byte integers, 8 bytes once there are 2^31 vertices or edges
+    weights: 4 byte floats if every weight fits in one exactly (integer weights up to
+        2^24, halves, quarters, ...), 8 byte doubles otherwise
+With float weights and no edge ids a slot is 8 bytes, so an undirected edge costs 16
+bytes and a directed one 8 bytes, plus 8 bytes per vertex (edge ids add 4 bytes per slot
+and doubles another 4). The reverse arrays of a directed graph
+(see bfsLevels) add another 4 bytes per edge. save and load (see snapshot.py) write the arrays to a
+binary file and map them back into memory without copying them.
+
+Since the arrays cannot grow, this graph is read only. Build it once with
+CSRGraph.fromGraph(g) (or g.freeze()) and query it as many times as you want.
+
+Runtime
+Building -- O(n + mlg(m))
+degree -- O(1)
+areAdjacent / edgeId -- O(lg(min(deg(u), deg(v))))
+adjacentVertices / inicidentEdges -- O(deg(v))
+'''
+
+
+class CSRGraph():
+    def __init__(self, vertices, offsets, targets, weights, edgeIds, keys, directed = False, reverse = None):
+        '''
+        Wraps already built CSR arrays. Most of the time you want to use fromGraph
+        or fromEdges instead of calling this directly.
+        INPUT:
+            vertices: List of vertices, the position of a vertex is its id
+            offsets: n + 1 offsets into targets/weights/edgeIds
+            targets: Id of the neighbor for every slot
+            weights: Weight of the edge for every slot
+            edgeIds: Edge id for every slot (None if we do not keep them)
+            keys: Key of every edge, indexed by edge id (None if edges have no keys)
+            directed: Every edge is only stored with its origin
+            reverse: (offsets, targets) of the entering edges of every vertex when
+                directed. We build them here if they are not given, since the graph
+                never changes again and bfsLevels and numConnectedComponents need them.
+        '''
+
+        self.directed = directed
+        self.vertices = vertices
+        self.index = {v: i for i, v in enumerate(vertices)}
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.edgeIds = edgeIds
+        self.keys = keys
+        self.path = None
+        self.reverse = None
+        if directed:
+            self.reverse = reverse if reverse is not None else _reverseArrays(offsets, targets)
+
+    @classmethod
+    def fromEdges(cls, vertices, origins, destinations, weights, keys = None, directed = False):
+        '''
+        Builds a CSR graph out of parallel lists (or NumPy arrays) describing the edges.
+        The whole construction is vectorized with NumPy: we write down every half of
+        every edge as a (source, target) pair, sort the pairs by source and then by
+        target, and count how many pairs every source has to get the offsets. No
+        objects are created per edge, so this scales to tens of millions of edges.
+        INPUT:
+            vertices: List of vertices, the position of a vertex is its id
+            origins: Id of the first vertex of every edge
+            destinations: Id of the second vertex of every edge
+            weights: Weight of every edge
+            keys: Key of every edge (optional). The edge id of every slot is only
+                stored when there are keys, since all we need it for is finding the key
+                of an edge.
+            directed: Only store every edge with its origin
+        OUTPUT:
+            CSRGraph
+
+        Runtime -- O(n + mlg(m)) -- Dominated by the sort, which runs in NumPy.
+        '''
+
+        n = len(vertices)
+        origins = np.asarray(origins, dtype=np.int64)
+        destinations = np.asarray(destinations, dtype=np.int64)
+        weights = np.asarray(weights, dtype=np.float64)
+        edgeIds = np.arange(len(origins), dtype=np.int64)
+        weightType = 'f' if np.array_equal(weights.astype(np.float32), weights) else 'd'
+        if directed:
+            sources, targets = origins, destinations
+        else:
+            sources = np.concatenate((origins, destinations))
+            targets = np.concatenate((destinations, origins))
+            weights = np.concatenate((weights, weights))
+            edgeIds = np.concatenate((edgeIds, edgeIds))
+        order = np.lexsort((targets, sources))
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=n), out=offsets[1:])
+
+        edgeIdArray = None
+        if keys is not None:
+            keys = list(keys)
+            edgeIdArray = _asArray(_indexType(len(origins)), edgeIds[order])
+        return cls(list(vertices), _asArray('l', offsets), _asArray(_indexType(n), targets[order]),
+                   _asArray(weightType, weights[order]), edgeIdArray, keys, directed)
+
+    @classmethod
+    def fromGraph(cls, graph, keys = True):
+        '''
+        Freezes an adjacency list Graph into a CSRGraph. The vertex objects are
+        shared between the two graphs and every vertex keeps the id the Graph gave
+        it, so the results of queries on the frozen graph can be used with the
+        original one.
+        INPUT:
+            graph: Graph from graph.py
+            keys: Keep the keys of the edges (and the edge id of every slot)
+        OUTPUT:
+            CSRGraph with the same vertices and edges
+
+        Runtime -- O(n + mlg(m))
+        '''
+
+        vertices = list(graph.vertexList)
+        index = graph.index
+        origins = []
+        destinations = []
+        weights = []
+        edgeKeys = [] if keys else None
+        for e in graph.edges.toList():
+            origins.append(index[e.origin])
+            destinations.append(index[e.destination])
+            weights.append(e.weight)
+            if keys:
+                edgeKeys.append(e.key)
+        return cls.fromEdges(vertices, origins, destinations, weights, edgeKeys, graph.directed)
+
+    @classmethod
+    def load(cls, path, mmap = True):
+        '''
+        Loads a graph written by save. With mmap the arrays stay in the file and are
+        paged in by the operating system when we touch them, so loading only costs the
+        time to read the keys of the vertices and edges.
+        INPUT:
+            path: Snapshot file
+            mmap: Map the arrays instead of reading them into memory
+        OUTPUT:
+            CSRGraph
+
+        Runtime -- O(n) with mmap, O(n + m) without
+        '''
+
+        return snapshot.load(path, mmap)
+
+    def save(self, path):
+        '''
+        Writes our arrays and the keys of our vertices and edges to a binary snapshot
+        (see snapshot.py for the layout).
+        INPUT:
+            path: File we are writing
+
+        Runtime -- O(n + m)
+        '''
+
+        snapshot.save(path, self)
+
+    def __len__(self):
+        '''
+        Number of vertices in our graph
+        '''
+
+        return len(self.vertices)
+
+    def numEdges(self):
+        '''
+        Number of edges in our graph
+        '''
+
+        return len(self.targets) if self.directed else len(self.targets) // 2
+
+    def degree(self, v):
+        '''
+        This function returns the number of slots used by a vertex which is
+        the number of incident edges (the out degree in a directed graph).
+
+        Runtime -- O(1)
+        '''
+
+        u = self.index[v]
+        return self.offsets[u + 1] - self.offsets[u]
+
+    def neighbors(self, u):
+        '''
+        Returns the range of slots that belong to the vertex with id u. Use it to
+        index targets, weights and edgeIds directly.
+        INPUT:
+            u: Vertex id
+        OUTPUT:
+            range of slots
+        '''
+
+        return range(self.offsets[u], self.offsets[u + 1])
+
+    def adjacentVertices(self, v):
+        '''
+        Returns a list of all of the vertices adjacent to v.
+
+        Runtime -- O(deg(v))
+        '''
+
+        u = self.index[v]
+        return [self.vertices[t] for t in self.targets[self.offsets[u]:self.offsets[u + 1]]]
+
+    def inicidentEdges(self, v):
+        '''
+        Returns the ids of all of the edges touching v.
+
+        Raises ValueError if we do not keep edge ids.
+
+        Runtime -- O(deg(v))
+        '''
+
+        if self.edgeIds is None:
+            raise ValueError('this graph does not keep edge ids, freeze it with its keys')
+        u = self.index[v]
+        return list(self.edgeIds[self.offsets[u]:self.offsets[u + 1]])
+
+    def areAdjacent(self, origin, destination):
+        '''
+        Checks whether an edge connects two vertices. Use edgeId to get the id of the
+        edge.
+        INPUT:
+            origin: First vertex
+            destination: Second vertex
+        OUTPUT:
+            True if the vertices are adjacent; None otherwise
+
+        Runtime -- O(lg(min(deg(origin), deg(destination))))
+        '''
+
+        return True if self.__slot(origin, destination) is not None else None
+
+    def edgeId(self, origin, destination):
+        '''
+        Returns the id of the edge connecting two vertices. Ids start at 0, so test the
+        result against None.
+        INPUT:
+            origin: First vertex
+            destination: Second vertex
+        OUTPUT:
+            Id of the edge (use it with edgeKey); None if the vertices are not adjacent
+
+        Raises ValueError if we do not keep edge ids.
+
+        Runtime -- O(lg(min(deg(origin), deg(destination))))
+        '''
+
+        if self.edgeIds is None:
+            raise ValueError('this graph does not keep edge ids, freeze it with its keys')
+        slot = self.__slot(origin, destination)
+        return None if slot is None else self.edgeIds[slot]
+
+    def __slot(self, origin, destination):
+        '''
+        Since the neighbors of every vertex are sorted by id, we binary search the
+        neighbor list of the smaller degree vertex. In a directed graph we have to
+        search the list of origin.
+        OUTPUT:
+            Slot of the edge in targets; None if there is no edge
+        '''
+
+        u = self.index[origin]
+        v = self.index[destination]
+        if not self.directed and self.offsets[u + 1] - self.offsets[u] > self.offsets[v + 1] - self.offsets[v]:
+            u, v = v, u
+        low = self.offsets[u]
+        high = self.offsets[u + 1]
+        slot = bisect_left(self.targets, v, low, high)
+        if slot < high and self.targets[slot] == v:
+            return slot
+        return None
+
+    def edgeKey(self, edgeId):
+        '''
+        Returns the key stored with an edge
+        '''
+
+        return None if self.keys is None or edgeId is None else self.keys[edgeId]
+
+    def numConnectedComponents(self):
+        '''
+        Counts the connected components with a traversal over the flat arrays. In a
+        directed graph we also follow the entering edges (weakly connected components).
+
+        Runtime -- O(n + m)
+        '''
+
+        n = len(self.vertices)
+        adjacency = [(self.offsets, self.targets)]
+        if self.directed:
+            adjacency.append(self.reverse)
+        visited = bytearray(n)
+        components = 0
+        for s in range(n):
+            if visited[s]:
+                continue
+            components += 1
+            visited[s] = 1
+            stack = [s]
+            while stack:
+                u = stack.pop()
+                for offsets, targets in adjacency:
+                    for slot in range(offsets[u], offsets[u + 1]):
+                        t = targets[slot]
+                        if not visited[t]:
+                            visited[t] = 1
+                            stack.append(t)
+        return components
+
+    def cyclesExist(self):
+        '''
+        An undirected graph with c connected components is a forest exactly when it
+        has n - c edges, so we can tell whether there is a cycle without labeling
+        every edge. A directed graph is checked for cycles with Kahn's algorithm (see
+        Graph.topologicalSort).
+
+        Runtime -- O(n + m)
+        '''
+
+        n = len(self.vertices)
+        if not self.directed:
+            return self.numEdges() > n - self.numConnectedComponents()
+        remaining = [0] * n
+        for t in self.targets:
+            remaining[t] += 1
+        order = [u for u in range(n) if remaining[u] == 0]
+        head = 0
+        while head < len(order):
+            u = order[head]
+            head += 1
+            for slot in range(self.offsets[u], self.offsets[u + 1]):
+                t = self.targets[slot]
+                remaining[t] -= 1
+                if remaining[t] == 0:
+                    order.append(t)
+        return len(order) < n
+
+    def bfsLevels(self, source, alpha = 14, beta = 24):
+        '''
+        Level synchronous breadth first search with direction optimization (Beamer et
+        al). Instead of taking one vertex at a time off a queue we expand a whole level
+        (the frontier) at once with NumPy, in one of two ways:
+            top down: look at every edge leaving the frontier and claim the neighbors
+                that have not been visited yet
+            bottom up: every vertex that has not been visited yet looks at its edges
+                (entering edges in a directed graph) and stops at the first one that
+                comes from the frontier
+        Top down is cheap while the frontier is small. In the middle levels of a low
+        diameter graph, however, the frontier holds a large part of the graph and most
+        of its edges lead to vertices we have already visited. Bottom up then examines
+        far fewer edges since most unvisited vertices find a parent within their first
+        few edges. We switch to bottom up when the frontier has more than 1 / alpha of
+        the edges of the unvisited vertices, and back to top down once the frontier
+        holds fewer than n / beta vertices.
+        INPUT:
+            source: Starting vertex
+            alpha: Top down to bottom up threshold
+            beta: Bottom up to top down threshold
+        OUTPUT:
+            (distance, parent) NumPy arrays indexed by vertex id. distance is the number
+            of edges from source (-1 if unreachable) and parent is the vertex we reached
+            every vertex from (-1 for source and unreachable vertices).
+
+        Runtime -- O(n + m), usually examining far fewer than m edges
+        '''
+
+        if self.directed:
+            reverseOffsets, reverseTargets = self.reverse
+        else:
+            reverseOffsets = reverseTargets = None
+        return directionOptimizingBfs(self.offsets, self.targets, self.index[source], alpha, beta,
+                                      reverseOffsets, reverseTargets)
+
+    def bfsOrder(self):
+        '''
+        Breadth first search over every connected component. The queue is a plain
+        python list that we read with a moving head index, so the whole traversal
+        only touches flat arrays. Graph.bfs labels edge objects, which we do not
+        have, so we report the vertices instead.
+        OUTPUT:
+            List of vertices in the order we visited them
+
+        Runtime -- O(n + m)
+        '''
+
+        n = len(self.vertices)
+        offsets = self.offsets
+        targets = self.targets
+        visited = bytearray(n)
+        order = []
+        for s in range(n):
+            if visited[s]:
+                continue
+            visited[s] = 1
+            order.append(s)
+            head = len(order) - 1
+            while head < len(order):
+                u = order[head]
+                head += 1
+                for slot in range(offsets[u], offsets[u + 1]):
+                    t = targets[slot]
+                    if not visited[t]:
+                        visited[t] = 1
+                        order.append(t)
+        return [self.vertices[u] for u in order]
+
+    def dfsOrder(self):
+        '''
+        Depth first search over every connected component using a python list as
+        our stack. A vertex is reported when it is popped, and its neighbors are
+        pushed in reverse so that we explore them in order. Like bfsOrder we report
+        the vertices instead of edge labels.
+        OUTPUT:
+            List of vertices in the order we visited them
+
+        Runtime -- O(n + m)
+        '''
+
+        n = len(self.vertices)
+        offsets = self.offsets
+        targets = self.targets
+        visited = bytearray(n)
+        order = []
+        for s in range(n):
+            if visited[s]:
+                continue
+            stack = [s]
+            while stack:
+                u = stack.pop()
+                if visited[u]:
+                    continue
+                visited[u] = 1
+                order.append(u)
+                for slot in range(offsets[u + 1] - 1, offsets[u] - 1, -1):
+                    t = targets[slot]
+                    if not visited[t]:
+                        stack.append(t)
+        return [self.vertices[u] for u in order]
+
+    def distances(self, start):
+        '''
+        Dijkstra's algorithm on the CSR arrays. See Graph.dijkstra for a full
+        description of the algorithm. Vertices are only inserted into the indexed
+        heap once we discover them.
+        INPUT:
+            start: Starting vertex
+        OUTPUT:
+            (distance, predecessor) arrays indexed by vertex id. Unreachable vertices
+            have distance inf and every vertex without a predecessor has -1.
+
+        Runtime -- O((n + m)lg(n))
+        '''
+
+        return dijkstraArrays(self.offsets, self.targets, self.weights, self.index[start])
+
+    def multi_source_dijkstra(self, sources, workers = None):
+        '''
+        Runs Dijkstra's algorithm from many sources at once over a pool of worker
+        processes (see multisource.py). Only the offsets, targets and weights arrays
+        are sent to the workers, once per worker, and only the source ids are sent
+        per task. A graph loaded from a snapshot with mmap sends the path of the file
+        instead, and every worker maps the same pages.
+        INPUT:
+            sources: Iterable of starting vertices
+            workers: Number of worker processes (None uses every core, 1 runs
+                everything in this process)
+        OUTPUT:
+            Generator of (source, distance array) tuples in the order they finish.
+            The distance arrays are indexed by vertex id.
+
+        Runtime -- O(s(n + m)lg(n) / workers) for s sources
+        '''
+
+        ids = (self.index[v] for v in sources)
+        for s, distance in multisource.multiSourceDijkstra(self.offsets, self.targets, self.weights, ids,
+                                                             workers, path=self.path):
+            yield self.vertices[s], distance
+
+    def dijkstra(self, start):
+        '''
+        Dijkstra's algorithm that returns the shortest path tree as a new CSRGraph,
+        just like Graph.dijkstra returns a Graph. Use distances if you only need the
+        arrays.
+        INPUT:
+            start: Starting vertex
+        OUTPUT:
+            Shortest path tree from start
+
+        Runtime -- O((n + m)lg(n))
+        '''
+
+        __, predecessor = self.distances(start)
+        return self.__treeFromPredecessors(predecessor)
+
+    def mstPrim(self, v):
+        '''
+        Prim's algorithm on the CSR arrays. See Graph.mstPrim for a full description.
+        INPUT:
+            v: Starting vertex
+        OUTPUT:
+            Minimum spanning tree of the component of v as a new CSRGraph
+
+        Runtime -- O((n + m)lg(n))
+        '''
+
+        if self.directed:
+            raise ValueError('minimum spanning trees are only defined for undirected graphs')
+        n = len(self.vertices)
+        offsets = self.offsets
+        targets = self.targets
+        weights = self.weights
+        best = array('d', [math.inf]) * n
+        predecessor = array('l', [-1]) * n
+        inTree = bytearray(n)
+        s = self.index[v]
+        best[s] = 0
+        priorityQueue = indexedheap.IndexedHeap()
+        priorityQueue.insert(s, 0)
+        while not priorityQueue.isEmpty():
+            u, __ = priorityQueue.pop_min()
+            inTree[u] = 1
+            for slot in range(offsets[u], offsets[u + 1]):
+                t = targets[slot]
+                if inTree[t]:
+                    continue
+                w = weights[slot]
+                if w < best[t]:
+                    best[t] = w
+                    predecessor[t] = u
+                    if priorityQueue.contains(t):
+                        priorityQueue.decrease_key(t, w)
+                    else:
+                        priorityQueue.insert(t, w)
+        return self.__treeFromPredecessors(predecessor)
+
+    def mstKruskal(self):
+        '''
+        Kruskal's algorithm on the CSR arrays. See Graph.mstKruskal for a full
+        description. Since vertices already have dense ids, the disjoint set can
+        use them directly as positions.
+        OUTPUT:
+            Minimum spanning forest as a new CSRGraph
+
+        Runtime -- O(n + mlg(m))
+        '''
+
+        if self.directed:
+            raise ValueError('minimum spanning trees are only defined for undirected graphs')
+        n = len(self.vertices)
+        offsets = self.offsets
+        targets = self.targets
+        candidates = []
+        for u in range(n):
+            for slot in range(offsets[u], offsets[u + 1]):
+                if targets[slot] > u:
+                    candidates.append((self.weights[slot], u, targets[slot], slot))
+        candidates.sort()
+
+        forest = disjointset.DisjointSet(range(n))
+        origins = []
+        destinations = []
+        weights = []
+        keys = []
+        for w, u, t, slot in candidates:
+            if forest.find(u) != forest.find(t):
+                forest.union(u, t)
+                origins.append(u)
+                destinations.append(t)
+                weights.append(w)
+                keys.append(self.__slotKey(slot))
+                if len(origins) == n - 1:
+                    break
+        return CSRGraph.fromEdges(self.vertices, origins, destinations, weights, self.__treeKeys(keys))
+
+    def mstBoruvka(self, workers = 1):
+        '''
+        Borůvka's algorithm (see boruvka.py). Every round each component picks its cheapest
+        edge in one vectorized pass over the edges (or in parallel over worker processes),
+        and there are at most lg(n) rounds.
+        INPUT:
+            workers: Number of worker processes (None uses every core)
+        OUTPUT:
+            Minimum spanning forest as a new CSRGraph
+
+        Runtime -- O(mlg(n) + nlg^2(n)) (see boruvka.py)
+        '''
+
+        if self.directed:
+            raise ValueError('minimum spanning trees are only defined for undirected graphs')
+        n = len(self.vertices)
+        offsets = np.asarray(self.offsets, dtype=np.int64)
+        targets = np.asarray(self.targets, dtype=np.int64)
+        sources = np.repeat(np.arange(n), np.diff(offsets))
+        once = sources < targets # Every undirected edge is stored twice
+        origins = sources[once]
+        destinations = targets[once]
+        weights = np.asarray(self.weights, dtype=np.float64)[once]
+        chosen = boruvka.minimumSpanningForest(n, origins, destinations, weights, workers)
+        keys = None
+        if self.edgeIds is not None:
+            edgeIds = np.asarray(self.edgeIds, dtype=np.int64)[once]
+            keys = [self.edgeKey(e) for e in edgeIds[chosen].tolist()]
+        return CSRGraph.fromEdges(self.vertices, origins[chosen], destinations[chosen], weights[chosen], keys)
+
+    def __treeFromPredecessors(self, predecessor):
+        '''
+        Builds a CSRGraph out of a predecessor array. The edge between a vertex and
+        its predecessor is the lightest edge connecting the two.
+        INPUT:
+            predecessor: Predecessor id of every vertex, -1 if none
+        OUTPUT:
+            Tree as a CSRGraph
+        '''
+
+        origins = []
+        destinations = []
+        weights = []
+        keys = []
+        for t, u in enumerate(predecessor):
+            if u < 0:
+                continue
+            high = self.offsets[u + 1]
+            best = slot = bisect_left(self.targets, t, self.offsets[u], high)
+            while slot < high and self.targets[slot] == t:
+                if self.weights[slot] < self.weights[best]:
+                    best = slot
+                slot += 1
+            origins.append(u)
+            destinations.append(t)
+            weights.append(self.weights[best])
+            keys.append(self.__slotKey(best))
+        return CSRGraph.fromEdges(self.vertices, origins, destinations, weights, self.__treeKeys(keys), self.directed)
+
+    def __slotKey(self, slot):
+        '''
+        Key of the edge a slot belongs to (None if we do not keep edge ids).
+        '''
+
+        return None if self.edgeIds is None else self.edgeKey(self.edgeIds[slot])
+
+    def __treeKeys(self, keys):
+        '''
+        Keys for a tree built out of our edges. A graph without edge ids builds a tree
+        without them too.
+        '''
+
+        return None if self.edgeIds is None else keys
+
+    def linkAnalysis(self):
+        '''
+        Builds the sparse adjacency matrix PageRank, HITS and Katz centrality iterate on
+        (see centrality.py). Keep the result around to run several analyses (or the same
+        one with a warm start) without rebuilding the matrix.
+        OUTPUT:
+            LinkAnalysis
+
+        Runtime -- O(n + m)
+        '''
+
+        return LinkAnalysis(self)
+
+    def triangleCounter(self, chunkSize = 1 << 20):
+        '''
+        Builds the degree ordered view triangle counting and clustering coefficients
+        work on (see triangles.py). Directions, weights and parallel edges are ignored.
+        INPUT:
+            chunkSize: Roughly how many wedges are checked with one batch of NumPy calls
+        OUTPUT:
+            TriangleCounter
+
+        Runtime -- O(n + mlg(m))
+        '''
+
+        return TriangleCounter(self, chunkSize)
+
+    def communityDetection(self):
+        '''
+        Builds the symmetric edge arrays label propagation and Louvain work on (see
+        communities.py). Directions and self loops are ignored.
+        OUTPUT:
+            CommunityDetection
+
+        Runtime -- O(n + m)
+        '''
+
+        return CommunityDetection(self)
+
+    def sumWeights(self):
+        '''
+        Sums the weights of all of the edges. Every undirected edge is stored
+        twice so we divide by two.
+
+        Runtime -- O(m)
+        '''
+
+        if self.directed:
+            return sum(self.weights)
+        return sum(self.weights) / 2
+
+    def __str__(self):
+        '''
+        String representation of our CSR graph
+        '''
+
+        string = ''
+        for u, v in enumerate(self.vertices):
+            neighbors = [f'({self.vertices[self.targets[slot]]}, Weight: {self.weights[slot]})' for slot in self.neighbors(u)]
+            string += f'{v}\nEdges: {neighbors}\n\n'
+        return string
+
+
+def dijkstraArrays(offsets, targets, weights, s):
+    '''
+    Dijkstra's algorithm on raw CSR arrays. This lives outside of the class so that
+    worker processes can run it without a copy of the vertex objects.
+    INPUT:
+        offsets: CSR offsets
+        targets: CSR targets
+        weights: CSR weights
+        s: Id of the starting vertex
+    OUTPUT:
+        (distance, predecessor) arrays indexed by vertex id
+    '''
+
+    n = len(offsets) - 1
+    distance = array('d', [math.inf]) * n
+    predecessor = array('l', [-1]) * n
+    settled = bytearray(n)
+    distance[s] = 0
+    priorityQueue = indexedheap.IndexedHeap()
+    priorityQueue.insert(s, 0)
+    while not priorityQueue.isEmpty():
+        u, d = priorityQueue.pop_min()
+        settled[u] = 1
+        for slot in range(offsets[u], offsets[u + 1]):
+            t = targets[slot]
+            if settled[t]:
+                continue
+            candidate = d + weights[slot]
+            if candidate < distance[t]:
+                distance[t] = candidate
+                predecessor[t] = u
+                if priorityQueue.contains(t):
+                    priorityQueue.decrease_key(t, candidate)
+                else:
+                    priorityQueue.insert(t, candidate)
+    return distance, predecessor
+
+
+def directionOptimizingBfs(offsets, targets, s, alpha = 14, beta = 24, reverseOffsets = None, reverseTargets = None):
+    '''
+    Direction optimizing breadth first search on raw CSR arrays (see CSRGraph.bfsLevels).
+    INPUT:
+        offsets: CSR offsets
+        targets: CSR targets
+        s: Id of the starting vertex
+        alpha: Top down to bottom up threshold
+        beta: Bottom up to top down threshold
+        reverseOffsets: CSR offsets of the entering edges (None if undirected)
+        reverseTargets: CSR targets of the entering edges (None if undirected)
+    OUTPUT:
+        (distance, parent) arrays indexed by vertex id
+    '''
+
+    offsets = np.asarray(offsets, dtype=np.int64)
+    targets = np.asarray(targets, dtype=np.int64)
+    if reverseOffsets is None:
+        reverseOffsets, reverseTargets = offsets, targets
+    else:
+        reverseOffsets = np.asarray(reverseOffsets, dtype=np.int64)
+        reverseTargets = np.asarray(reverseTargets, dtype=np.int64)
+    n = len(offsets) - 1
+    degree = np.diff(offsets)
+    reverseDegree = np.diff(reverseOffsets)
+    distance = np.full(n, -1, dtype=np.int64)
+    parent = np.full(n, -1, dtype=np.int64)
+    distance[s] = 0
+    frontier = np.array([s], dtype=np.int64)
+    unvisitedEdges = int(reverseDegree.sum()) - int(reverseDegree[s])
+    level = 0
+    bottomUp = False
+    while frontier.size:
+        level += 1
+        frontierEdges = int(degree[frontier].sum())
+        if not bottomUp and frontierEdges > unvisitedEdges / alpha:
+            bottomUp = True
+        elif bottomUp and frontier.size < n / beta:
+            bottomUp = False
+
+        if bottomUp:
+            inFrontier = np.zeros(n, dtype=bool)
+            inFrontier[frontier] = True
+            children, parents = _bottomUpStep(reverseOffsets, reverseTargets, reverseDegree,
+                                              np.flatnonzero(distance < 0), inFrontier)
+        else:
+            slots, owners = _gatherSlots(offsets, degree, frontier)
+            neighbors = targets[slots]
+            fresh = distance[neighbors] < 0
+            children, first = np.unique(neighbors[fresh], return_index=True)
+            parents = owners[fresh][first]
+        distance[children] = level
+        parent[children] = parents
+        unvisitedEdges -= int(reverseDegree[children].sum())
+        frontier = children
+    return distance, parent
+
+
+def _bottomUpStep(offsets, targets, degree, unvisited, inFrontier):
+    '''
+    One bottom up level. Round k checks the k-th edge of every unvisited vertex that has
+    not found a parent yet, so a vertex stops looking as soon as it finds one. Once only a
+    few vertices are left we check all of their remaining edges at once.
+    OUTPUT:
+        (children, parents) arrays of the vertices that joined the next level
+    '''
+
+    candidates = unvisited[degree[unvisited] > 0]
+    children = []
+    parents = []
+    k = 0
+    while candidates.size >= 256:
+        neighbors = targets[offsets[candidates] + k]
+        hit = inFrontier[neighbors]
+        children.append(candidates[hit])
+        parents.append(neighbors[hit])
+        k += 1
+        candidates = candidates[~hit & (degree[candidates] > k)]
+    if candidates.size:
+        slots, owners = _gatherSlots(offsets + k, degree - k, candidates)
+        neighbors = targets[slots]
+        hit = inFrontier[neighbors]
+        found, first = np.unique(owners[hit], return_index=True)
+        children.append(found)
+        parents.append(neighbors[hit][first])
+    if not children:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    return np.concatenate(children), np.concatenate(parents)
+
+
+def _gatherSlots(offsets, degree, vertices):
+    '''
+    Returns every slot of the given vertices (one after the other) and the vertex each
+    slot belongs to, without a python loop.
+    '''
+
+    counts = degree[vertices]
+    total = int(counts.sum())
+    starts = np.repeat(offsets[vertices] - (np.cumsum(counts) - counts), counts)
+    return starts + np.arange(total), np.repeat(vertices, counts)
+
+
+def _reverseArrays(offsets, targets):
+    '''
+    Builds the CSR offsets and targets of the reversed graph (every edge entering a
+    vertex, stored with that vertex).
+    '''
+
+    offsets = np.asarray(offsets, dtype=np.int64)
+    targets = np.asarray(targets, dtype=np.int64)
+    n = len(offsets) - 1
+    sources = np.repeat(np.arange(n), np.diff(offsets))
+    order = np.lexsort((sources, targets))
+    reverseOffsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(targets, minlength=n), out=reverseOffsets[1:])
+    return _asArray('l', reverseOffsets), _asArray(_indexType(n), sources[order])
+
+
+def _asArray(typecode, values):
+    '''
+    Copies a NumPy array into a python array.array with the given typecode.
+    '''
+
+    result = array(typecode)
+    result.frombytes(np.ascontiguousarray(values, dtype=np.dtype(typecode)).tobytes())
+    return result
+
+
+def _indexType(count):
+    '''
+    Typecode of the smallest integers that hold ids from 0 to count - 1.
+    '''
+
+    return 'i' if count < 2 ** 31 else 'l'
@@ -0,0 +1,225 @@
+import sys
+sys.path.append('../')
+from Heaps import indexedheap # Used to settle the vertices we repair
+import math
+
+'''
+Written by David Terpay
+Single source shortest paths under changing edge weights, in the style of Ramalingam and
+Reps. We keep the shortest path tree from one source (the distance, predecessor and
+predecessor edge of every vertex, plus the children of every vertex in the tree). When
+some edge weights change, most of the tree is still correct, so instead of running
+Dijkstra's algorithm again from scratch we only repair the part that changed:
+    1. Apply every new weight in the batch.
+    2. Increases: if an edge of the tree got heavier, every vertex below it in the tree
+        (its subtree) may now have a shorter path that avoids the edge. We forget the
+        distances of all of those affected vertices, and give each of them the best
+        distance it can get in one edge from a vertex that is not affected.
+    3. Decreases: if an edge u -> v got lighter and d(u) + w(u, v) is now smaller than
+        d(v), v gets the new distance (and so may everything below it).
+    4. Run Dijkstra's algorithm, but only starting from the vertices that changed in
+        2 and 3. It stops spreading as soon as a vertex does not improve, so it only
+        touches the vertices whose distance actually changes (and their neighbors).
+An edge that is not in the tree can only matter when it gets lighter, so increases on
+edges outside the tree cost nothing. The work of a batch is roughly proportional to the
+number of edges around the vertices whose distance changed, not to the size of the graph.
+
+The structure works on the vertex ids of the graph (see Graph.index) and on anything with
+the same incidentPairs and inPairs as a Graph, such as a MatrixGraph. The edges of a
+Graph are compared by identity, the edges of a MatrixGraph by their two vertices. Adding or removing
+vertices or edges is not tracked: build a new one after changing the structure of the
+graph. Weight changes have to go through updateWeights so that we see them.
+
+Runtime -- O(k + alg(a)) per batch where a is the number of vertices whose distance
+changes and k the number of edges around them
+'''
+
+
+class DynamicShortestPaths():
+    def __init__(self, graph, source):
+        '''
+        Runs Dijkstra's algorithm once from source and keeps the tree.
+        INPUT:
+            graph: Graph with non negative edge weights
+            source: Source vertex
+        '''
+
+        self.graph = graph
+        self.source = source
+        n = len(graph.vertexList)
+        self.distance = [math.inf] * n
+        self.predecessor = [None] * n # Id of the parent in the tree
+        self.predecessorEdge = [None] * n
+        self.children = [set() for __ in range(n)]
+        for v in graph.vertexList:
+            for e, __ in graph.incidentPairs(v):
+                if e.weight < 0:
+                    raise ValueError('dynamic shortest paths need non negative edge weights')
+        s = graph.index[source]
+        self.distance[s] = 0
+        self.repaired = self.__propagate({s})
+
+    def updateWeight(self, edge, weight):
+        '''
+        Changes the weight of one edge and repairs the tree (see updateWeights).
+        '''
+
+        return self.updateWeights([(edge, weight)])
+
+    def updateWeights(self, updates):
+        '''
+        Changes the weights of a batch of edges and repairs the tree once for the whole
+        batch.
+        INPUT:
+            updates: Iterable of (edge, new weight) tuples. The edges are edge objects of
+                the graph, for example from areAdjacent.
+        OUTPUT:
+            Number of vertices whose distance we had to recompute
+
+        Raises ValueError if a new weight is negative (no weight is changed then).
+        '''
+
+        updates = list(updates)
+        if any(weight < 0 for __, weight in updates):
+            raise ValueError('dynamic shortest paths need non negative edge weights')
+        index = self.graph.index
+        heavier = []
+        lighter = []
+        for e, weight in updates:
+            if weight > e.weight:
+                heavier.append(e)
+            elif weight < e.weight:
+                lighter.append(e)
+            e.weight = weight
+
+        # Every vertex below an edge of the tree that got heavier is affected
+        affected = set()
+        for e in heavier:
+            for u, v in self.__directions(e):
+                if self.predecessorEdge[v] == e and self.predecessor[v] == u and v not in affected:
+                    self.__collectSubtree(v, affected)
+        for v in affected:
+            self.__detach(v)
+            self.distance[v] = math.inf
+        seeds = set()
+        for v in affected:
+            for e, adjvert in self.graph.inPairs(self.graph.vertexList[v]):
+                u = index[adjvert]
+                if u not in affected:
+                    self.__relax(u, v, e, seeds)
+
+        for e in lighter:
+            for u, v in self.__directions(e):
+                self.__relax(u, v, e, seeds)
+
+        self.repaired = self.__propagate(seeds)
+        return self.repaired
+
+    def distanceTo(self, vertex):
+        '''
+        Current distance from the source to vertex (inf if unreachable).
+
+        Runtime -- O(1)
+        '''
+
+        return self.distance[self.graph.index[vertex]]
+
+    def pathTo(self, vertex):
+        '''
+        Current shortest path from the source to vertex.
+        OUTPUT:
+            List of vertices from the source to vertex, empty if unreachable
+
+        Runtime -- O(length of the path)
+        '''
+
+        v = self.graph.index[vertex]
+        if self.distance[v] == math.inf:
+            return []
+        path = []
+        while v is not None:
+            path.append(self.graph.vertexList[v])
+            v = self.predecessor[v]
+        path.reverse()
+        return path
+
+    def __directions(self, e):
+        '''
+        Ids (u, v) of the ways we can walk e, both of them for an undirected graph.
+        '''
+
+        u, v = self.graph.index[e.origin], self.graph.index[e.destination]
+        if self.graph.directed:
+            return [(u, v)]
+        return [(u, v), (v, u)]
+
+    def __collectSubtree(self, v, affected):
+        '''
+        Adds v and everything below it in the tree to affected.
+        '''
+
+        stack = [v]
+        affected.add(v)
+        while stack:
+            for child in self.children[stack.pop()]:
+                if child not in affected:
+                    affected.add(child)
+                    stack.append(child)
+
+    def __detach(self, v):
+        '''
+        Removes v from the children of its parent.
+        '''
+
+        parent = self.predecessor[v]
+        if parent is not None:
+            self.children[parent].discard(v)
+        self.predecessor[v] = None
+        self.predecessorEdge[v] = None
+
+    def __relax(self, u, v, e, seeds):
+        '''
+        Makes u the parent of v if going through e is shorter.
+        '''
+
+        candidate = self.distance[u] + e.weight
+        if candidate < self.distance[v]:
+            self.__detach(v)
+            self.distance[v] = candidate
+            self.predecessor[v] = u
+            self.predecessorEdge[v] = e
+            self.children[u].add(v)
+            seeds.add(v)
+
+    def __propagate(self, seeds):
+        '''
+        Dijkstra's algorithm that starts with the vertices in seeds (using their current
+        distances) and only follows vertices that improve.
+        OUTPUT:
+            Number of vertices we settled
+        '''
+
+        graph = self.graph
+        index = graph.index
+        distance = self.distance
+        priorityQueue = indexedheap.IndexedHeap()
+        for v in seeds:
+            priorityQueue.insert(v, distance[v])
+        settled = 0
+        while not priorityQueue.isEmpty():
+            u, weight = priorityQueue.pop_min()
+            settled += 1
+            for e, adjvert in graph.incidentPairs(graph.vertexList[u]):
+                v = index[adjvert]
+                candidate = weight + e.weight
+                if candidate < distance[v]:
+                    self.__detach(v)
+                    distance[v] = candidate
+                    self.predecessor[v] = u
+                    self.predecessorEdge[v] = e
+                    self.children[u].add(v)
+                    if priorityQueue.contains(v):
+                        priorityQueue.decrease_key(v, candidate)
+                    else:
+                        priorityQueue.insert(v, candidate)
+        return settled
@@ -6,10 +6,9 @@ contain a few data items
 2. Key
 3. Pointers to the position of the item in the linked list of 
     edges stored in the vertex edge list.
-4. Visited which will allow us to keep track of the edges we visited
-    when we are doing traversals
-5. Discovery will allow us to label the edges as we are traversing the 
-    graph.
+4. Weight
+Labels such as visited or discovery are kept by the traversals themselves
+so that several traversals can run on the same graph at once.
 '''
 class Edge():
     def __init__(self, vertex1, vertex2, vertex1Pointer, vertex2Pointer, key):
@@ -18,8 +17,6 @@ class Edge():
         self.destination = vertex2
         self.v2Pointer = vertex2Pointer
         self.key = key
-        self.visited = False
-        self.discovery = False
         self.weight = 0
     
     def __lt__(self, other):
@@ -29,5 +26,5 @@ class Edge():
         return self.weight > other.weight
 
     def __str__(self):
-        return str([str(self.origin), str(self.destination), f'Key: {self.key}', f'Visited: {self.visited}', f'Discovery: {self.discovery}', f'Weight: {self.weight}'])
+        return str([str(self.origin), str(self.destination), f'Key: {self.key}', f'Weight: {self.weight}'])
     
@@ -0,0 +1,296 @@
+from itertools import chain, islice
+import io
+import numpy as np
+import os
+import warnings
+
+'''
+Written by David Terpay
+Readers for edge list files. Graph.from_edge_list uses these to load a graph without
+calling insertVertex and insertEdge once per edge.
+
+An edge list is the simplest way to store a graph: one edge per record. We support
+    1. Text files (CSV, TSV, whitespace separated): origin, destination and optionally a
+        weight on every line. Empty lines and everything after a # are skipped, and
+        columns after the ones we need are ignored.
+    2. Binary files: back to back little endian records of an int32 origin, an int32
+        destination and (if weighted) a float32 weight. That is 12 bytes per edge.
+    3. Any python iterable of lines or of (origin, destination[, weight]) tuples.
+
+Vertices can be named anything in the file, so we intern every name into a dense id
+from 0 to n - 1 (the first name we see gets 0, and so on). The result is three flat
+arrays (origin ids, destination ids, weights) and the list of names, which is exactly
+what CSRGraph.fromEdges needs to build the adjacency in bulk.
+
+The input is read in chunks of about chunkSize records so the memory we use while
+reading does not depend on the size of the file. No chunk is split into fields in
+python: text is parsed by np.loadtxt (straight into int64 or float64 columns when keyType
+is int or float) and binary records are decoded with np.frombuffer. Every chunk is then
+reduced to its distinct names with np.unique(..., return_inverse=True), and one more
+np.unique over the names of all of the chunks gives every name its final id.
+'''
+
+_BLOCK = 32 # Characters per line we expect when reading a text file in blocks
+
+
+def readEdgeList(source, delimiter = None, weighted = True, binary = False, keyType = None, chunkSize = 65536):
+    '''
+    Reads an edge list.
+    INPUT:
+        source: Path to a file or an iterable of lines or tuples
+        delimiter: Column separator of a text file (None splits on any whitespace)
+        weighted: Every record has a weight. Without one every edge gets weight 1.
+        binary: The file holds int32/float32 records instead of text
+        keyType: Function applied to every vertex name in a text file (for example int)
+        chunkSize: Number of records we read at a time
+    OUTPUT:
+        (keys, origins, destinations, weights) where keys[i] is the name of vertex i
+
+    Raises ValueError if a record has fewer columns than we need or a column cannot be
+    parsed.
+    '''
+
+    if binary:
+        return _readBinary(source, weighted, chunkSize)
+    if isinstance(source, (str, bytes, os.PathLike)):
+        with open(source) as lines:
+            return _readText(_textBlocks(lines, chunkSize), delimiter, weighted, keyType)
+    records = iter(source)
+    first = next(records, None)
+    records = chain([first], records) if first is not None else iter(())
+    if isinstance(first, str):
+        return _readText(_lineBlocks(records, chunkSize), delimiter, weighted, keyType)
+    return _readTuples(records, weighted, chunkSize)
+
+
+def _textBlocks(lines, chunkSize):
+    '''
+    Reads a text file in blocks of whole lines.
+    OUTPUT:
+        Generator of (text, number of its first line)
+    '''
+
+    rest = ''
+    number = 1
+    while True:
+        block = lines.read(chunkSize * _BLOCK)
+        if not block:
+            break
+        block = rest + block
+        cut = block.rfind('\n') + 1
+        rest = block[cut:]
+        if cut:
+            yield block[:cut], number
+            number += block.count('\n', 0, cut)
+    if rest:
+        yield rest, number
+
+
+def _lineBlocks(lines, chunkSize):
+    '''
+    Joins an iterable of lines into blocks of chunkSize lines.
+    OUTPUT:
+        Generator of (text, number of its first line)
+    '''
+
+    number = 1
+    while True:
+        chunk = list(islice(lines, chunkSize))
+        if not chunk:
+            break
+        yield '\n'.join(line.rstrip('\r\n') for line in chunk), number
+        number += len(chunk)
+
+
+def _readText(blocks, delimiter, weighted, keyType):
+    '''
+    Parses every block of text with np.loadtxt and interns the vertex names.
+    '''
+
+    columns = 3 if weighted else 2
+    numeric = keyType in (int, float)
+    if numeric:
+        keyDtype = np.int64 if keyType is int else np.float64
+        fields = [('origin', keyDtype), ('destination', keyDtype)]
+        if weighted:
+            fields.append(('weight', np.float64))
+        dtype = np.dtype(fields)
+    else:
+        dtype = str
+    chunks = []
+    weights = []
+    for text, number in blocks:
+        try:
+            table = _loadColumns(text, dtype, delimiter, tuple(range(columns)) if numeric else (0, 1))
+            if not numeric:
+                chunks.append((np.char.strip(table[:, 0]), np.char.strip(table[:, 1])))
+                if weighted:
+                    # Converting strings to floats in NumPy is slow, parsing the column again is not
+                    weights.append(_loadColumns(text, np.float64, delimiter, (2,)))
+            else:
+                chunks.append((table['origin'], table['destination']))
+                if weighted:
+                    weights.append(table['weight'])
+        except ValueError as error:
+            raise _recordError(error, text, number, delimiter, columns) from None
+    return _intern(chunks, weights, weighted, None if keyType is str or numeric else keyType)
+
+
+def _loadColumns(text, dtype, delimiter, usecols):
+    '''
+    Runs np.loadtxt on a block of text. Names come back as an m x 2 array of strings,
+    several numeric columns as a structured array and a single one as a flat array.
+    '''
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', UserWarning) # A block of comments has no data
+        table = np.loadtxt(io.StringIO(text), dtype=dtype, delimiter=delimiter, comments='#',
+                           usecols=usecols, ndmin=2 if dtype is str else 1)
+    return table
+
+
+def _recordError(error, text, number, delimiter, columns):
+    '''
+    Builds a ValueError that points at the first line of a block with too few columns,
+    or at the block if every line has enough of them.
+    '''
+
+    last = number
+    for last, line in enumerate(text.splitlines(), number):
+        line = line.split('#', 1)[0].strip()
+        if line:
+            found = len(line.split(delimiter))
+            if found < columns:
+                return ValueError(f'line {last} has {found} columns, expected at least {columns}')
+    return ValueError(f'could not parse the edges on lines {number} to {last}: {error}')
+
+
+def _readTuples(records, weighted, chunkSize):
+    '''
+    Reads (origin, destination[, weight]) tuples chunk by chunk. The names are already
+    python objects, so we intern them with a dictionary.
+    '''
+
+    columns = 3 if weighted else 2
+    ids = {}
+    origins = []
+    destinations = []
+    weights = []
+    position = 0
+    while True:
+        chunk = list(islice(records, chunkSize))
+        if not chunk:
+            break
+        for record in chunk:
+            position += 1
+            if len(record) < columns:
+                raise ValueError(f'record {position} has {len(record)} fields, expected at least {columns}')
+        origins.append(np.fromiter((ids.setdefault(record[0], len(ids)) for record in chunk), np.int64, len(chunk)))
+        destinations.append(np.fromiter((ids.setdefault(record[1], len(ids)) for record in chunk), np.int64, len(chunk)))
+        if weighted:
+            weights.append(np.fromiter((float(record[2]) for record in chunk), np.float64, len(chunk)))
+    m = sum(len(chunk) for chunk in origins)
+    origins = np.concatenate(origins) if origins else np.zeros(0, dtype=np.int64)
+    destinations = np.concatenate(destinations) if destinations else np.zeros(0, dtype=np.int64)
+    return list(ids), origins, destinations, np.concatenate(weights) if weights else np.ones(m)
+
+
+def _intern(chunks, weights, weighted, keyType = None):
+    '''
+    Gives every vertex name a dense id in the order the names first appear.
+    INPUT:
+        chunks: List of (origin names, destination names) NumPy arrays
+        weights: List of weight arrays, parallel to chunks (ignored if not weighted)
+        weighted: The weights were read from the input, otherwise every edge gets 1
+        keyType: Function applied to every distinct name (None keeps the names)
+    OUTPUT:
+        (keys, origins, destinations, weights)
+    '''
+
+    # Distinct names of every chunk and where each of them first appears
+    names = []
+    firsts = []
+    inverses = []
+    position = 0
+    for origins, destinations in chunks:
+        both = np.stack((origins, destinations), axis=1).ravel() # o0, d0, o1, d1, ...
+        distinct, first, inverse = np.unique(both, return_index=True, return_inverse=True)
+        names.append(distinct)
+        firsts.append(first + position)
+        inverses.append(inverse.ravel())
+        position += len(both)
+    m = position // 2
+    if not m:
+        return [], np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.ones(0)
+
+    # np.unique keeps the first copy of every name, which comes from the earliest chunk
+    keys, index, inverse = np.unique(np.concatenate(names), return_index=True, return_inverse=True)
+    firstSeen = np.concatenate(firsts)[index]
+    keys = keys.tolist()
+    if keyType is not None:
+        ids = {}
+        merged = np.array([ids.setdefault(keyType(key), len(ids)) for key in keys], dtype=np.int64)
+        keys = list(ids)
+        seen = np.full(len(keys), position, dtype=np.int64)
+        np.minimum.at(seen, merged, firstSeen)
+        inverse = merged[inverse]
+        firstSeen = seen
+    order = np.argsort(firstSeen, kind='stable')
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+    keys = [keys[i] for i in order.tolist()]
+
+    ids = []
+    start = 0
+    for distinct, local in zip(names, inverses):
+        ids.append(rank[inverse[start:start + len(distinct)]][local])
+        start += len(distinct)
+    ids = np.concatenate(ids)
+    weights = np.concatenate(weights).astype(np.float64) if weighted else np.ones(m)
+    return keys, ids[0::2], ids[1::2], weights
+
+
+def _readBinary(path, weighted, chunkSize):
+    '''
+    Reads a binary edge file chunk by chunk with NumPy.
+    '''
+
+    fields = [('origin', '<i4'), ('destination', '<i4')]
+    if weighted:
+        fields.append(('weight', '<f4'))
+    record = np.dtype(fields)
+    chunks = []
+    weights = []
+    with open(path, 'rb') as edgeFile:
+        while True:
+            chunk = edgeFile.read(chunkSize * record.itemsize)
+            if not chunk:
+                break
+            if len(chunk) % record.itemsize:
+                raise ValueError(f'{path} does not hold whole {record.itemsize} byte records')
+            edges = np.frombuffer(chunk, dtype=record)
+            chunks.append((edges['origin'].astype(np.int64), edges['destination'].astype(np.int64)))
+            if weighted:
+                weights.append(edges['weight'])
+    return _intern(chunks, weights, weighted)
+
+
+def writeBinaryEdgeList(path, origins, destinations, weights = None):
+    '''
+    Writes edges in the binary format readEdgeList understands.
+    INPUT:
+        path: File we are writing
+        origins: Integer name of the first vertex of every edge
+        destinations: Integer name of the second vertex of every edge
+        weights: Weight of every edge (None writes an unweighted file)
+    '''
+
+    fields = [('origin', '<i4'), ('destination', '<i4')]
+    if weights is not None:
+        fields.append(('weight', '<f4'))
+    edges = np.empty(len(origins), dtype=np.dtype(fields))
+    edges['origin'] = origins
+    edges['destination'] = destinations
+    if weights is not None:
+        edges['weight'] = weights
+    edges.tofile(path)
@@ -1,13 +1,24 @@
 from edge import Edge
 from vertex import Vertex
+from csrgraph import CSRGraph
+from matrixgraph import MatrixGraph # Implementation 2, see Graph(backend='matrix')
+import allpairs # Used in Floyd Warshall's and Johnson's algorithms
+import edgelist # Used to load graphs from edge list files
+import boruvka # Used in Borůvka's algorithm
+import maxflow # Used in maximum flow and minimum cut
+from contraction import ContractionHierarchy # Used for fast point to point queries
+from landmarks import LandmarkOracle # Used for distance estimates and A* heuristics
+from dynamicpaths import DynamicShortestPaths # Used to repair shortest paths after weight changes
 import sys
 sys.path.append('../')
 from Linked_List import LinkedList # Used in backend adjacency list impl.
 from Stacks import Stack # Used in DFS traversal
-from Queues import Queue # Used in BFS traversal
+from Queues import Queue # Used in BFS traversal and Bellman Ford's algorithm
 from Disjoint_Sets import disjointset # Used in minimum spanning trees
 from Heaps import heap # Used in minimum spanning trees
+from Heaps import indexedheap # Used in Prim's and Dijkstra's algorithms
 import math
+import gc # Paused while we bulk insert edges
 
 '''
 Written by David Terpay
@@ -78,31 +89,80 @@ NOTE: THIS CLASS WILL IMPLEMENT AN ADJACENCY LIST
 '''
 
 class Graph():
-    def __init__(self):
+    def __new__(cls, directed = False, indexEdges = True, backend = 'list'):
+        '''
+        Picks the implementation of a new graph. backend='list' (the default) gives the
+        adjacency list below, backend='matrix' gives an adjacency matrix with packed bits
+        (see matrixgraph.py), which uses far less memory for dense graphs. It has the
+        same functions as this class, implemented on the packed rows of the matrix.
+        '''
+
+        if backend == 'matrix':
+            return MatrixGraph(directed)
+        if backend != 'list':
+            raise ValueError(f'unknown graph backend {backend}')
+        return super().__new__(cls)
+
+    def __init__(self, directed = False, indexEdges = True, backend = 'list'):
         '''
         Our graph will keep track of a set of vertices and a linked list of edges as
         mentioned in the description of an adjacency list.
 
+        Every vertex also gets a dense id (0 to n - 1) when it is inserted. index maps
+        a vertex to its id and vertexList maps an id back to its vertex. The algorithms
+        below keep their state (visited flags, distances, predecessors) in lists
+        indexed by these ids that belong to a single call, instead of writing it into
+        the vertex and edge objects. This means we never have to reset the graph before
+        a traversal, and several traversals can run on the same graph at the same time.
+
+        On top of the adjacency list we can keep an edge index. This is a hash table
+        that maps every pair of vertices to the nodes in our linked list of edges that
+        connect them. It costs one extra hash table entry per edge, but it lets
+        areAdjacent and removeEdge run in O(1) time instead of scanning the incident
+        edges of the smaller degree vertex. This matters a lot for graphs with a few
+        very high degree vertices since every traversal calls areAdjacent once per neighbor.
+
+        A graph can also be directed. In that case an edge can only be followed from its
+        origin to its destination. Every vertex then keeps two linked lists: the edges
+        leaving it (self.vertices) and the edges entering it (self.inEdges). All of the
+        traversals and shortest path algorithms follow the edges leaving a vertex.
+
+        Finally we keep a disjoint set (see Disjoint_Sets) with one set per connected
+        component. Inserting a vertex makes a new set and inserting an edge unions the
+        sets of its two vertices, so numConnectedComponents and same_component never
+        have to traverse the graph. A disjoint set cannot split a set, so removing a
+        vertex or an edge only marks it as out of date and the next query rebuilds it.
+        INPUT:
+            directed: Edges only go from origin to destination (default False)
+            indexEdges: Keep the edge index up to date (default True)
+            backend: 'list' for this adjacency list, 'matrix' for an adjacency matrix
+
         Runtime
         Implementation 1: O(n)
         Implementation 2: O(n ^ 2)
         Implementation 3: O(n)
         '''
 
+        self.directed = directed
         self.vertices = {}
+        self.inEdges = {} if directed else None
         self.edges = LinkedList.LinkedList()
-        self.connectedComponents = 0
-        self.cycles = False
+        self.components = disjointset.DisjointSet()
+        self.componentCount = 0
+        self.edgeIndex = {} if indexEdges else None
+        self.index = {}
+        self.vertexList = []
 
     def insertVertex(self, key):
         '''
         Here all we do is create a new vertex object with the key parameter and insert it
         into our set of vertices. The reason we use a set is because it is implemented
-        using a hashtable and allows us to have constant lookups.
+        using a hashtable and allows us to have constant lookups. The vertex gets the
+        next free id.
         INPUT:
             key: Key or data we want to insert
         OUTPUT:
-            Inserted vertex into our graph
+            Inserted vertex
 
         Runtime
         Implementation 1: O(1)
@@ -111,12 +171,13 @@ class Graph():
         '''
 
         vert = Vertex(key)
-        self.vertices[vert] = LinkedList.LinkedList()
-    
+        self.__createdVertexInsertion(vert)
+        return vert
+
     def __createdVertexInsertion(self, v):
         '''
         This is a helper function to simply inserted a given vertex into a 
-        hash table of existing vertices
+        hash table of existing vertices. The vertex starts out in its own component.
         INPUT:
             v: Vertex that we are inserting
         OUTPUT:
@@ -124,6 +185,13 @@ class Graph():
         '''
 
         self.vertices[v] = LinkedList.LinkedList()
+        if self.directed:
+            self.inEdges[v] = LinkedList.LinkedList()
+        self.index[v] = len(self.vertexList)
+        self.vertexList.append(v)
+        if self.components is not None:
+            self.components.makeSet(v)
+            self.componentCount += 1
 
     def insertEdge(self, origin, destination, key, weight = 0):
         '''
@@ -132,7 +200,10 @@ class Graph():
         a new node, you make the edge point back to the exact location of each of
         the vertices; likewise, we make the data within the node stored in the 
         linked list of inicident edges point directly to the edge as stored
-        in the linked list of edges.
+        in the linked list of edges. In a directed graph the node for the destination
+        goes into the list of edges entering the destination instead. An undirected self
+        loop only gets one node, which both ends of the edge point to, so it shows up
+        once in the incident edges of its vertex.
         INPUT:
             origin: Vertex 1 that will have a new edge
             destination: Vertex 2 that will have a new edge
@@ -146,14 +217,43 @@ class Graph():
         Implementation 3: O(1)
         '''
 
-        self.vertices[origin].addFront(None)
-        self.vertices[destination].addFront(None)
+        originList = self.vertices[origin]
+        destinationList = self.inEdges[destination] if self.directed else self.vertices[destination]
+        originList.addFront(None)
+        if destinationList is not originList:
+            destinationList.addFront(None)
         self.edges.addFront(None)
-        edge1 = Edge(origin, destination, self.vertices[origin].head, self.vertices[destination].head, key)
-        self.vertices[origin].head.setData(self.edges.head)
-        self.vertices[destination].head.setData(self.edges.head)
+        edge1 = Edge(origin, destination, originList.head, destinationList.head, key)
+        originList.head.setData(self.edges.head)
+        destinationList.head.setData(self.edges.head)
         edge1.weight = weight
         self.edges.head.setData(edge1)
+        if self.edgeIndex is not None:
+            pair = self.__edgeKey(origin, destination)
+            if pair in self.edgeIndex:
+                self.edgeIndex[pair].append(self.edges.head)
+            else:
+                self.edgeIndex[pair] = [self.edges.head]
+        if self.components is not None and self.components.findItem(origin) != self.components.findItem(destination):
+            self.components.unionItems(origin, destination)
+            self.componentCount -= 1
+
+    def __edgeKey(self, origin, destination):
+        '''
+        Returns the key we use for a pair of vertices in the edge index. If our
+        edges are undirected, (origin, destination) and (destination, origin) have
+        to map to the same key, so we order the two vertices by their id. If they
+        are directed the order matters and we keep it.
+        INPUT:
+            origin: First vertex
+            destination: Second vertex
+        OUTPUT:
+            Tuple key for the edge index
+        '''
+
+        if self.directed or id(origin) <= id(destination):
+            return (origin, destination)
+        return (destination, origin)
         
     def removeVertex(self, v):
         '''
@@ -161,7 +261,8 @@ class Graph():
         removing all of the edges that belong to the vertex. We do so 
         by finding the edge object in the linked list of edges, and
         removing both of the pointers in the edge object (corresponding to
-        the two vertices belonging to the edge).
+        the two vertices belonging to the edge). To keep the ids dense, the
+        vertex with the largest id takes over the id of the removed vertex.
         INPUT:
             v: Vertex that we will remove
         OUTPUT:
@@ -174,18 +275,48 @@ class Graph():
         '''
 
         while self.vertices[v].head:
-            data = self.vertices[v].head.getData().getData()
-            vertex1 = data.v1Pointer
-            vertex2 = data.v2Pointer
-            self.__removeElem(self.vertices[v].head.getData(), self.edges)
-            self.__removeElem(vertex1, self.vertices[data.origin])
-            self.__removeElem(vertex2, self.vertices[data.destination])
+            self.__removeEdgeNode(self.vertices[v].head.getData())
         self.vertices.pop(v)
-            
+        if self.directed:
+            while self.inEdges[v].head:
+                self.__removeEdgeNode(self.inEdges[v].head.getData())
+            self.inEdges.pop(v)
+        self.components = None
+        position = self.index.pop(v)
+        last = self.vertexList.pop()
+        if last is not v:
+            self.vertexList[position] = last
+            self.index[last] = position
+
+    def __removeEdgeNode(self, edgeNode):
+        '''
+        Removes an edge given the node that holds it in our linked list of edges.
+        The edge object points to its two nodes in the incident edge lists of its
+        vertices, so we can unlink all three nodes without searching for them. If
+        we are keeping an edge index, the node is removed from it as well.
+        INPUT:
+            edgeNode: Node in self.edges holding the edge we are removing
+        OUTPUT:
+            Graph without the edge
+        '''
+
+        data = edgeNode.getData()
+        self.components = None
+        if self.edgeIndex is not None:
+            pair = self.__edgeKey(data.origin, data.destination)
+            nodes = self.edgeIndex[pair]
+            nodes.remove(edgeNode)
+            if not nodes:
+                del self.edgeIndex[pair]
+        self.__removeElem(edgeNode, self.edges)
+        self.__removeElem(data.v1Pointer, self.vertices[data.origin])
+        if data.v2Pointer is not data.v1Pointer: # An undirected self loop has a single node
+            self.__removeElem(data.v2Pointer, self.inEdges[data.destination] if self.directed else self.vertices[data.destination])
+
     def __removeElem(self, node, lnkdlst):
         '''
         This function takes in a node and the linked list the node is a part of,
-        and swaps the head of the linked list with the node. This allows us to
+        and links the neighbors of the node to each other. This allows us to
         remove in constant time. 
         INPUT:
             node: Node in the linked list we are removing
@@ -194,14 +325,25 @@ class Graph():
             Node being removed from the linked list.
         '''
 
-        if node != lnkdlst.head:
-            lnkdlst.swap(lnkdlst.head, node)
-        lnkdlst.removeFront()
+        prev = node.getPrev()
+        following = node.getNext()
+        if prev is None:
+            lnkdlst.head = following
+        else:
+            prev.setNext(following)
+        if following is None:
+            lnkdlst.tail = prev
+        else:
+            following.setPrev(prev)
+        node.setNext(None)
+        node.setPrev(None)
+        lnkdlst.length -= 1
 
     def removeEdge(self, origin,destination):
         '''
         This function will remove an edge that has two associated
-        vertices, origin and destination. We first find the vertex with the smaller degree,
+        vertices, origin and destination. If we keep an edge index we simply look up the
+        node holding the edge. Otherwise we first find the vertex with the smaller degree,
         next we traverse through the linked list of edge pointers stored in the
         key. Once we do that we check whether the actual edge object has pointers
         pointing to origin and destination. If so we simply remove, if not, we do nothing and 
@@ -215,27 +357,47 @@ class Graph():
         Implementation 1: O(1)
         Implementation 2: O(1)
         Implementation 3: O(1) + O(min(deg(origin),deg(destination)))
+        Implementation 3 with an edge index: O(1)
+        '''
+
+        if self.edgeIndex is not None:
+            nodes = self.edgeIndex.get(self.__edgeKey(origin, destination))
+            if nodes:
+                self.__removeEdgeNode(nodes[-1])
+            return
+
+        linked = self.__findEdgeNode(origin, destination)
+        if linked is not None:
+            self.__removeEdgeNode(linked.getData())
+
+    def __findEdgeNode(self, origin, destination):
+        '''
+        Scans the incident edges of the smaller degree vertex for an edge between
+        origin and destination. In a directed graph we scan the edges leaving origin
+        or the edges entering destination, whichever list is shorter.
+        INPUT:
+            origin: First vertex
+            destination: Second vertex
+        OUTPUT:
+            Node in the incident edge list pointing to the edge; None otherwise
         '''
 
-        smaller = destination if self.degree(origin) >= self.degree(destination) else origin
-        linked = self.vertices[smaller].head
+        if self.directed:
+            if len(self.vertices[origin]) <= len(self.inEdges[destination]):
+                linked = self.vertices[origin].head
+            else:
+                linked = self.inEdges[destination].head
+        else:
+            smaller = destination if self.degree(origin) >= self.degree(destination) else origin
+            linked = self.vertices[smaller].head
         while linked:
             data = linked.getData().getData()
             if self.__checkVertices(origin, destination, data.origin, data.destination):
-                vertex1 = data.v1Pointer
-                vertex2 = data.v2Pointer
-                self.__removeElem(linked.getData(), self.edges)
-                self.__removeElem(vertex1, self.vertices[origin])
-                self.__removeElem(vertex2, self.vertices[destination])
-                return
-            elif self.__checkVertices(destination, origin, data.origin, data.destination):
-                vertex1 = data.v1Pointer
-                vertex2 = data.v2Pointer
-                self.__removeElem(linked.getData(), self.edges)
-                self.__removeElem(vertex2, self.vertices[origin])
-                self.__removeElem(vertex1, self.vertices[destination])
-                return
+                return linked
+            if not self.directed and self.__checkVertices(destination, origin, data.origin, data.destination):
+                return linked
             linked = linked.getNext()
+        return None
 
     def __checkVertices(self, origin, destination, vertex1, vertex2):
         '''
@@ -255,7 +417,8 @@ class Graph():
     def inicidentEdges(self, v):
         '''
         This function will return all of the edges touching a inputed 
-        vertex.
+        vertex. In a directed graph this includes both the edges leaving and
+        the edges entering the vertex.
         INPUT:
             v: Vertex we are finding all of the inicident edge for
         OUTPUT:
@@ -268,12 +431,15 @@ class Graph():
         '''
 
         edges = list(map(lambda data: data.getData(), self.vertices[v].toList()))
+        if self.directed:
+            edges.extend(map(lambda data: data.getData(), self.inEdges[v].toList()))
         return edges
 
     def areAdjacent(self, origin,destination):
         '''
         This function checks if two vertices, origin and destination, are adjacent.
-        We do so by finding the degree of the smaller vertex, and then traversing
+        If we keep an edge index this is a single hash table lookup. Otherwise
+        we do so by finding the degree of the smaller vertex, and then traversing
         through the linked list of edge pointers stored in the key. We check the edge
         that the edge is pointing to and check whether the pointers stored inside the 
         actual edge object point to origin and destination. If so we return true.
@@ -286,107 +452,191 @@ class Graph():
         Implementation 1: O(m)
         Implementation 2: O(1)
         Implementation 3: O(1) + O(min(deg(origin), deg(destination)))
+        Implementation 3 with an edge index: O(1)
         '''
 
-        smaller = origin if self.degree(origin) <= self.degree(destination) else destination
-        linked = self.vertices[smaller].head
-        while linked:
-            data = linked.getData().getData()
-            if self.__checkVertices(origin, destination, data.origin, data.destination) or self.__checkVertices(destination, origin, data.origin, data.destination):
-                return data
-            linked = linked.getNext()
-        return None
+        if self.edgeIndex is not None:
+            nodes = self.edgeIndex.get(self.__edgeKey(origin, destination))
+            return nodes[-1].getData() if nodes else None
+
+        linked = self.__findEdgeNode(origin, destination)
+        return linked.getData().getData() if linked is not None else None
     
     def adjacentVertices(self, v):
         '''
         This function will return all of the adjacent vertices around a given vertex
         v. This function will be helpful when we are doing BFS and DFS traversals 
-        of the graph.
+        of the graph. In a directed graph these are the vertices we can reach with a
+        single edge leaving v.
         INPUT:
             v: Vertex query
         OUTPUT:
             List of adjacent vertices
         '''
 
-        edges = self.inicidentEdges(v)
-        verts = []
-        for e in edges:
-            if e.origin == v:
-                verts.append(e.destination)
-            else:
-                verts.append(e.origin)
-        return verts
+        return [adjvert for __, adjvert in self.incidentPairs(v)]
+
+    def incidentPairs(self, v):
+        '''
+        Generator that walks the linked list of incident edges of v and yields
+        every edge together with the vertex on the other end of it. Unlike
+        adjacentVertices, this does not build any lists and does not have to
+        look the edge up again with areAdjacent. In a directed graph we only walk
+        the edges leaving v.
+        INPUT:
+            v: Vertex query
+        OUTPUT:
+            (edge, adjacent vertex) tuples
+
+        Runtime - O(deg(v)) for the whole walk
+        '''
+
+        linked = self.vertices[v].head
+        while linked:
+            e = linked.getData().getData()
+            yield e, (e.destination if e.origin is v else e.origin)
+            linked = linked.getNext()
+
+    def inPairs(self, v):
+        '''
+        Same as incidentPairs but walks the edges entering v, yielding each edge
+        with the vertex it comes from. In an undirected graph this is the same as
+        incidentPairs.
+        INPUT:
+            v: Vertex query
+        OUTPUT:
+            (edge, adjacent vertex) tuples
+        '''
+
+        if not self.directed:
+            yield from self.incidentPairs(v)
+            return
+        linked = self.inEdges[v].head
+        while linked:
+            e = linked.getData().getData()
+            yield e, e.origin
+            linked = linked.getNext()
 
     def degree(self, key):
         '''
         This function returns the length of the set of incident edges to a given
-        vertex.
+        vertex. In a directed graph this is the in degree plus the out degree.
         '''
     
+        if self.directed:
+            return len(self.vertices[key]) + len(self.inEdges[key])
+        return len(self.vertices[key])
+
+    def outDegree(self, key):
+        '''
+        Number of edges leaving a vertex (the degree in an undirected graph).
+        '''
+
         return len(self.vertices[key])
 
+    def inDegree(self, key):
+        '''
+        Number of edges entering a vertex (the degree in an undirected graph).
+        '''
+
+        return len(self.inEdges[key]) if self.directed else len(self.vertices[key])
+
     def numConnectedComponents(self):
         '''
         This is returning the number of connected components in our graph.
         All this means is that we might have a disjoint graph where some nodes
-        do not have a path between them. We keep track of this when we call traversals
-        DFS or BFS. Make sure to call the traversal before calling this function.
+        do not have a path between them. We keep track of this as we insert vertices
+        and edges, so there is no need to run a traversal first. In a directed graph
+        we ignore the direction of the edges (weakly connected components).
+
+        Runtime - O(1), or O(n + m) right after a removal
         '''
 
-        return self.connectedComponents
+        return self.__connectivity().componentCount
 
-    def cyclesExist(self):
+    def same_component(self, u, v):
         '''
-        This function is checking whether we have cycles in our graph. A cycle just means
-        that we have the same starting and ending point in a given path that we take 
-        in a graph. We keep track of this when we run the traversals. Make sure to run
-        the traversals before calling this function because otherwise you wil not 
-        get the result you want.
+        Checks whether there is a path between u and v (ignoring the direction of
+        the edges in a directed graph).
+        INPUT:
+            u: First vertex
+            v: Second vertex
+        OUTPUT:
+            True if u and v are in the same connected component, false if not.
+
+        Runtime - O(1)*, or O(n + m) right after a removal
         '''
 
-        return self.cycles
+        components = self.__connectivity().components
+        return components.findItem(u) is components.findItem(v)
 
-    def initialize(self):
+    def __connectivity(self):
+        '''
+        Rebuilds the disjoint set of connected components if a removal made it out
+        of date. Every vertex gets its own set and every edge unions two sets.
+        OUTPUT:
+            self, with components and componentCount up to date
         '''
-        This function will initialize our vertices
-        and edges so that we can properly traverse the entire graph
+
+        if self.components is None:
+            components = disjointset.DisjointSet(self.vertexList)
+            count = len(self.vertexList)
+            for e in self.edges.toList():
+                if components.findItem(e.origin) is not components.findItem(e.destination):
+                    components.unionItems(e.origin, e.destination)
+                    count -= 1
+            self.components = components
+            self.componentCount = count
+        return self
+
+    def cyclesExist(self):
+        '''
+        This function is checking whether we have cycles in our graph. A cycle just means
+        that we have the same starting and ending point in a given path that we take 
+        in a graph. An undirected graph with c connected components is a forest exactly
+        when it has n - c edges, and we already keep track of c, so we only need to count
+        the edges. A directed graph has a cycle exactly when a topological sort cannot
+        order all of its vertices (see topologicalSort). Nothing is stored, so the
+        answer is always up to date.
+
+        Runtime - O(1) undirected (O(n + m) right after a removal), O(n + m) directed
         '''
 
-        for v in self.vertices.keys():
-            v.setVisited(False)
-        for e in self.edges.toList():
-            e.visited = False
-            e.discovery = False
+        if self.directed:
+            return self.__hasDirectedCycle()
+        return self.edges.length > len(self.vertexList) - self.numConnectedComponents()
 
     def bfs(self):
         '''
         A breadth first search works very similarly to a BFS in a 
         binary tree. First we visit all of the children of a node before
         visiting any of the grandchildren. In order to properly do the traversal,
-        we must first set all of the vertices as not visited and label all of
-        the edges as not visited as well. Once we do that we simply do a BFS on every single
+        we keep a visited flag for every vertex id and a label for every edge we
+        have seen. Both belong to this call only, so the graph itself is never
+        modified. Once we do that we simply do a BFS on every single
         node in our vertex list given that we have not yet visited the vertex.
+        Use cyclesExist to check for cycles.
+        OUTPUT:
+            Dictionary mapping every edge to True if it is a discovery edge and
+            False if it is a cross edge
         '''
 
-        self.initialize()
-        for v in self.vertices.keys():
-            if not v.getVisited():
-                self.connectedComponents += 1
-                self.__bfs(v)
+        visited = bytearray(len(self.vertexList))
+        labels = {}
+        for v in self.vertexList:
+            if not visited[self.index[v]]:
+                self.__bfs(v, visited, labels)
+        return labels
     
-    def __bfs(self, v):
+    def __bfs(self, v, visited, labels):
         '''
-        Once we initialize everything (set everything to unexplored), we need a queue
-        to help us visit the locations we need. The algorithm looks like this
+        We need a queue to help us visit the locations we need. The algorithm looks like this
         1. Enqueue the first vertex
-        2. Report on it
-        3. While !q.isempty():
+        2. While !q.isempty():
             1. Dequeue
-            2. Report
-            3. Loop through the adjacent vertices
-                - Update the edges, mark the vertex as visited (if not yet visited); enqueue
-                - If visited, check if edge has been visited, if not mark the edge as a cross edge
-                    which means we have a cycle
+            2. Loop through the adjacent vertices
+                - Label the edge, mark the vertex as visited (if not yet visited); enqueue
+                - If visited, check if edge has been labeled, if not label the edge as a cross edge
         
         A BFS will give us the shortest path in terms of number of edges. But it has to be from the starting
         point to a final point cant be two points in between. In addition, the discovery edges that are made by
@@ -395,6 +645,11 @@ class Graph():
 
         Remember, graph traversals can have any order we want. It all depends on the
         starting point. 
+        INPUT:
+            v: Vertex we start from
+            visited: Visited flag of every vertex id
+            labels: Labels of the edges we have seen
+
         Runtime - O(n + m) - This runtime is a little tricky to derive but I will try my best.
         Since we have to enqueue every single vertex onto the queue at least once, we get O(n). However,
         since we also have to visit every single adjacent vertex to a given vertex, which is equal to
@@ -404,56 +659,54 @@ class Graph():
         '''
 
         queue = Queue.Queue()
-        v.setVisited(True)
+        visited[self.index[v]] = True
         queue.enque(v)
-        print(v)
         while not queue.isEmpty():
             vert = queue.deque()
-            for adjvert in self.adjacentVertices(vert):
-                edge = self.areAdjacent(adjvert, vert)
-                if not adjvert.getVisited():
-                    print(adjvert)
-                    adjvert.setVisited(True)
-                    edge.visited = True
-                    edge.discovery = True
+            for edge, adjvert in self.incidentPairs(vert):
+                position = self.index[adjvert]
+                if not visited[position]:
+                    visited[position] = True
+                    labels[edge] = True
                     queue.enque(adjvert)
-                elif not edge.visited:
-                    self.cycles = True
-                    edge.visited = True
-                    edge.discovery = False
+                elif edge not in labels:
+                    labels[edge] = False
     
     def dfs(self):
         '''
         A depth first search works very similarly to a DFS in a 
-        binary tree. We want to visit as deep into the graph as possible. In order 
-        to properly do the traversal, we must first set all of the vertices as not visited 
-        and label all of the edges as not visited as well. Once we do that 
+        binary tree. We want to visit as deep into the graph as possible. Just like
+        the BFS, we keep the visited flags and edge labels for this call only. Once we do that 
         we simply do a DFS on every single node in our vertex list given that we have 
         not yet visited the vertex.
+        OUTPUT:
+            Dictionary mapping every edge to True if it is a discovery edge and
+            False if it is a back edge
         '''
 
-        self.initialize()
-        for v in self.vertices.keys():
-            if not v.getVisited():
-                self.connectedComponents += 1
-                self.__dfs(v)
+        visited = bytearray(len(self.vertexList))
+        labels = {}
+        for v in self.vertexList:
+            if not visited[self.index[v]]:
+                self.__dfs(v, visited, labels)
+        return labels
     
-    def __dfs(self,v):
+    def __dfs(self, v, visited, labels):
         '''
-        Once we initialize everything (set everything to unexplored), we need a stack
-        to help us visit the locations we need. The algorithm looks like this
+        We need a stack to help us visit the locations we need. The algorithm looks like this
         1. push the first vertex
-        2. Report on it
-        3. While !stack.isempty():
+        2. While !stack.isempty():
             1. pop
-            2. Report
-            3. Loop through the adjacent vertices
-                - Update the edges, mark the vertex as visited (if not yet visited); push
-                - If visited, check if edge has been visited, if not mark the edge as a back edge
-                    which means we have a cycle
+            2. Loop through the adjacent vertices
+                - Label the edge, mark the vertex as visited (if not yet visited); push
+                - If visited, check if edge has been labeled, if not label the edge as a back edge
 
         Remember, graph traversals can have any order we want. It all depends on the
         starting point. In addition, a traversal will automatically create a minimum spanning tree.
+        INPUT:
+            v: Vertex we start from
+            visited: Visited flag of every vertex id
+            labels: Labels of the edges we have seen
 
         Runtime - O(n + m) - This runtime is a little tricky to derive but I will try my best.
         Since we have to push every single vertex onto the queue at least once, we get O(n). However,
@@ -463,25 +716,233 @@ class Graph():
         we have to visit every single node and edge in this version of a breadth first search (traversal).
         '''
 
-        v.setVisited(True)
+        visited[self.index[v]] = True
         stack = Stack.Stack()
         stack.push(v)
-        print(v)
         while not stack.isEmpty():
             vert = stack.pop()
-            for adjvert in self.adjacentVertices(vert):
-                e = self.areAdjacent(vert, adjvert)
-                if not adjvert.getVisited():
-                    print(adjvert)
-                    adjvert.setVisited(True)
-                    e.visited = True
-                    e.discovery = True
+            for e, adjvert in self.incidentPairs(vert):
+                position = self.index[adjvert]
+                if not visited[position]:
+                    visited[position] = True
+                    labels[e] = True
                     stack.push(adjvert)
-                elif not e.visited:
-                    self.cycles = True
-                    e.visited = True
-                    e.discovery = False
-    
+                elif e not in labels:
+                    labels[e] = False
+
+    def bfsLevels(self, source, alpha = 14, beta = 24):
+        '''
+        Breadth first search for large graphs. __bfs takes one vertex at a time off a
+        linked list queue, which is fine for small graphs but far too slow for
+        reachability on millions of edges. Here we freeze our graph and expand a whole
+        level at a time with NumPy, switching between top down and bottom up steps
+        depending on the size of the frontier (see CSRGraph.bfsLevels).
+        INPUT:
+            source: Starting vertex
+            alpha: Top down to bottom up threshold
+            beta: Bottom up to top down threshold
+        OUTPUT:
+            (distance, parent) arrays indexed by vertex id (see self.index). Unreachable
+            vertices have distance -1, and parent is -1 for source and unreachable vertices.
+        Runtime - O(n + mlg(m)) including the freeze
+        '''
+
+        return self.freeze().bfsLevels(source, alpha, beta)
+
+    def iter_bfs(self, source, maxDepth = None, details = False):
+        '''
+        A silent, lazy version of the breadth first search. Instead of printing
+        every vertex and labeling the vertices and edges of the graph, this
+        generator yields the vertices as it dequeues them and keeps track of what
+        it has visited in its own set. Because it is a generator, the caller can stop
+        the traversal at any time (break out of the loop) and nothing past that
+        point is ever explored. With maxDepth we never expand vertices that are
+        maxDepth edges away from the source, so only the first maxDepth levels are touched.
+        INPUT:
+            source: Vertex we start from
+            maxDepth: Maximum number of edges between the source and a reported
+                vertex (None means no limit)
+            details: If True yield (vertex, depth, parent) tuples instead of vertices
+        OUTPUT:
+            Vertices (or tuples) in breadth first order
+
+        Runtime - O(n + m) for the whole component, less if we stop early.
+        '''
+
+        visited = {source}
+        queue = Queue.Queue()
+        queue.enque((source, 0, None))
+        while not queue.isEmpty():
+            vert, depth, parent = queue.deque()
+            yield (vert, depth, parent) if details else vert
+            if maxDepth is not None and depth >= maxDepth:
+                continue
+            for __, adjvert in self.incidentPairs(vert):
+                if adjvert not in visited:
+                    visited.add(adjvert)
+                    queue.enque((adjvert, depth + 1, vert))
+
+    def iter_dfs(self, source, maxDepth = None, details = False):
+        '''
+        A silent, lazy version of the depth first search. A vertex is reported when
+        it is popped off the stack, and a vertex that was pushed more than once is
+        only reported the first time. The depth of a vertex is its depth in the
+        depth first search tree. See iter_bfs for the meaning of the parameters.
+        INPUT:
+            source: Vertex we start from
+            maxDepth: Maximum depth of a reported vertex (None means no limit)
+            details: If True yield (vertex, depth, parent) tuples instead of vertices
+        OUTPUT:
+            Vertices (or tuples) in depth first order
+
+        Runtime - O(n + m) for the whole component, less if we stop early.
+        '''
+
+        visited = set()
+        stack = Stack.Stack()
+        stack.push((source, 0, None))
+        while not stack.isEmpty():
+            vert, depth, parent = stack.pop()
+            if vert in visited:
+                continue
+            visited.add(vert)
+            yield (vert, depth, parent) if details else vert
+            if maxDepth is not None and depth >= maxDepth:
+                continue
+            for __, adjvert in self.incidentPairs(vert):
+                if adjvert not in visited:
+                    stack.push((adjvert, depth + 1, vert))
+
+    def topologicalSort(self):
+        '''
+        A topological sort orders the vertices of a directed acyclic graph so that every
+        edge goes from an earlier vertex to a later one (think of a list of tasks where
+        some tasks depend on others). We use Kahn's algorithm, which does not use
+        recursion so it works on graphs of any size:
+        1. Count the edges entering every vertex
+        2. Enqueue every vertex with no entering edges
+        3. While !q.isempty():
+            1. Dequeue and report
+            2. Remove the edges leaving the vertex by lowering the count of
+                their destinations. Enqueue every destination whose count hits 0.
+        If some vertices are never reported, they are all waiting on each other, which
+        means the graph has a cycle.
+        INPUT:
+            none
+        OUTPUT:
+            List of vertices in topological order. Raises ValueError if the graph
+            is undirected or has a cycle.
+
+        Runtime - O(n + m) - Every vertex is enqueued once and every edge is removed once.
+        '''
+
+        if not self.directed:
+            raise ValueError('topological sort needs a directed graph')
+        order = self.__kahn()
+        if len(order) < len(self.vertexList):
+            raise ValueError('graph contains a cycle')
+        return order
+
+    def __kahn(self):
+        '''
+        Kahn's algorithm. Returns the vertices it could order, which is every
+        vertex exactly when the graph has no cycles.
+        '''
+
+        remaining = [len(self.inEdges[v]) for v in self.vertexList]
+        queue = Queue.Queue()
+        for position, count in enumerate(remaining):
+            if count == 0:
+                queue.enque(self.vertexList[position])
+        order = []
+        while not queue.isEmpty():
+            vert = queue.deque()
+            order.append(vert)
+            for __, adjvert in self.incidentPairs(vert):
+                position = self.index[adjvert]
+                remaining[position] -= 1
+                if remaining[position] == 0:
+                    queue.enque(adjvert)
+        return order
+
+    def __hasDirectedCycle(self):
+        '''
+        True if our directed graph has a cycle.
+        '''
+
+        return len(self.__kahn()) < len(self.vertexList)
+
+    def stronglyConnectedComponents(self):
+        '''
+        Two vertices are strongly connected if we can go from each one to the other.
+        This splits the vertices into strongly connected components. We use Tarjan's
+        algorithm, which is a DFS where every vertex gets a discovery number and a low
+        link, the smallest discovery number it can reach through its DFS subtree plus
+        one more edge back into a vertex still on the component stack. When a vertex
+        is done and its low link equals its own number, it is the root of a component
+        and everything above it on the component stack belongs to that component.
+        The usual version is recursive which overflows the stack on big graphs, so we
+        keep our own stack of (vertex id, walk over the edges leaving it) entries and
+        resume the walk of the top entry whenever we come back to it.
+        In an undirected graph this returns the connected components.
+        INPUT:
+            none
+        OUTPUT:
+            List of components, each a list of vertices. Components come out in reverse
+            topological order of the condensed graph.
+
+        Runtime - O(n + m) - Every vertex is pushed and popped once and every edge is
+        looked at once.
+        '''
+
+        n = len(self.vertexList)
+        discovery = [-1] * n
+        low = [0] * n
+        onStack = bytearray(n)
+        component = Stack.Stack()
+        components = []
+        counter = 0
+        for root in range(n):
+            if discovery[root] != -1:
+                continue
+            discovery[root] = low[root] = counter
+            counter += 1
+            component.push(root)
+            onStack[root] = True
+            work = Stack.Stack()
+            work.push((root, self.incidentPairs(self.vertexList[root])))
+            while not work.isEmpty():
+                position, pairs = work.peek()
+                advanced = False
+                for __, adjvert in pairs:
+                    following = self.index[adjvert]
+                    if discovery[following] == -1:
+                        discovery[following] = low[following] = counter
+                        counter += 1
+                        component.push(following)
+                        onStack[following] = True
+                        work.push((following, self.incidentPairs(adjvert)))
+                        advanced = True
+                        break
+                    elif onStack[following]:
+                        low[position] = min(low[position], discovery[following])
+                if advanced:
+                    continue
+                work.pop()
+                if not work.isEmpty():
+                    parent = work.peek()[0]
+                    low[parent] = min(low[parent], low[position])
+                if low[position] == discovery[position]:
+                    members = []
+                    while True:
+                        member = component.pop()
+                        onStack[member] = False
+                        members.append(self.vertexList[member])
+                        if member == position:
+                            break
+                    components.append(members)
+        return components
+
     def mstKruskal(self):
         '''
         Before we talk about the algorithm, lets touch base on what a MST exactly is once again. A
@@ -490,7 +951,10 @@ class Graph():
         total weight. In order to build a MST using Kruskal's algorithm, we first put each vertex in 
         a seperate set in a disjoint set. The purpose we do this is to check whether two vertices have
         the same representative element. If they do, that means they are part of some minimum spanning 
-        tree for that labeled set. Next, we place all of the edges in a heap and build a minheap based
+        tree for that labeled set. The disjoint set keeps a hash table from each vertex to its position,
+        so finding the set of a vertex does not require scanning the array. If the graph is not
+        connected we run out of edges first and end up with a minimum spanning forest.
+        Next, we place all of the edges in a heap and build a minheap based
         on the edge weights. This will allow for us to properly remove each edge and to have the
         edges in correct order in linear time (build heap runs in O(n) time). Finally, we create a new
         graph which will be the minimum spanning tree.
@@ -508,24 +972,17 @@ class Graph():
         graph.
         '''
 
+        if self.directed:
+            raise ValueError('minimum spanning trees are only defined for undirected graphs')
         minimumSpanningTree = Graph()
-        forest = disjointset.DisjointSet(self.vertices.keys())
+        forest = disjointset.DisjointSet(self.vertexList)
         edgeWeights = heap.Heap() # priority queue for our impl. of sorting edges.
         edgeWeights.buildHeap(self.edges.toList())
 
-        while len(minimumSpanningTree.edges) < (len(self.vertices.keys()) - 1):
+        while len(minimumSpanningTree.edges) < (len(self.vertexList) - 1) and not edgeWeights.isEmpty():
             edge = edgeWeights.remove()
-            index1 = index2 = 0
-            # Room for optimization
-
-            for index, value in enumerate(forest.array):
-                if value.data == edge.origin:
-                    index1 = index
-                elif value.data == edge.destination:
-                    index2 = index
-
-            if forest.find(index1) != forest.find(index2):
-                forest.union(index1, index2)
+            if forest.findItem(edge.origin) != forest.findItem(edge.destination):
+                forest.unionItems(edge.origin, edge.destination)
                 if not edge.origin in minimumSpanningTree.vertices.keys():
                     minimumSpanningTree.__createdVertexInsertion(edge.origin)
                 if not edge.destination in minimumSpanningTree.vertices.keys():
@@ -535,13 +992,51 @@ class Graph():
 
         return minimumSpanningTree
 
+    def mstBoruvka(self, workers = 1):
+        '''
+        Borůvka's algorithm. Instead of looking at the edges one at a time like Kruskal's, or
+        growing one tree like Prim's, every round each connected component of the tree so far
+        picks the cheapest edge leaving it, all of those edges are added, and the components
+        they connect are merged. The number of components at least halves
+        every round, so there are at most lg(n) rounds. Finding the cheapest edges is one
+        vectorized NumPy pass over arrays of our edges, which can also be split over worker
+        processes (see boruvka.py). Ties are broken by the position of the edge, so when
+        several minimum spanning trees exist we return one of them.
+        INPUT:
+            workers: Number of worker processes (None uses every core)
+        OUTPUT:
+            Minimum spanning forest as a new graph (just like mstKruskal)
+
+        Runtime - O(mlg(n) + nlg^2(n)) - lg(n) rounds that each look at every edge (see boruvka.py)
+        '''
+
+        if self.directed:
+            raise ValueError('minimum spanning trees are only defined for undirected graphs')
+        edges = self.edges.toList()
+        index = self.index
+        origins = [index[e.origin] for e in edges]
+        destinations = [index[e.destination] for e in edges]
+        weights = [e.weight for e in edges]
+        chosen = boruvka.minimumSpanningForest(len(self.vertexList), origins, destinations, weights, workers)
+
+        minimumSpanningTree = Graph()
+        for position in sorted(chosen.tolist()):
+            edge = edges[position]
+            if not edge.origin in minimumSpanningTree.vertices:
+                minimumSpanningTree.__createdVertexInsertion(edge.origin)
+            if not edge.destination in minimumSpanningTree.vertices:
+                minimumSpanningTree.__createdVertexInsertion(edge.destination)
+            minimumSpanningTree.insertEdge(edge.origin, edge.destination, edge.key, edge.weight)
+        return minimumSpanningTree
+
     def mstPrim(self, v):
         '''
         Before we talk about the algorithm, lets touch base on what a MST exactly is once again. A
         minimum spanning tree (MST) is a graph that is minimally connected. This means that we 
         have created a path between any two nodes in our graph, have no cycles, and have a minimum
         total weight. In order to build a MST using Prim's algorithm, we first give each vertex a weight
-        and a predecessor. Once we do this, we set the predecessor and weight in each vertex to be
+        and a predecessor. These live in lists indexed by the vertex ids that belong to this call.
+        Once we do this, we set the predecessor and weight of each vertex to be
         none and +inf respectively. In Prim's algorithm, we need to have a starting vertex. We set the
         weight of the starting vertex to 0. We then build a minheap to hold all of our vertices. We
         also create a new graph object that will end up being our MST. Finally, here we start our 
@@ -561,7 +1056,9 @@ class Graph():
         the minheap which takes O(lg(n)) time since we might have to heapify down.
         So that small portion gives us a runtime of nlg(n). The other portion inside
         of the for loop runs in time proportional to mlg(n) since we visit m edges, and 
-        building the heap again takes lg(n) time. Once we add these up, we get a total
+        decreasing the key of a vertex in the indexed heap takes lg(n) time (see
+        Heaps/indexedheap.py, rebuilding the whole heap after every update would cost
+        O(n)). Once we add these up, we get a total
         runtime of O(mlg(n) + nlg(n)). Other implementations will get you better runtimes depending on
         what you want from the graph and the type of graph you are expecting. Using a adjacency list and
         minheap, we get this runtime. Using a adjacency matrix and a heap we also get the same runtime.
@@ -570,28 +1067,32 @@ class Graph():
         this would reduce total runtime to O(nlg(n) + m).
         '''
 
-        for v in self.vertices.keys():
-            v.predecessor = None
-            v.weight = math.inf
+        if self.directed:
+            raise ValueError('minimum spanning trees are only defined for undirected graphs')
+        weight = [math.inf] * len(self.vertexList)
+        predecessor = [None] * len(self.vertexList) # edge connecting each vertex to the tree
+        weight[self.index[v]] = 0
 
-        v.weight = 0
-        priorityQueue = heap.Heap()
-        priorityQueue.buildHeap(self.vertices.keys())
+        priorityQueue = indexedheap.IndexedHeap()
+        priorityQueue.insert(v, 0)
+        for vert in self.vertexList:
+            if vert is not v:
+                priorityQueue.insert(vert, math.inf)
         minimumSpanningTree = Graph()
 
-        for __ in range(len(self.vertices)):
-            e = priorityQueue.remove()
-            minimumSpanningTree.__createdVertexInsertion(e)
-            if e.predecessor:
-                key = self.areAdjacent(e, e.predecessor).key
-                minimumSpanningTree.insertEdge(e, e.predecessor, key, e.weight)
-            for neighbor in self.adjacentVertices(e):
-                if not neighbor in minimumSpanningTree.vertices.keys():
-                    weight = self.areAdjacent(neighbor, e).weight
-                    if weight < neighbor.weight:
-                        neighbor.weight = weight
-                        neighbor.predecessor = e
-                        priorityQueue.buildHeap()
+        while not priorityQueue.isEmpty():
+            vert, __ = priorityQueue.pop_min()
+            minimumSpanningTree.__createdVertexInsertion(vert)
+            e = predecessor[self.index[vert]]
+            if e is not None:
+                minimumSpanningTree.insertEdge(e.origin, e.destination, e.key, e.weight)
+            for e, neighbor in self.incidentPairs(vert):
+                if priorityQueue.contains(neighbor):
+                    position = self.index[neighbor]
+                    if e.weight < weight[position]:
+                        weight[position] = e.weight
+                        predecessor[position] = e
+                        priorityQueue.decrease_key(neighbor, e.weight)
         return minimumSpanningTree
     
     def dijkstra(self, start):
@@ -603,12 +1104,15 @@ class Graph():
         referencing the smallest total edge weight path. Dijkstra's algorithm only changes one thing
         from Prim's algorithm: instead of updating the weight to be edge weight, we total up 
         the total distance or edge weight we have seen so far and add it to the vertex's weight. 
-        Dijkstra's algorithm is very useful because it handles both directed and undirected graphs. In
+        Dijkstra's algorithm is very useful because it handles both directed and undirected graphs (in
+        a directed graph we only follow the edges leaving each vertex). In
         addition, Dijkstra's algorithm accounts will make the correct call when deciding between
         many small weighted edges and one large weighted edge. One downside of Dijkstra's algorithm
-        is that it cannot handle neight weight cycles. Finally, if we are trying to find the path
+        is that it cannot handle negative edge weights (use bellmanFord for a single source, or
+        johnson and floydWarshall for every pair of vertices). Finally, if we are trying to find the path
         from start to finish, we start with the destination node and work backwards using each 
-        node's predecessor.
+        node's predecessor. The distances and predecessors live in lists indexed by the vertex
+        ids that belong to this call (see distances), so the vertices themselves are never modified.
 
         INPUT:
             start: Starting node we are finding
@@ -621,7 +1125,9 @@ class Graph():
         the minheap which takes O(lg(n)) time since we might have to heapify down.
         So that small portion gives us a runtime of nlg(n). The other portion inside
         of the for loop runs in time proportional to mlg(n) since we visit m edges, and 
-        building the heap again takes lg(n) time. Once we add these up, we get a total
+        decreasing the key of a vertex in the indexed heap takes lg(n) time (see
+        Heaps/indexedheap.py, rebuilding the whole heap after every update would cost
+        O(n)). Once we add these up, we get a total
         runtime of O(mlg(n) + nlg(n)). Other implementations will get you better runtimes depending on
         what you want from the graph and the type of graph you are expecting. Using a adjacency list and
         minheap, we get this runtime. Using a adjacency matrix and a heap we also get the same runtime.
@@ -630,46 +1136,548 @@ class Graph():
         this would reduce total runtime to O(nlg(n) + m).
         '''
 
-        for v in self.vertices.keys():
-            v.weight = math.inf
-            v.predecessor = None
-        v.weight = 0
-        priorityQueue = heap.Heap() # heap to store our vertices
-        priorityQueue.buildHeap(self.vertices.keys())
-        sssp = Graph() # Single source shortest path (Dijkstras)
-        for __ in range(len(self.vertices.keys())):
-            vert = priorityQueue.remove()
+        __, predecessor, predecessorEdge = self.__shortestPathTree(start)
+        sssp = Graph(self.directed) # Single source shortest path (Dijkstras)
+        for vert in self.vertexList:
             sssp.__createdVertexInsertion(vert)
-            if vert.predecessor:
-                e = self.areAdjacent(vert.predecessor, vert)
-                key = e.key
-                weight = e.weight
-                sssp.insertEdge(vert.predecessor, vert, key, weight)
-            # Can add additional code to account for directed graphs.
-            for adjvert in self.adjacentVertices(vert):
-                if adjvert not in sssp.vertices.keys():
-                    existing_weight = self.areAdjacent(adjvert, vert).weight + vert.weight
-                    if existing_weight < adjvert.weight:
-                        adjvert.weight = existing_weight
-                        adjvert.predecessor = vert
-                        priorityQueue.buildHeap()
+        for position, e in enumerate(predecessorEdge):
+            if e is not None:
+                sssp.insertEdge(predecessor[position], self.vertexList[position], e.key, e.weight)
         return sssp
 
-    def floydWarshall(self):
+    def distances(self, start):
+        '''
+        Runs Dijkstra's algorithm from start and returns the distances and predecessors
+        instead of building a shortest path tree graph. Both lists are indexed by vertex
+        id (see self.index).
+        INPUT:
+            start: Starting vertex
+        OUTPUT:
+            (distance, predecessor) lists. Unreachable vertices have distance inf, and
+            the start and unreachable vertices have predecessor None.
+
+        Runtime - O(n + mlg(n))
+        '''
+
+        distance, predecessor, __ = self.__shortestPathTree(start)
+        return distance, predecessor
+
+    def dynamicShortestPaths(self, source):
+        '''
+        Shortest path tree from source that stays correct while edge weights change (see
+        dynamicpaths.py). Instead of running Dijkstra's algorithm again after every change,
+        a batch of weight updates only recomputes the vertices whose distance changes.
+        For example:
+            tree = g.dynamicShortestPaths(s)
+            tree.updateWeights([(g.areAdjacent(u, v), 12), (g.areAdjacent(v, w), 3)])
+            tree.distanceTo(w), tree.pathTo(w)
+        Weight changes have to go through the returned object. Build a new one after
+        inserting or removing vertices or edges.
+        INPUT:
+            source: Source vertex
+        OUTPUT:
+            DynamicShortestPaths
+        Runtime - O(n + mlg(n)) to build, proportional to the changed part of the tree
+        for every batch
+        '''
+
+        return DynamicShortestPaths(self, source)
+
+    def multi_source_dijkstra(self, sources, workers = None):
+        '''
+        Runs Dijkstra's algorithm from every vertex in sources in parallel over a pool
+        of worker processes. Our linked lists and vertex objects are expensive to send
+        to another process, so we first freeze the graph into flat CSR arrays
+        (see freeze) and send those to every worker once.
+        INPUT:
+            sources: Iterable of starting vertices
+            workers: Number of worker processes (None uses every core, 1 runs
+                everything in this process)
+        OUTPUT:
+            Generator of (source, distance) tuples as soon as each run finishes. The
+            distances are arrays indexed by vertex id (see self.index).
+
+        Runtime - O(s(n + m)lg(n) / workers) for s sources
+        '''
+
+        return self.freeze().multi_source_dijkstra(sources, workers)
+
+    def __shortestPathTree(self, start):
+        '''
+        The actual Dijkstra's algorithm. Every piece of state is local to this call. A
+        vertex is only inserted into the indexed heap once we discover it, so vertices
+        that cannot be reached from start never enter the heap.
+        INPUT:
+            start: Starting vertex
+        OUTPUT:
+            (distance, predecessor, predecessor edge) lists indexed by vertex id
+        '''
+
+        n = len(self.vertexList)
+        distance = [math.inf] * n
+        predecessor = [None] * n
+        predecessorEdge = [None] * n
+        settled = bytearray(n)
+        distance[self.index[start]] = 0
+        priorityQueue = indexedheap.IndexedHeap() # heap to store our vertices
+        priorityQueue.insert(start, 0)
+        while not priorityQueue.isEmpty():
+            vert, weight = priorityQueue.pop_min()
+            settled[self.index[vert]] = True
+            for e, adjvert in self.incidentPairs(vert):
+                position = self.index[adjvert]
+                if settled[position]:
+                    continue
+                existing_weight = weight + e.weight
+                if existing_weight < distance[position]:
+                    distance[position] = existing_weight
+                    predecessor[position] = vert
+                    predecessorEdge[position] = e
+                    if priorityQueue.contains(adjvert):
+                        priorityQueue.decrease_key(adjvert, existing_weight)
+                    else:
+                        priorityQueue.insert(adjvert, existing_weight)
+        return distance, predecessor, predecessorEdge
+
+    def shortest_path(self, source, target, heuristic = None):
+        '''
+        Point to point shortest path. Dijkstra's algorithm settles the whole graph even
+        when we only care about one destination. Here we stop as soon as we know the
+        answer and we only return the path, not a shortest path tree.
+        Without a heuristic we run a bidirectional Dijkstra: one search grows from the
+        source and one from the target, and we always expand the side whose closest
+        unsettled vertex is closer. Every time an edge connects the two searches we get a
+        candidate path (in a directed graph the search from the target walks the edges
+        backwards). Once the two closest unsettled vertices are together at least as
+        far as the best candidate, no better path can exist and we stop. Each search only
+        has to cover about half of the distance, which is a much smaller ball of vertices.
+        With a heuristic we run A* instead (see __astar).
+        All of the state lives in hash tables that only hold the vertices we touched,
+        so the cost of a query does not depend on the size of the graph.
+        INPUT:
+            source: Starting vertex
+            target: Destination vertex
+            heuristic: Function heuristic(vertex, target) returning a lower bound on the
+                distance between the two vertices (optional)
+        OUTPUT:
+            (path, cost) where path is the list of vertices from source to target.
+            If there is no path we return ([], inf).
+
+        Runtime - O((n + m)lg(n)) in the worst case, but only the vertices closer than
+        the answer are ever touched.
+        '''
+
+        if heuristic is not None:
+            return self.__astar(source, target, heuristic)
+        if source is target:
+            return [source], 0
+
+        distance = ({source: 0}, {target: 0})
+        predecessor = ({source: None}, {target: None})
+        settled = (set(), set())
+        queues = (indexedheap.IndexedHeap(), indexedheap.IndexedHeap())
+        queues[0].insert(source, 0)
+        queues[1].insert(target, 0)
+        best = math.inf
+        meeting = None
+
+        while not queues[0].isEmpty() and not queues[1].isEmpty():
+            forwardTop = queues[0].peek()[1]
+            backwardTop = queues[1].peek()[1]
+            if forwardTop + backwardTop >= best:
+                break
+            side = 0 if forwardTop <= backwardTop else 1
+            vert, weight = queues[side].pop_min()
+            settled[side].add(vert)
+            other = 1 - side
+            pairs = self.incidentPairs(vert) if side == 0 else self.inPairs(vert)
+            for e, adjvert in pairs:
+                if adjvert in settled[side]:
+                    continue
+                existing_weight = weight + e.weight
+                if existing_weight < distance[side].get(adjvert, math.inf):
+                    distance[side][adjvert] = existing_weight
+                    predecessor[side][adjvert] = vert
+                    if queues[side].contains(adjvert):
+                        queues[side].decrease_key(adjvert, existing_weight)
+                    else:
+                        queues[side].insert(adjvert, existing_weight)
+                if adjvert in distance[other]:
+                    candidate = existing_weight + distance[other][adjvert]
+                    if candidate < best:
+                        best = candidate
+                        meeting = (vert, adjvert) if side == 0 else (adjvert, vert)
+
+        if meeting is None:
+            return [], math.inf
+        path = self.__walkPredecessors(predecessor[0], meeting[0])
+        path.reverse()
+        path.extend(self.__walkPredecessors(predecessor[1], meeting[1]))
+        return path, best
+
+    def k_shortest_paths(self, source, target, k):
+        '''
+        Yen's algorithm for the k shortest loopless paths from source to target. The
+        first path is a plain shortest path. Every next path has to leave one of the
+        paths we already found at some vertex (the spur vertex) and it follows that path
+        exactly up to there (the root path). So for every vertex of the last path found
+        we search for the shortest spur path from the spur vertex to the target that
+            1. does not go through a vertex of the root path (so the path stays loopless)
+            2. does not take the next edge of any path found so far that shares the same
+                root path (so we get a new path)
+        and put root path + spur path in a min heap of candidates. The next path is the
+        cheapest candidate. Instead of copying the graph and deleting those vertices and
+        edges, every spur search is a point to point Dijkstra that skips the masked
+        vertices and edges (see __maskedDijkstra).
+        INPUT:
+            source: Starting vertex
+            target: Destination vertex
+            k: Most paths we return
+        OUTPUT:
+            List of up to k (path, cost) tuples sorted by cost, where path is the list of
+            vertices from source to target. Fewer than k if there are not that many paths,
+            and an empty list if k is not positive.
+
+        Runtime - O(kn(n + m)lg(n)) - up to n spur searches for each of the k paths
+        '''
+
+        if k <= 0:
+            return []
+        first = self.__maskedDijkstra(source, target, set(), set())
+        if first is None:
+            return []
+        found = [first]
+        candidates = heap.Heap() # (cost, counter, vertices, edges), the counter breaks ties
+        seen = {tuple(id(e) for e in first[2])}
+        counter = 0
+        while len(found) < k:
+            cost, vertices, edges = found[-1]
+            rootCost = 0
+            for i in range(len(edges)):
+                spur = vertices[i]
+                blockedEdges = set()
+                for __, __, otherEdges in found:
+                    # Compare edges, not vertices, parallel edges make different root paths
+                    if len(otherEdges) > i and all(a is b for a, b in zip(otherEdges[:i], edges[:i])):
+                        blockedEdges.add(otherEdges[i])
+                spurPath = self.__maskedDijkstra(spur, target, set(vertices[:i]), blockedEdges)
+                if spurPath is not None:
+                    totalEdges = edges[:i] + spurPath[2]
+                    signature = tuple(id(e) for e in totalEdges)
+                    if signature not in seen:
+                        seen.add(signature)
+                        counter += 1
+                        candidates.insert((rootCost + spurPath[0], counter,
+                                           vertices[:i] + spurPath[1], totalEdges))
+                rootCost += edges[i].weight
+            if candidates.isEmpty():
+                break
+            cost, __, vertices, edges = candidates.remove()
+            found.append((cost, vertices, edges))
+        return [(vertices, cost) for cost, vertices, __ in found]
+
+    def __maskedDijkstra(self, source, target, blockedVertices, blockedEdges):
+        '''
+        Point to point Dijkstra that acts as if the vertices in blockedVertices and the
+        edges in blockedEdges were not in the graph. It stops as soon as the target is
+        settled and only keeps state for the vertices it touched.
+        INPUT:
+            source: Starting vertex
+            target: Destination vertex
+            blockedVertices: Set of vertices we may not visit
+            blockedEdges: Set of edges we may not use
+        OUTPUT:
+            (cost, vertices, edges) of the path, None if there is no path
+        '''
+
+        distance = {source: 0}
+        predecessor = {source: None}
+        predecessorEdge = {source: None}
+        settled = set()
+        priorityQueue = indexedheap.IndexedHeap()
+        priorityQueue.insert(source, 0)
+        while not priorityQueue.isEmpty():
+            vert, weight = priorityQueue.pop_min()
+            if vert is target:
+                vertices = self.__walkPredecessors(predecessor, target)
+                vertices.reverse()
+                edges = [predecessorEdge[v] for v in vertices[1:]]
+                return weight, vertices, edges
+            settled.add(vert)
+            for e, adjvert in self.incidentPairs(vert):
+                if adjvert in settled or adjvert in blockedVertices or e in blockedEdges:
+                    continue
+                existing_weight = weight + e.weight
+                if existing_weight < distance.get(adjvert, math.inf):
+                    distance[adjvert] = existing_weight
+                    predecessor[adjvert] = vert
+                    predecessorEdge[adjvert] = e
+                    if priorityQueue.contains(adjvert):
+                        priorityQueue.decrease_key(adjvert, existing_weight)
+                    else:
+                        priorityQueue.insert(adjvert, existing_weight)
+        return None
+
+    def contractionHierarchy(self, witnessLimit = 500):
+        '''
+        Preprocesses our graph into a contraction hierarchy (see contraction.py). This
+        takes a while, but afterwards every point to point query on the hierarchy only
+        settles a few hundred vertices, no matter how large the graph is. The hierarchy
+        is a snapshot, changes made to this graph afterwards are not reflected in it.
+        INPUT:
+            witnessLimit: Most vertices a single witness search may settle
+        OUTPUT:
+            ContractionHierarchy with shortest_path, distance, save and load
+        '''
+
+        return ContractionHierarchy.fromGraph(self, witnessLimit)
+
+    def landmarkOracle(self, numLandmarks = 16, strategy = 'farthest'):
+        '''
+        Runs Dijkstra's algorithm from a few landmark vertices once and keeps the
+        distances (see landmarks.py). Afterwards the oracle bounds the distance between
+        any two vertices in O(L) time, and its lower bound is an A* heuristic for exact
+        queries:
+            oracle = g.landmarkOracle()
+            oracle.estimate(u, v)
+            g.shortest_path(u, v, heuristic=oracle.heuristic)
+            oracle.save(path) and LandmarkOracle.load(path) to skip the preprocessing
+        The oracle is a snapshot, its bounds can be wrong once edges change.
+        INPUT:
+            numLandmarks: Number of landmarks L
+            strategy: 'farthest' (spread the landmarks out) or 'degree' (highest degree)
+        OUTPUT:
+            LandmarkOracle
+        Runtime - O(L(n + m)lg(n))
+        '''
+
+        return LandmarkOracle.fromGraph(self, numLandmarks, strategy)
+
+    def __astar(self, source, target, heuristic):
+        '''
+        A* search. It works just like Dijkstra's algorithm except that the priority of
+        a vertex is its distance from the source plus the heuristic estimate of its
+        distance to the target. This pulls the search towards the target. As long as
+        the heuristic never overestimates, the first time we pop the target we have
+        the shortest path. If the heuristic is not consistent a vertex can be reached
+        again with a shorter distance after it was settled, in which case we simply
+        put it back into the heap.
+        INPUT:
+            source: Starting vertex
+            target: Destination vertex
+            heuristic: Function heuristic(vertex, target) returning a lower bound
+        OUTPUT:
+            (path, cost), ([], inf) if there is no path
+        '''
+
+        distance = {source: 0}
+        predecessor = {source: None}
+        priorityQueue = indexedheap.IndexedHeap()
+        priorityQueue.insert(source, heuristic(source, target))
+        while not priorityQueue.isEmpty():
+            vert, __ = priorityQueue.pop_min()
+            if vert is target:
+                path = self.__walkPredecessors(predecessor, target)
+                path.reverse()
+                return path, distance[target]
+            for e, adjvert in self.incidentPairs(vert):
+                existing_weight = distance[vert] + e.weight
+                if existing_weight < distance.get(adjvert, math.inf):
+                    distance[adjvert] = existing_weight
+                    predecessor[adjvert] = vert
+                    estimate = existing_weight + heuristic(adjvert, target)
+                    if priorityQueue.contains(adjvert):
+                        priorityQueue.decrease_key(adjvert, estimate)
+                    else:
+                        priorityQueue.insert(adjvert, estimate)
+        return [], math.inf
+
+    def __walkPredecessors(self, predecessor, vert):
+        '''
+        Follows a predecessor table from vert until we reach a vertex without a
+        predecessor.
+        INPUT:
+            predecessor: Hash table from vertex to its predecessor
+            vert: Vertex we start from
+        OUTPUT:
+            List of vertices starting at vert
+        '''
+
+        path = []
+        while vert is not None:
+            path.append(vert)
+            vert = predecessor[vert]
+        return path
+
+    def bellmanFord(self, start):
+        '''
+        Dijkstra's algorithm settles a vertex the first time it leaves the heap, which is
+        only correct when no edge can make a path shorter later on. With negative edge
+        weights we need Bellman Ford's algorithm instead. The classic version relaxes
+        every edge n - 1 times. We use the queue based version (SPFA): only a vertex whose
+        distance just went down can improve its neighbors, so we keep those vertices in a
+        queue and only relax their edges. On most graphs this is far less than n - 1 passes.
+
+        A shortest path never has more than n - 1 edges. We keep track of how many edges
+        the path to every vertex has, and once one of them reaches n we know the path
+        goes around a negative cycle, so the shortest distances are not defined.
+        Keep in mind that in an undirected graph a negative edge is already a negative
+        cycle (go back and forth).
+        INPUT:
+            start: Starting vertex
+        OUTPUT:
+            (distance, predecessor) lists indexed by vertex id, just like distances
+
+        Raises ValueError if a negative cycle can be reached from start (use
+        findNegativeCycle to get the cycle).
+
+        Runtime - O(nm) - in the worst case, usually much closer to O(n + m)
+        '''
+
+        distance, predecessor, cycle = self.__spfa([start])
+        if cycle:
+            raise ValueError('graph contains a negative cycle reachable from the start vertex')
+        return distance, predecessor
+
+    def findNegativeCycle(self):
+        '''
+        Looks for a negative cycle anywhere in our graph. We run Bellman Ford's algorithm
+        as if there were an extra vertex with an edge of weight 0 to every vertex, which
+        simply means every vertex starts at distance 0 in the queue.
+        OUTPUT:
+            List of vertices [v1, v2, ..., vk] where the edges v1 -> v2 -> ... -> vk -> v1
+            have a negative total weight. Empty if there is no negative cycle.
+
+        Runtime - O(nm)
+        '''
+
+        __, __, cycle = self.__spfa(self.vertexList)
+        return cycle
+
+    def __spfa(self, sources):
+        '''
+        The actual queue based Bellman Ford's algorithm. Every source starts at distance 0.
+        INPUT:
+            sources: Starting vertices
+        OUTPUT:
+            (distance, predecessor, cycle) where cycle is a list of vertices on a negative
+            cycle, empty if we did not find one
+        '''
+
+        n = len(self.vertexList)
+        index = self.index
+        distance = [math.inf] * n
+        predecessor = [None] * n
+        length = [0] * n # Number of edges on the path to every vertex
+        inQueue = bytearray(n)
+        queue = Queue.Queue()
+        for vert in sources:
+            position = index[vert]
+            distance[position] = 0
+            inQueue[position] = True
+            queue.enque(vert)
+        while not queue.isEmpty():
+            vert = queue.deque()
+            position = index[vert]
+            inQueue[position] = False
+            for e, adjvert in self.incidentPairs(vert):
+                adjposition = index[adjvert]
+                candidate = distance[position] + e.weight
+                if candidate < distance[adjposition]:
+                    distance[adjposition] = candidate
+                    predecessor[adjposition] = vert
+                    length[adjposition] = length[position] + 1
+                    if length[adjposition] >= n:
+                        cycle = self.__predecessorCycle(predecessor, adjvert)
+                        if cycle:
+                            return distance, predecessor, cycle
+                    if not inQueue[adjposition]:
+                        inQueue[adjposition] = True
+                        queue.enque(adjvert)
+        return distance, predecessor, []
+
+    def __predecessorCycle(self, predecessor, vert):
+        '''
+        Follows the predecessors from vert until a vertex repeats. Every cycle made of
+        predecessor links is a negative cycle.
+        INPUT:
+            predecessor: Predecessor list indexed by vertex id
+            vert: Vertex whose path has at least n edges
+        OUTPUT:
+            List of vertices on the cycle in the direction of the edges, empty if the
+            predecessors lead back to a source instead
+        '''
+
+        seen = set()
+        while vert is not None and vert not in seen:
+            seen.add(vert)
+            vert = predecessor[self.index[vert]]
+        if vert is None:
+            return []
+        cycle = [vert]
+        current = predecessor[self.index[vert]]
+        while current is not vert:
+            cycle.append(current)
+            current = predecessor[self.index[current]]
+        cycle.reverse()
+        return cycle
+
+    def johnson(self):
+        '''
+        Johnson's algorithm finds all of the shortest paths, just like Floyd Warshall's,
+        but runs Dijkstra's algorithm from every vertex instead. That costs O(nmlg(n))
+        instead of O(n ^ 3), which is much faster on sparse graphs. Dijkstra's algorithm
+        cannot handle negative weights, so we first reweight the edges:
+            1. Run Bellman Ford's algorithm from an extra vertex connected to every vertex
+                with an edge of weight 0. This gives every vertex a potential h(v) <= 0.
+            2. Change the weight of every edge (u, v) to w(u, v) + h(u) - h(v). Since
+                h(v) <= h(u) + w(u, v), every new weight is at least 0.
+            3. Every path from s to t changes by exactly h(s) - h(t), so shortest paths
+                stay shortest paths. Run Dijkstra's from every vertex on the new weights
+                and add h(t) - h(s) back to every distance.
+        The Dijkstra's runs happen on the frozen CSR arrays (see freeze and allpairs.py).
+        OUTPUT:
+            (distance, nextHop) NumPy matrices indexed by vertex id, exactly like
+            floydWarshall. Use floydWarshallPath to turn nextHop into a path.
+
+        Raises ValueError if the graph has a negative cycle.
+
+        Runtime - O(nm + n(n + m)lg(n))
+        '''
+
+        potential, __, cycle = self.__spfa(self.vertexList)
+        if cycle:
+            raise ValueError('graph contains a negative cycle')
+        frozen = self.freeze()
+        return allpairs.johnson(frozen.offsets, frozen.targets, frozen.weights, potential)
+
+    def floydWarshall(self, blockSize = None):
         '''
         Since Dijkstra's algorithm cannot account for negative edge weights, we need
         an alternative algorithm that will run properly if we do need negative edge weights.
         This algorithm is known as the Floyd Warshall Algorithm. The premise behind it is
         to assign each of the edges between each vertice +inf to start off. Once we find 
         a path that is shorter, we change the edge weight to the correct weight.
-        Since this algorithm does require a adjacency matrix implementation if we want to use
-        dynamic programming, we cannot implment it here. However, I will give a run through
-        of the algorithm that we would use. This algorithm will give us the shortest path
+        This algorithm needs an adjacency matrix, so we build a dense n x n distance
+        matrix (indexed by vertex id) out of our linked list of edges and run the
+        algorithm on it with NumPy (see allpairs.py). This algorithm will give us the shortest path
         between any two vertices. Unlike Dijkstra's, we will have every single shortest path.
         Floyd Warshall's algo checks whether the inclusion of certain eedges is better than the existing
-        path. It ignores adding an edge that already exists in our edge inputs. This helps us avoid 
-        cycles and self loops. After the first w for loop, we know that all paths are optimal with
-        the addition of k. Floyd Warshall's algorithm is a dynamic programming algo.
+        path. After round k, we know that all paths are optimal when they are only allowed
+        to go through the vertices 0 to k. Floyd Warshall's algorithm is a dynamic programming algo.
+        # for (k : g):
+        #   for (u : g):
+        #       for (v : g):
+        #           if d[u,v] > d[u,k] + d[k,v]:
+        #               d[u,v] = d[u,k] + d[k,v]
+        The two inner loops run as a single vectorized update per k. Keep in mind that in an
+        undirected graph a negative edge is already a negative cycle (go back and forth).
+        INPUT:
+            blockSize: Process the matrix in tiles of this size for cache efficiency
+                (None updates the whole matrix at once for every k)
+        OUTPUT:
+            (distance, nextHop) NumPy matrices indexed by vertex id (see self.index).
+            Use floydWarshallPath to turn nextHop into a path.
 
         Runtime - O(n ^ 3) - Since we do have to visit every single vertex, our runtime is O(n * n * n).
         At first glance this runtime might seem bad since we have not focused on any algorithm whose
@@ -677,16 +1685,75 @@ class Graph():
         give us the shortest path between all vertices. 
         '''
 
-        # 1. Label each self edge to be 0
-        # 2. Lavel non-existent edges to be +inf
-        # 3. Label all other edges with the corresponding edges weights
-        # Once we do that we move onto 3 nest for loops
-        # for (u : g):
-        #   for (v : g):
-        #       for (w : g):
-        #           if matrix[u,v] > d[u,w] + d[w,u]:
-        #               d[u,v] = d[u,w] + d[w,v]
-    
+        index = self.index
+        edges = ((index[e.origin], index[e.destination], e.weight) for e in self.edges.toList())
+        distance, nextHop = allpairs.buildMatrices(len(self.vertexList), edges, self.directed)
+        return allpairs.floydWarshall(distance, nextHop, blockSize)
+
+    def floydWarshallPath(self, nextHop, origin, destination):
+        '''
+        Turns the next hop matrix returned by floydWarshall into a path.
+        INPUT:
+            nextHop: Next hop matrix from floydWarshall
+            origin: First vertex
+            destination: Last vertex
+        OUTPUT:
+            List of vertices on the shortest path, empty if there is no path
+        '''
+
+        path = allpairs.reconstructPath(nextHop, self.index[origin], self.index[destination])
+        return [self.vertexList[position] for position in path]
+
+    def flowNetwork(self):
+        '''
+        Builds the residual network of our graph in flat arrays, using the weight of every
+        edge as its capacity (see maxflow.py). Build it once and call reset between
+        solves to run many max flow problems on the same graph.
+        INPUT:
+            none
+        OUTPUT:
+            (network, edges) where network is a FlowNetwork over our vertex ids and
+            edges[i] is the edge behind the arcs 2i and 2i + 1
+        Runtime - O(n + m)
+        '''
+
+        edges = self.edges.toList()
+        index = self.index
+        network = maxflow.FlowNetwork(len(self.vertexList), [index[e.origin] for e in edges],
+                                      [index[e.destination] for e in edges],
+                                      [e.weight for e in edges], self.directed)
+        return network, edges
+
+    def maxFlow(self, source, sink, algorithm = 'dinic'):
+        '''
+        Maximum flow from source to sink, where the weight of every edge is its capacity.
+        Edges of an undirected graph can carry flow in either direction.
+        INPUT:
+            source: Vertex the flow leaves from
+            sink: Vertex the flow arrives at
+            algorithm: 'dinic' (blocking flows on BFS level graphs) or 'pushrelabel'
+                (highest label push relabel with the gap heuristic)
+        OUTPUT:
+            (value, flows, cut) where flows maps every edge to the flow it carries (negative
+            when an undirected edge carries flow from its destination to its origin) and cut
+            is (sourceSide, sinkSide), two lists of vertices. The edges going from
+            sourceSide to sinkSide are a minimum cut and their capacities add up to value.
+        Runtime - O(n ^ 2 m) for Dinic's, O(n ^ 2 sqrt(m)) for push relabel
+        '''
+
+        if algorithm not in ('dinic', 'pushrelabel'):
+            raise ValueError(f'unknown max flow algorithm {algorithm}')
+        network, edges = self.flowNetwork()
+        s, t = self.index[source], self.index[sink]
+        if algorithm == 'dinic':
+            value, flows, reachable = network.dinic(s, t)
+        else:
+            value, flows, reachable = network.pushRelabel(s, t)
+        sourceSide = set(reachable)
+        cut = ([self.vertexList[u] for u in reachable],
+               [self.vertexList[u] for u in range(len(self.vertexList)) if u not in sourceSide])
+        return value, dict(zip(edges, flows)), cut
+
     def sumWeights(self):
         '''
         This is a helper function that sums the weights of all the edges in our 
@@ -706,6 +1773,184 @@ class Graph():
             minSum += minHeap.remove().weight
         return minSum
 
+    @classmethod
+    def from_edge_list(cls, source, delimiter = None, weighted = True, directed = False,
+                       binary = False, frozen = False, keyType = None):
+        '''
+        Loads a graph from an edge list (see edgelist.py). The file is parsed a chunk at
+        a time with NumPy and every vertex name is interned into a dense id, so we only
+        ever hold three flat arrays of ids and weights instead of a python object per edge.
+        The keys of the vertices are the names used in the file and the edges have no key.
+        Edges without a weight get a weight of 1.
+
+        With frozen set we skip the adjacency list completely and build a CSRGraph out of
+        the arrays in one vectorized pass. This is the fastest way to load a large graph
+        that we only want to query. Otherwise we build the adjacency list straight from
+        the arrays (see __insertEdges), which still needs a few objects per edge.
+        INPUT:
+            source: Path to a file or an iterable of lines or (origin, destination[, weight]) tuples
+            delimiter: Column separator of a text file (None splits on any whitespace)
+            weighted: The records have a third column with the weight
+            directed: Build a directed graph
+            binary: The file holds int32 origin, int32 destination[, float32 weight] records
+            frozen: Return a CSRGraph instead of a Graph
+            keyType: Function applied to every vertex name in a text file (for example int)
+        OUTPUT:
+            Graph (or CSRGraph if frozen)
+        Raises ValueError if a record has fewer columns than we need.
+
+        Runtime - O(n + mlg(m))
+        '''
+
+        keys, origins, destinations, weights = edgelist.readEdgeList(
+            source, delimiter, weighted, binary, keyType)
+        if frozen:
+            return CSRGraph.fromEdges([Vertex(key) for key in keys], origins, destinations,
+                                      weights, directed=directed)
+        graph = cls(directed)
+        verts = [graph.insertVertex(key) for key in keys]
+        graph.__insertEdges(verts, origins, destinations, weights)
+        return graph
+
+    def __insertEdges(self, verts, origins, destinations, weights):
+        '''
+        Inserts a batch of edges without keys. Two things make inserting edges one at a
+        time slow, and neither is needed for a batch:
+            1. Keeping the connected components up to date costs two finds and a union
+                per edge. We drop them instead and let __connectivity rebuild them the
+                first time someone asks.
+            2. Every edge creates a handful of objects, and python's garbage collector
+                keeps walking all of them while they pile up, which takes about as long
+                as building the graph itself. We pause it.
+        INPUT:
+            verts: List of vertices, indexed by the ids below
+            origins: NumPy array, id of the first vertex of every edge
+            destinations: NumPy array, id of the second vertex of every edge
+            weights: NumPy array, weight of every edge
+        '''
+
+        self.components = None
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            insertEdge = self.insertEdge
+            for origin, destination, weight in zip(origins.tolist(), destinations.tolist(), weights.tolist()):
+                insertEdge(verts[origin], verts[destination], None, weight)
+        finally:
+            if collecting:
+                gc.enable()
+
+    def freeze(self, keys = True):
+        '''
+        Builds a read only, array based copy of our graph using a compressed sparse
+        row layout (see csrgraph.py). The frozen graph has the same query functions
+        (degree, areAdjacent, dijkstra, mstKruskal, mstPrim, ...), with bfsOrder and
+        dfsOrder returning the visit order in place of bfs and dfs, but stores
+        every edge in a few flat arrays instead of linked list nodes and edge objects.
+        Changes made to this graph after freezing are not reflected in the copy.
+        INPUT:
+            keys: Keep the keys of the edges. Without them the copy also drops the edge
+                id of every slot, which saves 4 bytes per slot.
+        OUTPUT:
+            CSRGraph
+        Runtime - O(n + mlg(m))
+        '''
+
+        return CSRGraph.fromGraph(self, keys)
+
+    def save(self, path):
+        '''
+        Freezes our graph and writes it to a binary snapshot (see snapshot.py). The
+        snapshot holds the keys of the vertices and edges and the CSR arrays, so it
+        can be loaded back without rebuilding anything.
+        INPUT:
+            path: File we are writing
+        OUTPUT:
+            none
+        Runtime - O(n + mlg(m))
+        '''
+
+        self.freeze().save(path)
+
+    @staticmethod
+    def load(path, mmap = True):
+        '''
+        Loads a snapshot written by save. Snapshots are read only, so we get back a
+        CSRGraph instead of a Graph. With mmap the arrays are mapped straight from the
+        file, which means loading takes milliseconds no matter how many edges there are
+        and every process that loads the same file shares its memory.
+        INPUT:
+            path: Snapshot file
+            mmap: Map the arrays instead of reading them into memory
+        OUTPUT:
+            CSRGraph
+        Runtime - O(n) with mmap, O(n + m) without
+        '''
+
+        return CSRGraph.load(path, mmap)
+
+    def linkAnalysis(self):
+        '''
+        Freezes our graph and builds the sparse adjacency matrix for PageRank, HITS and
+        Katz centrality (see centrality.py). Every round of those algorithms is a couple
+        of vectorized NumPy calls over the edges instead of a python loop, so they scale
+        to graphs with millions of edges.
+        For example:
+            analysis = g.linkAnalysis()
+            ranks = analysis.pagerank()
+            ranks = analysis.pagerank(personalization={v: 1}, start=ranks)
+        The scores are indexed by vertex id (see self.index).
+        INPUT:
+            none
+        OUTPUT:
+            LinkAnalysis
+        Runtime - O(n + mlg(m))
+        '''
+
+        return self.freeze().linkAnalysis()
+
+    def triangleCounter(self):
+        '''
+        Freezes our graph and builds a degree ordered view of it with sorted neighbor
+        arrays for triangle counting and clustering coefficients (see triangles.py).
+        Building a python list of neighbors for every vertex with adjacentVertices would
+        make this far too slow on large graphs. Directions, weights, self loops and
+        parallel edges are ignored.
+        For example:
+            counter = g.triangleCounter()
+            counter.numTriangles(), counter.transitivity()
+            coefficients = counter.localClustering()
+        Per vertex results are indexed by vertex id (see self.index).
+        INPUT:
+            none
+        OUTPUT:
+            TriangleCounter
+        Runtime - O(n + mlg(m)) to build, O(m^1.5) to count
+        '''
+
+        return self.freeze().triangleCounter()
+
+    def communityDetection(self):
+        '''
+        Freezes our graph into flat edge arrays for community detection with label
+        propagation or Louvain (see communities.py). Every round is a handful of
+        vectorized NumPy calls instead of a python loop over the vertices.
+        For example:
+            labels = g.communityDetection().labelPropagation(seed=7)
+            ... a batch of insertEdge calls ...
+            labels = g.communityDetection().labelPropagation(seed=7, start=labels)
+        Passing the previous labels as start re-converges from them instead of starting
+        cold. Vertex ids do not change when we insert, so the old labels still line up
+        (removing a vertex moves the last vertex into its id, start over after that).
+        INPUT:
+            none
+        OUTPUT:
+            CommunityDetection, whose results are indexed by vertex id (see self.index)
+        Runtime - O(n + mlg(m))
+        '''
+
+        return self.freeze().communityDetection()
+
     def __str__(self):
         '''
         String representation of our Graph
@@ -0,0 +1,260 @@
+import sys
+sys.path.append('../')
+import mmap as mmapModule
+import struct
+import math
+import numpy as np
+import csrgraph # Used to run Dijkstra's from every landmark
+import snapshot # Used to encode the keys of the vertices
+from vertex import Vertex
+
+'''
+Written by David Terpay
+Landmark distance oracle (ALT: A*, landmarks and the triangle inequality). We pick a few
+vertices, the landmarks, and run Dijkstra's algorithm from each of them once, ahead of
+time. For a landmark l and any two vertices u and v the triangle inequality gives
+    d(l, v) <= d(l, u) + d(u, v)    so    d(u, v) >= d(l, v) - d(l, u)
+    d(u, l) <= d(u, v) + d(v, l)    so    d(u, v) >= d(u, l) - d(v, l)
+    d(u, v) <= d(u, l) + d(l, v)
+The largest of the lower bounds over all landmarks is a lower bound on d(u, v) and the
+smallest upper bound is the length of an actual path through a landmark. Both take O(L)
+time for L landmarks, without touching the graph.
+
+The lower bound never overestimates, so it is an admissible heuristic for A* (see
+Graph.shortest_path). It is also consistent, so A* settles every vertex once and only
+explores the vertices that look like they are on the way to the target. With landmarks
+"behind" the target (on the far side of the graph) the bounds are tight and A* usually
+settles a small fraction of what Dijkstra's would.
+
+How good the bounds are depends on where the landmarks are. We support two strategies:
+    farthest: start with the vertex of highest degree and repeatedly add the vertex
+        farthest away from every landmark picked so far (a vertex that no landmark can
+        reach counts as infinitely far, so every connected component gets one)
+    degree: the L vertices of highest degree
+For a directed graph we also need d(v, l), so we run a second Dijkstra's from every
+landmark on the reversed graph.
+
+We keep the distances in n x L NumPy matrices (one row per vertex) so that a query reads
+two contiguous rows. save writes them after a small header and the keys of the vertices
+(stored as data, see snapshot.encodeKeys), and load maps them straight back from the
+file, so a service can load the oracle at startup instead of recomputing it.
+
+Preprocessing -- O(L(n + m)lg(n))
+Query -- O(L)
+Memory -- O(nL)
+'''
+
+MAGIC = b'PDSLANDM'
+FORMAT_VERSION = 2
+_HEADER = struct.Struct('<8sIIqqq')
+_DIRECTED = 1
+
+
+class LandmarkOracle():
+    def __init__(self, vertices, landmarks, forward, backward, directed = False):
+        '''
+        Wraps already computed landmark distances. Use fromGraph or load to create one.
+        INPUT:
+            vertices: List of vertices, the position of a vertex is its id
+            landmarks: Ids of the landmarks
+            forward: n x L matrix, forward[v][i] is the distance from landmark i to v
+            backward: n x L matrix, backward[v][i] is the distance from v to landmark i
+                (the same matrix as forward in an undirected graph)
+            directed: The oracle was built from a directed graph
+        '''
+
+        self.directed = directed
+        self.vertices = vertices
+        self.index = {v: i for i, v in enumerate(vertices)}
+        self.keys = None
+        self.landmarks = landmarks
+        self.forward = forward
+        self.backward = backward
+
+    @classmethod
+    def fromGraph(cls, graph, numLandmarks = 16, strategy = 'farthest'):
+        '''
+        Picks the landmarks and computes their distances.
+        INPUT:
+            graph: Graph or CSRGraph with non negative edge weights
+            numLandmarks: Number of landmarks L (at most n)
+            strategy: 'farthest' or 'degree'
+        OUTPUT:
+            LandmarkOracle
+
+        Raises ValueError if an edge has a negative weight or the strategy is unknown.
+        '''
+
+        if strategy not in ('farthest', 'degree'):
+            raise ValueError(f'unknown landmark strategy {strategy}')
+        frozen = graph if isinstance(graph, csrgraph.CSRGraph) else graph.freeze()
+        n = len(frozen.vertices)
+        offsets = np.asarray(frozen.offsets, dtype=np.int64)
+        targets = np.asarray(frozen.targets, dtype=np.int64)
+        weights = np.asarray(frozen.weights, dtype=np.float64)
+        if (weights < 0).any():
+            raise ValueError('landmarks need non negative edge weights')
+        numLandmarks = min(numLandmarks, n)
+        forwardArrays = (offsets.tolist(), targets.tolist(), weights.tolist())
+        if frozen.directed:
+            sources = np.repeat(np.arange(n), np.diff(offsets))
+            order = np.lexsort((sources, targets))
+            reverseOffsets = np.zeros(n + 1, dtype=np.int64)
+            np.cumsum(np.bincount(targets, minlength=n), out=reverseOffsets[1:])
+            backwardArrays = (reverseOffsets.tolist(), sources[order].tolist(), weights[order].tolist())
+            degree = np.diff(offsets) + np.diff(reverseOffsets)
+        else:
+            degree = np.diff(offsets)
+
+        forward = np.empty((n, numLandmarks))
+        backward = np.empty((n, numLandmarks)) if frozen.directed else forward
+        landmarks = np.empty(numLandmarks, dtype=np.int64)
+        if strategy == 'degree':
+            landmarks[:] = np.argsort(-degree, kind='stable')[:numLandmarks]
+        closest = np.full(n, math.inf) # Distance to the closest landmark picked so far
+        for i in range(numLandmarks):
+            if strategy == 'farthest':
+                if i == 0:
+                    landmarks[i] = int(np.argmax(degree))
+                else:
+                    # Vertices no landmark reaches come first, then the farthest one
+                    candidates = closest.copy()
+                    candidates[landmarks[:i]] = -1
+                    landmarks[i] = int(np.argmax(candidates))
+            forward[:, i] = csrgraph.dijkstraArrays(*forwardArrays, int(landmarks[i]))[0]
+            if frozen.directed:
+                backward[:, i] = csrgraph.dijkstraArrays(*backwardArrays, int(landmarks[i]))[0]
+            closest = np.minimum(closest, forward[:, i])
+        return cls(list(frozen.vertices), landmarks, forward, backward, frozen.directed)
+
+    @classmethod
+    def load(cls, path, mmap = True):
+        '''
+        Loads an oracle written by save. With mmap the distance matrices stay in the file
+        and the rows are paged in as queries touch them.
+        INPUT:
+            path: File we are reading
+            mmap: Map the matrices instead of reading them into memory
+        OUTPUT:
+            LandmarkOracle whose vertices are new Vertex objects holding the saved keys.
+            Its heuristic also accepts vertices of another graph with the same keys.
+        '''
+
+        with open(path, 'rb') as oracle:
+            if mmap:
+                buffer = memoryview(mmapModule.mmap(oracle.fileno(), 0, access=mmapModule.ACCESS_READ))
+            else:
+                buffer = memoryview(oracle.read())
+        if len(buffer) < _HEADER.size:
+            raise ValueError(f'{path} is not a landmark oracle')
+        magic, version, flags, n, numLandmarks, keyTableLength = _HEADER.unpack_from(buffer)
+        if magic != MAGIC:
+            raise ValueError(f'{path} is not a landmark oracle')
+        if version != FORMAT_VERSION:
+            raise ValueError(f'{path} has oracle version {version}, expected {FORMAT_VERSION}')
+        directed = bool(flags & _DIRECTED)
+        matrices = 2 if directed else 1
+        position = _HEADER.size + keyTableLength
+        if len(buffer) != position + 8 * (numLandmarks + matrices * n * numLandmarks):
+            raise ValueError(f'{path} is truncated')
+
+        keys = snapshot.decodeKeys(buffer[_HEADER.size:position])[0]
+        landmarks = np.frombuffer(buffer, dtype='<i8', count=numLandmarks, offset=position)
+        position += 8 * numLandmarks
+        forward = np.frombuffer(buffer, dtype='<f8', count=n * numLandmarks, offset=position).reshape(n, numLandmarks)
+        position += 8 * n * numLandmarks
+        backward = forward
+        if directed:
+            backward = np.frombuffer(buffer, dtype='<f8', count=n * numLandmarks, offset=position).reshape(n, numLandmarks)
+        oracle = cls([Vertex(key) for key in keys], landmarks, forward, backward, directed)
+        oracle.keys = {key: i for i, key in enumerate(keys)}
+        return oracle
+
+    def save(self, path):
+        '''
+        Writes the oracle to a binary file: a header, the keys of the vertices,
+        the landmark ids as little endian 8 byte integers, and the distance matrices as
+        little endian doubles (backward only for a directed graph).
+        INPUT:
+            path: File we are writing
+        '''
+
+        keyTable = snapshot.encodeKeys([v.getData() for v in self.vertices])
+        with open(path, 'wb') as oracle:
+            oracle.write(_HEADER.pack(MAGIC, FORMAT_VERSION, _DIRECTED if self.directed else 0,
+                                      len(self.vertices), len(self.landmarks), len(keyTable)))
+            oracle.write(keyTable)
+            oracle.write(np.asarray(self.landmarks, dtype='<i8').tobytes())
+            oracle.write(np.ascontiguousarray(self.forward, dtype='<f8').tobytes())
+            if self.directed:
+                oracle.write(np.ascontiguousarray(self.backward, dtype='<f8').tobytes())
+
+    def bounds(self, source, target):
+        '''
+        Lower and upper bound on the distance between two vertices.
+        INPUT:
+            source: Starting vertex
+            target: Destination vertex
+        OUTPUT:
+            (lower, upper). upper is the length of a real path through a landmark (inf if
+            no landmark is on a path) and lower is 0 if the landmarks tell us nothing.
+
+        Runtime -- O(L)
+        '''
+
+        u, v = self.__position(source), self.__position(target)
+        if u == v:
+            return 0.0, 0.0
+        return self.__lowerBound(u, v), float(np.min(self.backward[u] + self.forward[v]))
+
+    def estimate(self, source, target):
+        '''
+        Approximate distance: the shortest path through a landmark. It is never shorter
+        than the real distance and exact whenever a landmark is on a shortest path.
+
+        Runtime -- O(L)
+        '''
+
+        return self.bounds(source, target)[1]
+
+    def heuristic(self, vertex, target):
+        '''
+        Admissible and consistent A* heuristic (the lower bound). Use it with
+            g.shortest_path(source, target, heuristic=oracle.heuristic)
+
+        Runtime -- O(L)
+        '''
+
+        return self.__lowerBound(self.__position(vertex), self.__position(target))
+
+    def __lowerBound(self, u, v):
+        '''
+        Largest triangle inequality lower bound on d(u, v) over every landmark. A landmark
+        that reaches neither vertex gives inf - inf, which tells us nothing, so we skip it.
+        '''
+
+        with np.errstate(invalid='ignore'):
+            first = self.forward[v] - self.forward[u]
+            second = self.backward[u] - self.backward[v]
+        bound = max(np.fmax(first, second).max(initial=0), 0.0)
+        return 0.0 if math.isnan(bound) else float(bound)
+
+    def __position(self, vertex):
+        '''
+        Id of a vertex. After load we also accept vertices of another graph with the
+        same key (for example the graph the service built or loaded on its own).
+        '''
+
+        position = self.index.get(vertex)
+        if position is None:
+            if self.keys is None:
+                self.keys = {v.getData(): i for i, v in enumerate(self.vertices)}
+            position = self.keys[vertex.getData()]
+        return position
+
+    def __len__(self):
+        '''
+        Number of landmarks.
+        '''
+
+        return len(self.landmarks)
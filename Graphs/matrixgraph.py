@@ -0,0 +1,1377 @@
+import sys
+sys.path.append('../')
+from Disjoint_Sets import disjointset # Used to track connected components
+from Queues import Queue # Used in BFS, Kahn's and Bellman Ford's algorithms
+from Stacks import Stack # Used in DFS and Tarjan's algorithm
+from Heaps import heap # Used in Yen's algorithm
+import math
+import numpy as np
+from edge import Edge
+from vertex import Vertex
+from csrgraph import CSRGraph
+import allpairs # Used in Floyd Warshall's and Johnson's algorithms
+import edgelist # Used to load graphs from edge list files
+import maxflow # Used in maximum flow and minimum cut
+from contraction import ContractionHierarchy # Used for fast point to point queries
+from landmarks import LandmarkOracle # Used for distance estimates and A* heuristics
+from dynamicpaths import DynamicShortestPaths # Used to repair shortest paths after weight changes
+
+'''
+Written by David Terpay
+Implementation 2 from graph.py: an adjacency matrix. Graph(backend='matrix') gives you
+one of these instead of an adjacency list.
+
+An adjacency list costs a few hundred bytes per edge (see csrgraph.py), which is fine
+for sparse graphs but hopeless for dense ones: a graph with 20000 vertices and 30% of
+all possible edges has 60 million edges. An adjacency matrix costs the same no matter
+how many edges there are, so once a graph is dense enough it wins on memory, and
+areAdjacent becomes a single lookup.
+
+We store two n x n matrices indexed by vertex id:
+    bits: one bit per pair of vertices telling us whether the edge exists. Every row
+        is packed into bytes (bit j of row u lives in byte j // 8, bit j % 8), so a row
+        is n / 8 bytes and the whole matrix is n ^ 2 / 8 bytes.
+    weights: a float32 weight per pair of vertices
+Row u holds the edges leaving u and column u the edges entering u. An undirected edge
+is stored in both (u, v) and (v, u), so the matrix is symmetric.
+
+Packed rows make set operations on neighborhoods very cheap. The common neighbors of u
+and v are bits[u] & bits[v], which NumPy computes 8 vertices per byte, and counting
+them is a popcount. commonNeighborCounts does this for u against every vertex at once.
+
+Since there is only one slot per pair of vertices, this backend has no multiedges:
+inserting an edge that already exists replaces it. Edge objects are not stored either,
+areAdjacent, incidentPairs and inicidentEdges build them when they are asked for (see
+MatrixEdge). Such an edge reads and writes its weight in the matrix, so changing
+e.weight changes the graph just like it does for a Graph, and two edges between the
+same vertices are equal. Edge keys are optional and only take space when they are not None.
+
+Every algorithm of Graph works here too, and the traversals run on the packed rows:
+    1. A search keeps its visited (or settled) vertices in a packed row of its own, so
+        the neighbors of u it has not seen yet are bits[u] & ~visited, 8 vertices per
+        byte, and only those get unpacked (bfs, dfs, iter_bfs, iter_dfs).
+    2. Shortest paths and spanning trees (distances, dijkstra, mstPrim, shortest_path,
+        k_shortest_paths) use no heap. Every vertex we settle reads a whole row anyway,
+        so the next one is an argmin over an array of tentative distances. That is
+        O(n ^ 2) in total, the size of the matrix (see __scan).
+    3. Kahn's, Tarjan's and Bellman Ford's algorithms work a row at a time.
+The algorithms that only read every edge once (mstKruskal, mstBoruvka, bfsLevels, the
+Dijkstra runs of johnson, linkAnalysis, ...) run on freeze. Trees come back as CSRGraphs
+with our vertices, since a matrix for n - 1 edges would waste most of its memory.
+
+The popcounts use np.bitwise_count, which only exists since NumPy 2. On older versions
+we look the number of bits of every byte up in a table instead.
+
+The matrices grow by doubling, so inserting a vertex is O(n) amortized. Removing a vertex
+moves the vertex with the largest id into the hole, just like Graph does with its ids.
+
+Runtime
+insertVertex -- O(n) amortized
+insertEdge / removeEdge / areAdjacent -- O(1)
+removeVertex / adjacentVertices / degree -- O(n)
+bfs / dfs / topologicalSort -- O(n ^ 2 / 8 + m)
+dijkstra / mstPrim -- O(n ^ 2)
+Memory -- O(n ^ 2) -- 4.125 bytes per pair of vertices
+'''
+
+if hasattr(np, 'bitwise_count'):
+    _popcount = np.bitwise_count
+else:
+    _BIT_COUNTS = np.array([bin(byte).count('1') for byte in range(256)], dtype=np.uint8)
+
+    def _popcount(values):
+        return _BIT_COUNTS[values]
+
+
+class MatrixEdge(Edge):
+    def __init__(self, matrix, origin, destination, key):
+        '''
+        Edge of a MatrixGraph. The matrix only has one slot per pair of vertices, so the
+        edge does not keep a weight of its own: it reads it from that slot and writes it
+        back there. Two edges are equal when they join the same vertices of the same
+        matrix (in either order when undirected), so they work as dictionary keys
+        even though every call builds a new one.
+        INPUT:
+            matrix: MatrixGraph the edge belongs to
+            origin: First vertex
+            destination: Second vertex
+            key: Key of the edge
+        '''
+
+        # Edge.__init__ would write a weight of 0 into the matrix
+        self.matrix = matrix
+        self.origin = origin
+        self.destination = destination
+        self.v1Pointer = None
+        self.v2Pointer = None
+        self.key = key
+
+    @property
+    def weight(self):
+        index = self.matrix.index
+        return float(self.matrix.weights[index[self.origin], index[self.destination]])
+
+    @weight.setter
+    def weight(self, weight):
+        index = self.matrix.index
+        u, v = index[self.origin], index[self.destination]
+        self.matrix.weights[u, v] = weight
+        if not self.matrix.directed:
+            self.matrix.weights[v, u] = weight
+
+    def __pair(self):
+        if self.matrix.directed or id(self.origin) <= id(self.destination):
+            return (self.origin, self.destination)
+        return (self.destination, self.origin)
+
+    def __eq__(self, other):
+        return isinstance(other, MatrixEdge) and other.matrix is self.matrix and other.__pair() == self.__pair()
+
+    def __hash__(self):
+        return hash(self.__pair())
+
+
+class MatrixGraph():
+    def __init__(self, directed = False, capacity = 64):
+        '''
+        Creates an empty graph with room for capacity vertices.
+        INPUT:
+            directed: Edges only go from origin to destination
+            capacity: Number of vertices we make room for up front
+        '''
+
+        capacity = max(8, -(-capacity // 8) * 8)
+        self.directed = directed
+        self.bits = np.zeros((capacity, capacity // 8), dtype=np.uint8)
+        self.weights = np.zeros((capacity, capacity), dtype=np.float32)
+        self.keys = {}
+        self.index = {}
+        self.vertexList = []
+        self.components = disjointset.DisjointSet()
+        self.componentCount = 0
+
+    def insertVertex(self, key):
+        '''
+        Creates a new vertex with the next free id. If the matrices are full we double them.
+        INPUT:
+            key: Key or data we want to insert
+        OUTPUT:
+            Inserted vertex
+
+        Runtime -- O(n) amortized
+        '''
+
+        n = len(self.vertexList)
+        if n == self.weights.shape[0]:
+            self.__grow(2 * n)
+        vert = Vertex(key)
+        self.index[vert] = n
+        self.vertexList.append(vert)
+        if self.components is not None:
+            self.components.makeSet(vert)
+            self.componentCount += 1
+        return vert
+
+    def __grow(self, capacity):
+        '''
+        Copies our matrices into larger ones.
+        '''
+
+        n = self.weights.shape[0]
+        bits = np.zeros((capacity, capacity // 8), dtype=np.uint8)
+        bits[:n, :n // 8] = self.bits
+        weights = np.zeros((capacity, capacity), dtype=np.float32)
+        weights[:n, :n] = self.weights
+        self.bits = bits
+        self.weights = weights
+
+    def insertEdge(self, origin, destination, key = None, weight = 0):
+        '''
+        Sets the bit and the weight of the edge. An edge that already exists is replaced.
+        INPUT:
+            origin: Vertex 1 that will have a new edge
+            destination: Vertex 2 that will have a new edge
+            key: Key that will be stored in the edge (optional)
+            weight: Weight of the edge (stored as a float32)
+        OUTPUT:
+            New edge
+
+        Runtime -- O(1)
+        '''
+
+        u = self.index[origin]
+        v = self.index[destination]
+        self.__set(u, v, weight)
+        if not self.directed:
+            self.__set(v, u, weight)
+        pair = self.__edgeKey(origin, destination)
+        if key is None:
+            self.keys.pop(pair, None)
+        else:
+            self.keys[pair] = key
+        if self.components is not None and self.components.findItem(origin) is not self.components.findItem(destination):
+            self.components.unionItems(origin, destination)
+            self.componentCount -= 1
+        return self.__edge(origin, destination)
+
+    def __set(self, u, v, weight):
+        self.bits[u, v >> 3] |= np.uint8(1 << (v & 7))
+        self.weights[u, v] = weight
+
+    def __clear(self, u, v):
+        self.bits[u, v >> 3] &= np.uint8(~(1 << (v & 7)) & 0xFF)
+        self.weights[u, v] = 0
+
+    def __edgeKey(self, origin, destination):
+        '''
+        Key of a pair of vertices in self.keys, ordered by id() when undirected
+        (see Graph.__edgeKey).
+        '''
+
+        if self.directed or id(origin) <= id(destination):
+            return (origin, destination)
+        return (destination, origin)
+
+    def __edge(self, origin, destination):
+        '''
+        Builds an edge object for an existing edge.
+        '''
+
+        return MatrixEdge(self, origin, destination, self.keys.get(self.__edgeKey(origin, destination)))
+
+    def removeEdge(self, origin, destination):
+        '''
+        Clears the bit and the weight of the edge.
+        INPUT:
+            origin: First vertex
+            destination: Second vertex
+
+        Runtime -- O(1)
+        '''
+
+        u = self.index[origin]
+        v = self.index[destination]
+        if not self.__has(u, v):
+            return
+        self.__clear(u, v)
+        if not self.directed:
+            self.__clear(v, u)
+        self.keys.pop(self.__edgeKey(origin, destination), None)
+        self.components = None
+
+    def removeVertex(self, v):
+        '''
+        Clears the row and column of v, then moves the row and column of the vertex with
+        the largest id into them so that the ids stay dense.
+        INPUT:
+            v: Vertex that we will remove
+
+        Runtime -- O(n)
+        '''
+
+        for adjvert in self.adjacentVertices(v) + self.__inVertices(v):
+            self.keys.pop(self.__edgeKey(v, adjvert), None)
+            self.keys.pop(self.__edgeKey(adjvert, v), None)
+        p = self.index.pop(v)
+        last = len(self.vertexList) - 1
+        self.bits[p, :] = self.bits[last, :]
+        self.weights[p, :] = self.weights[last, :]
+        column = (self.bits[:, last >> 3] >> (last & 7)) & 1
+        self.bits[:, p >> 3] = (self.bits[:, p >> 3] & np.uint8(~(1 << (p & 7)) & 0xFF)) | (column << (p & 7)).astype(np.uint8)
+        self.weights[:, p] = self.weights[:, last]
+        self.bits[last, :] = 0
+        self.weights[last, :] = 0
+        self.bits[:, last >> 3] &= np.uint8(~(1 << (last & 7)) & 0xFF)
+        self.weights[:, last] = 0
+        moved = self.vertexList.pop()
+        if moved is not v:
+            self.vertexList[p] = moved
+            self.index[moved] = p
+        self.components = None
+
+    def __has(self, u, v):
+        return bool((self.bits[u, v >> 3] >> (v & 7)) & 1)
+
+    def rowIds(self, u):
+        '''
+        Ids of the vertices the edges leaving the vertex with id u lead to, as a NumPy array.
+
+        Runtime -- O(n) -- but vectorized, 8 vertices per byte
+        '''
+
+        return self.__ids(self.bits[u])
+
+    def columnIds(self, u):
+        '''
+        Ids of the vertices with an edge entering the vertex with id u, as a NumPy array.
+        '''
+
+        n = len(self.vertexList)
+        return np.flatnonzero((self.bits[:n, u >> 3] >> (u & 7)) & 1)
+
+    def areAdjacent(self, origin, destination):
+        '''
+        Checks a single bit.
+        INPUT:
+            origin: First vertex
+            destination: Second vertex
+        OUTPUT:
+            Returns the edge if adjacent; None otherwise
+
+        Runtime -- O(1)
+        '''
+
+        if self.__has(self.index[origin], self.index[destination]):
+            return self.__edge(origin, destination)
+        return None
+
+    def adjacentVertices(self, v):
+        '''
+        Vertices we can reach with a single edge leaving v.
+
+        Runtime -- O(n)
+        '''
+
+        return [self.vertexList[t] for t in self.rowIds(self.index[v])]
+
+    def __inVertices(self, v):
+        return [self.vertexList[t] for t in self.columnIds(self.index[v])]
+
+    def incidentPairs(self, v):
+        '''
+        Yields every edge leaving v together with the vertex on the other end of it.
+
+        Runtime -- O(n)
+        '''
+
+        for adjvert in self.adjacentVertices(v):
+            yield self.__edge(v, adjvert), adjvert
+
+    def inPairs(self, v):
+        '''
+        Yields every edge entering v together with the vertex it comes from.
+
+        Runtime -- O(n)
+        '''
+
+        if not self.directed:
+            yield from self.incidentPairs(v)
+            return
+        for adjvert in self.__inVertices(v):
+            yield self.__edge(adjvert, v), adjvert
+
+    def inicidentEdges(self, v):
+        '''
+        Returns all of the edges touching v (leaving and entering it when directed).
+
+        Runtime -- O(n)
+        '''
+
+        edges = [e for e, __ in self.incidentPairs(v)]
+        if self.directed:
+            edges.extend(e for e, __ in self.inPairs(v))
+        return edges
+
+    def outDegree(self, v):
+        '''
+        Number of edges leaving a vertex, a popcount of its row.
+        '''
+
+        return int(_popcount(self.bits[self.index[v]]).sum())
+
+    def inDegree(self, v):
+        '''
+        Number of edges entering a vertex.
+        '''
+
+        return len(self.columnIds(self.index[v])) if self.directed else self.outDegree(v)
+
+    def degree(self, v):
+        '''
+        Number of incident edges (in degree plus out degree when directed).
+        '''
+
+        if self.directed:
+            return self.outDegree(v) + self.inDegree(v)
+        return self.outDegree(v)
+
+    def commonNeighbors(self, u, v):
+        '''
+        Vertices adjacent to both u and v (reachable with an edge leaving each of them
+        when directed). This is a bitwise and of two rows.
+        INPUT:
+            u: First vertex
+            v: Second vertex
+        OUTPUT:
+            List of vertices
+
+        Runtime -- O(n / 8)
+        '''
+
+        n = len(self.vertexList)
+        both = self.bits[self.index[u]] & self.bits[self.index[v]]
+        return [self.vertexList[t] for t in np.flatnonzero(np.unpackbits(both, count=n, bitorder='little'))]
+
+    def numCommonNeighbors(self, u, v):
+        '''
+        Number of common neighbors of u and v, a popcount of the two rows anded together.
+
+        Runtime -- O(n / 8)
+        '''
+
+        return int(_popcount(self.bits[self.index[u]] & self.bits[self.index[v]]).sum())
+
+    def commonNeighborCounts(self, u):
+        '''
+        Number of common neighbors of u and every other vertex, computed for every row
+        at once.
+        INPUT:
+            u: Vertex query
+        OUTPUT:
+            NumPy array indexed by vertex id
+
+        Runtime -- O(n ^ 2 / 8)
+        '''
+
+        n = len(self.vertexList)
+        return _popcount(self.bits[:n] & self.bits[self.index[u]]).sum(axis=1, dtype=np.int64)
+
+    def numEdges(self):
+        '''
+        Number of edges in our graph
+        '''
+
+        n = len(self.vertexList)
+        stored = int(_popcount(self.bits[:n]).sum())
+        if self.directed:
+            return stored
+        loops = sum(self.__has(u, u) for u in range(n))
+        return (stored + loops) // 2
+
+    def edgeArrays(self, rows = 1024):
+        '''
+        Lists every edge as parallel arrays of origin ids, destination ids and weights.
+        An undirected edge is only listed once. We unpack the matrix a block of rows at
+        a time so we never hold more than rows x n bytes of unpacked bits.
+        OUTPUT:
+            (origins, destinations, weights) NumPy arrays
+        '''
+
+        n = len(self.vertexList)
+        origins = []
+        destinations = []
+        weights = []
+        for low in range(0, n, rows):
+            high = min(low + rows, n)
+            block = np.unpackbits(self.bits[low:high], axis=1, count=n, bitorder='little')
+            if not self.directed:
+                block = np.triu(block, k=low) # only (u, v) with v >= u
+            u, v = np.nonzero(block)
+            origins.append(u + low)
+            destinations.append(v)
+            weights.append(self.weights[u + low, v].astype(np.float64))
+        if not origins:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+        return np.concatenate(origins), np.concatenate(destinations), np.concatenate(weights)
+
+    def sumWeights(self):
+        '''
+        Sums the weights of all of the edges.
+        '''
+
+        return float(self.edgeArrays()[2].sum())
+
+    def numConnectedComponents(self):
+        '''
+        Number of connected components, kept up to date on insertion just like in
+        Graph (weakly connected components when directed).
+        '''
+
+        return self.__connectivity().componentCount
+
+    def same_component(self, u, v):
+        '''
+        Checks whether there is a path between u and v (ignoring the direction of the
+        edges in a directed graph).
+        '''
+
+        components = self.__connectivity().components
+        return components.findItem(u) is components.findItem(v)
+
+    def __connectivity(self):
+        '''
+        Rebuilds the disjoint set of connected components after a removal.
+        '''
+
+        if self.components is None:
+            components = disjointset.DisjointSet(self.vertexList)
+            count = len(self.vertexList)
+            origins, destinations, __ = self.edgeArrays()
+            for u, v in zip(origins.tolist(), destinations.tolist()):
+                if components.find(u) != components.find(v):
+                    components.union(u, v)
+                    count -= 1
+            self.components = components
+            self.componentCount = count
+        return self
+
+    def freeze(self):
+        '''
+        Builds a CSRGraph with the same vertices and edges (see csrgraph.py). Every
+        algorithm of the frozen graph (dijkstra, mstPrim, bfsLevels, linkAnalysis, ...)
+        can then run on a graph built with this backend.
+        OUTPUT:
+            CSRGraph
+
+        Runtime -- O(n ^ 2 / 8 + mlg(m))
+        '''
+
+        origins, destinations, weights = self.edgeArrays()
+        keys = self.__edgeKeys(origins, destinations)
+        return CSRGraph.fromEdges(self.vertexList, origins, destinations, weights, keys, self.directed)
+
+    def __edgeKeys(self, origins, destinations):
+        '''
+        Keys of the edges between origins[i] and destinations[i], None if no edge has a key.
+        '''
+
+        if not self.keys:
+            return None
+        vertices = self.vertexList
+        return [self.keys.get(self.__edgeKey(vertices[u], vertices[v]))
+                for u, v in zip(origins.tolist(), destinations.tolist())]
+
+    def __ids(self, row):
+        '''
+        Ids of the bits set in a packed row.
+        '''
+
+        return np.flatnonzero(np.unpackbits(row, count=len(self.vertexList), bitorder='little'))
+
+    def __mark(self, mask, ids):
+        '''
+        Sets the bits of every id in a packed row of our own (a visited mask).
+        '''
+
+        np.bitwise_or.at(mask, ids >> 3, np.left_shift(1, ids & 7).astype(np.uint8))
+
+    def __emptyMask(self):
+        return np.zeros(self.bits.shape[1], dtype=np.uint8)
+
+    def bfs(self):
+        '''
+        Breadth first search of the whole graph (see Graph.bfs). The visited flags are
+        a packed row, so the neighbors of u we have not visited yet are
+        bits[u] & ~visited and the ones we have are bits[u] & visited.
+        OUTPUT:
+            Dictionary mapping every edge to True if it is a discovery edge and
+            False if it is a cross edge
+
+        Runtime -- O(n ^ 2 / 8 + m)
+        '''
+
+        return self.__labelEdges(False)
+
+    def dfs(self):
+        '''
+        Depth first search of the whole graph (see Graph.dfs and bfs).
+        OUTPUT:
+            Dictionary mapping every edge to True if it is a discovery edge and
+            False if it is a back edge
+
+        Runtime -- O(n ^ 2 / 8 + m)
+        '''
+
+        return self.__labelEdges(True)
+
+    def __labelEdges(self, depthFirst):
+        '''
+        The traversal behind bfs (with a queue) and dfs (with a stack).
+        '''
+
+        vertices = self.vertexList
+        visited = self.__emptyMask()
+        labels = {}
+        for root in range(len(vertices)):
+            if (visited[root >> 3] >> (root & 7)) & 1:
+                continue
+            visited[root >> 3] |= np.uint8(1 << (root & 7))
+            pending = Stack.Stack() if depthFirst else Queue.Queue()
+            add, take = (pending.push, pending.pop) if depthFirst else (pending.enque, pending.deque)
+            add(root)
+            while not pending.isEmpty():
+                u = take()
+                fresh = self.__ids(self.bits[u] & ~visited)
+                seen = self.__ids(self.bits[u] & visited)
+                self.__mark(visited, fresh)
+                for v in fresh.tolist():
+                    labels[self.__edge(vertices[u], vertices[v])] = True
+                    add(v)
+                for v in seen.tolist():
+                    e = self.__edge(vertices[u], vertices[v])
+                    if e not in labels:
+                        labels[e] = False
+        return labels
+
+    def iter_bfs(self, source, maxDepth = None, details = False):
+        '''
+        Lazy breadth first search from source (see Graph.iter_bfs). Only the rows of
+        the vertices we expand are read, so stopping early costs nothing more.
+        INPUT:
+            source: Vertex we start from
+            maxDepth: Maximum number of edges between the source and a reported
+                vertex (None means no limit)
+            details: If True yield (vertex, depth, parent) tuples instead of vertices
+        OUTPUT:
+            Vertices (or tuples) in breadth first order
+
+        Runtime -- O(n / 8 + deg(v)) per expanded vertex
+        '''
+
+        vertices = self.vertexList
+        visited = self.__emptyMask()
+        s = self.index[source]
+        visited[s >> 3] |= np.uint8(1 << (s & 7))
+        queue = Queue.Queue()
+        queue.enque((s, 0, None))
+        while not queue.isEmpty():
+            u, depth, parent = queue.deque()
+            yield (vertices[u], depth, parent) if details else vertices[u]
+            if maxDepth is not None and depth >= maxDepth:
+                continue
+            fresh = self.__ids(self.bits[u] & ~visited)
+            self.__mark(visited, fresh)
+            for v in fresh.tolist():
+                queue.enque((v, depth + 1, vertices[u]))
+
+    def iter_dfs(self, source, maxDepth = None, details = False):
+        '''
+        Lazy depth first search from source (see Graph.iter_dfs and iter_bfs). Graph
+        pushes every neighbor of a vertex on its own. Here every stack entry is a vertex
+        with the array of neighbors it still has to try, and we take them from the end
+        of the array, which visits the vertices in the same order. Whenever we come back
+        to an entry we drop the neighbors visited in the meantime in one vectorized step.
+        INPUT:
+            source: Vertex we start from
+            maxDepth: Maximum depth of a reported vertex (None means no limit)
+            details: If True yield (vertex, depth, parent) tuples instead of vertices
+        OUTPUT:
+            Vertices (or tuples) in depth first order
+
+        Runtime -- O(n / 8 + deg(v)) per expanded vertex
+        '''
+
+        vertices = self.vertexList
+        visited = self.__emptyMask()
+        s = self.index[source]
+        visited[s >> 3] |= np.uint8(1 << (s & 7))
+        yield (source, 0, None) if details else source
+        stack = Stack.Stack()
+        if maxDepth is None or maxDepth > 0:
+            stack.push([s, 0, self.__ids(self.bits[s] & ~visited)])
+        while not stack.isEmpty():
+            entry = stack.peek()
+            u, depth, pending = entry
+            pending = pending[((visited[pending >> 3] >> (pending & 7)) & 1) == 0]
+            if not len(pending):
+                stack.pop()
+                continue
+            v = int(pending[-1])
+            entry[2] = pending[:-1]
+            visited[v >> 3] |= np.uint8(1 << (v & 7))
+            yield (vertices[v], depth + 1, vertices[u]) if details else vertices[v]
+            if maxDepth is None or depth + 1 < maxDepth:
+                stack.push([v, depth + 1, self.__ids(self.bits[v] & ~visited)])
+
+    def cyclesExist(self):
+        '''
+        Checks whether our graph has a cycle (see Graph.cyclesExist). An undirected graph
+        has one as soon as it has more edges than a spanning forest, a directed one when
+        a topological sort cannot order all of its vertices.
+
+        Runtime -- O(n ^ 2 / 8) undirected, O(n ^ 2 / 8 + m) directed
+        '''
+
+        if self.directed:
+            return len(self.__kahn()) < len(self.vertexList)
+        return self.numEdges() > len(self.vertexList) - self.numConnectedComponents()
+
+    def topologicalSort(self):
+        '''
+        Kahn's algorithm (see Graph.topologicalSort). The in degrees are column sums of
+        the matrix and removing the edges leaving a vertex is one vectorized decrement
+        over its row.
+        OUTPUT:
+            List of vertices in topological order. Raises ValueError if the graph
+            is undirected or has a cycle.
+
+        Runtime -- O(n ^ 2 / 8 + m)
+        '''
+
+        if not self.directed:
+            raise ValueError('topological sort needs a directed graph')
+        order = self.__kahn()
+        if len(order) < len(self.vertexList):
+            raise ValueError('graph contains a cycle')
+        return order
+
+    def __kahn(self):
+        '''
+        Kahn's algorithm. Returns the vertices it could order, which is every
+        vertex exactly when the graph has no cycles.
+        '''
+
+        remaining = self.__inDegrees()
+        queue = Queue.Queue()
+        for u in np.flatnonzero(remaining == 0).tolist():
+            queue.enque(u)
+        order = []
+        while not queue.isEmpty():
+            u = queue.deque()
+            order.append(self.vertexList[u])
+            ids = self.rowIds(u)
+            remaining[ids] -= 1
+            for v in ids[remaining[ids] == 0].tolist():
+                queue.enque(v)
+        return order
+
+    def __inDegrees(self, rows = 1024):
+        '''
+        Number of edges entering every vertex, summed over blocks of unpacked rows
+        (see edgeArrays).
+        '''
+
+        n = len(self.vertexList)
+        counts = np.zeros(n, dtype=np.int64)
+        for low in range(0, n, rows):
+            block = np.unpackbits(self.bits[low:min(low + rows, n)], axis=1, count=n, bitorder='little')
+            counts += block.sum(axis=0, dtype=np.int64)
+        return counts
+
+    def stronglyConnectedComponents(self):
+        '''
+        Tarjan's algorithm over the rows of the matrix (see
+        Graph.stronglyConnectedComponents). In an undirected graph this returns the
+        connected components.
+        OUTPUT:
+            List of components, each a list of vertices, in reverse topological order
+            of the condensed graph
+
+        Runtime -- O(n ^ 2 / 8 + m)
+        '''
+
+        n = len(self.vertexList)
+        discovery = [-1] * n
+        low = [0] * n
+        onStack = bytearray(n)
+        component = Stack.Stack()
+        components = []
+        counter = 0
+        for root in range(n):
+            if discovery[root] != -1:
+                continue
+            discovery[root] = low[root] = counter
+            counter += 1
+            component.push(root)
+            onStack[root] = True
+            work = Stack.Stack()
+            work.push((root, iter(self.rowIds(root).tolist())))
+            while not work.isEmpty():
+                position, following = work.peek()
+                advanced = False
+                for v in following:
+                    if discovery[v] == -1:
+                        discovery[v] = low[v] = counter
+                        counter += 1
+                        component.push(v)
+                        onStack[v] = True
+                        work.push((v, iter(self.rowIds(v).tolist())))
+                        advanced = True
+                        break
+                    elif onStack[v]:
+                        low[position] = min(low[position], discovery[v])
+                if advanced:
+                    continue
+                work.pop()
+                if not work.isEmpty():
+                    parent = work.peek()[0]
+                    low[parent] = min(low[parent], low[position])
+                if low[position] == discovery[position]:
+                    members = []
+                    while True:
+                        member = component.pop()
+                        onStack[member] = False
+                        members.append(self.vertexList[member])
+                        if member == position:
+                            break
+                    components.append(members)
+        return components
+
+    def distances(self, start):
+        '''
+        Dijkstra's algorithm for dense graphs (see __scan).
+        OUTPUT:
+            (distance, predecessor) arrays indexed by vertex id. Unreachable vertices
+            have distance inf and every vertex without a predecessor has -1.
+
+        Runtime -- O(n ^ 2)
+        '''
+
+        return self.__scan(self.index[start])
+
+    def dijkstra(self, start):
+        '''
+        Shortest path tree from start (see Graph.dijkstra and __scan). The tree has
+        n - 1 edges at most, so it comes back as a CSRGraph instead of another matrix.
+        OUTPUT:
+            Shortest path tree as a CSRGraph with our vertices
+
+        Runtime -- O(n ^ 2)
+        '''
+
+        __, predecessor = self.__scan(self.index[start])
+        return self.__treeFromPredecessors(predecessor)
+
+    def mstPrim(self, v):
+        '''
+        Prim's algorithm for dense graphs (see Graph.mstPrim and __scan).
+        OUTPUT:
+            Minimum spanning tree of the component of v as a CSRGraph with our vertices
+
+        Runtime -- O(n ^ 2)
+        '''
+
+        if self.directed:
+            raise ValueError('minimum spanning trees are only defined for undirected graphs')
+        __, predecessor = self.__scan(self.index[v], spanning=True)
+        return self.__treeFromPredecessors(predecessor)
+
+    def __scan(self, s, target = -1, spanning = False, blocked = None, blockedEdges = None):
+        '''
+        Dijkstra's (or Prim's) algorithm without a heap. A heap pays lg(n) for every
+        edge, but in a matrix every vertex we settle has to read a whole row anyway. So
+        we keep the tentative distances of the vertices we reached in an array, settle
+        the closest one with an argmin and relax its row with a few vectorized NumPy
+        calls over its unsettled neighbors (bits[u] & ~settled). Every step is O(n),
+        which adds up to O(n ^ 2), the size of the matrix. This is the unsorted array
+        version mentioned in Graph.dijkstra, and on a dense graph it beats O(mlg(n)).
+        INPUT:
+            s: Id of the starting vertex
+            target: Stop once the vertex with this id is settled (-1 settles everything)
+            spanning: Prim's algorithm, the key of a vertex is the weight of the edge to
+                it instead of the length of the path
+            blocked: Packed mask of vertex ids we may not visit (optional)
+            blockedEdges: Dictionary from an id to an array of ids whose edges from it
+                we may not use (optional)
+        OUTPUT:
+            (distance, predecessor) arrays indexed by vertex id
+        '''
+
+        n = len(self.vertexList)
+        distance = np.full(n, np.inf)
+        predecessor = np.full(n, -1, dtype=np.int64)
+        settled = self.__emptyMask() if blocked is None else blocked.copy()
+        tentative = np.full(n, np.inf) # distance of the vertices reached but not settled
+        distance[s] = tentative[s] = 0
+        while True:
+            u = int(np.argmin(tentative))
+            if tentative[u] == np.inf:
+                break
+            tentative[u] = np.inf
+            settled[u >> 3] |= np.uint8(1 << (u & 7))
+            if u == target:
+                break
+            ids = self.__ids(self.bits[u] & ~settled)
+            if blockedEdges and u in blockedEdges:
+                ids = np.setdiff1d(ids, blockedEdges[u], assume_unique=True)
+            candidate = self.weights[u, ids].astype(np.float64)
+            if not spanning:
+                candidate += distance[u]
+            better = candidate < distance[ids]
+            ids = ids[better]
+            distance[ids] = tentative[ids] = candidate[better]
+            predecessor[ids] = u
+        return distance, predecessor
+
+    def __treeFromPredecessors(self, predecessor):
+        '''
+        Builds a CSRGraph with our vertices out of a predecessor array (-1 for none).
+        '''
+
+        destinations = np.flatnonzero(predecessor >= 0)
+        origins = predecessor[destinations]
+        weights = self.weights[origins, destinations].astype(np.float64)
+        return CSRGraph.fromEdges(self.vertexList, origins, destinations, weights,
+                                  self.__edgeKeys(origins, destinations), self.directed)
+
+    def __path(self, distance, predecessor, t):
+        '''
+        Shortest path to t as vertices.
+        OUTPUT:
+            (path, cost), ([], inf) if t was not reached
+        '''
+
+        if distance[t] == np.inf:
+            return [], math.inf
+        return [self.vertexList[v] for v in self.__walk(predecessor, t)], float(distance[t])
+
+    def __walk(self, predecessor, t):
+        '''
+        Ids from the start of a predecessor array (the id without one) to t.
+        '''
+
+        path = []
+        while t != -1:
+            path.append(t)
+            t = int(predecessor[t])
+        path.reverse()
+        return path
+
+    def shortest_path(self, source, target, heuristic = None):
+        '''
+        Point to point shortest path (see Graph.shortest_path). Every step of __scan
+        costs O(n) no matter how far the target is, so a second search from the target
+        would not save anything here: we run a single search and stop as soon as the
+        target is settled. With a heuristic we run A* instead (see __astar).
+        INPUT:
+            source: Starting vertex
+            target: Destination vertex
+            heuristic: Function heuristic(vertex, target) returning a lower bound on the
+                distance between the two vertices (optional)
+        OUTPUT:
+            (path, cost) where path is the list of vertices from source to target.
+            If there is no path we return ([], inf).
+
+        Runtime -- O(kn) where k is the number of vertices closer than the target
+        '''
+
+        if heuristic is not None:
+            return self.__astar(source, target, heuristic)
+        t = self.index[target]
+        distance, predecessor = self.__scan(self.index[source], t)
+        return self.__path(distance, predecessor, t)
+
+    def __astar(self, source, target, heuristic):
+        '''
+        A* search (see Graph.__astar) with the priorities in an array, like __scan.
+        The heuristic is only called once per vertex we reach. A vertex that is reached
+        again with a shorter distance after it was settled simply gets its priority back.
+        '''
+
+        n = len(self.vertexList)
+        s = self.index[source]
+        t = self.index[target]
+        distance = np.full(n, np.inf)
+        predecessor = np.full(n, -1, dtype=np.int64)
+        estimate = np.full(n, np.nan) # heuristic of every vertex we reached
+        priority = np.full(n, np.inf)
+        distance[s] = 0
+        estimate[s] = heuristic(source, target)
+        priority[s] = estimate[s]
+        while True:
+            u = int(np.argmin(priority))
+            if priority[u] == np.inf or u == t:
+                break
+            priority[u] = np.inf
+            ids = self.rowIds(u)
+            candidate = distance[u] + self.weights[u, ids]
+            better = candidate < distance[ids]
+            ids = ids[better]
+            distance[ids] = candidate[better]
+            predecessor[ids] = u
+            for v in ids[np.isnan(estimate[ids])].tolist():
+                estimate[v] = heuristic(self.vertexList[v], target)
+            priority[ids] = distance[ids] + estimate[ids]
+        return self.__path(distance, predecessor, t)
+
+    def k_shortest_paths(self, source, target, k):
+        '''
+        Yen's algorithm for the k shortest loopless paths (see Graph.k_shortest_paths).
+        There is at most one edge between two vertices, so a path is simply its list of
+        vertex ids. Every spur search is a __scan that starts with the root path
+        already settled and skips the blocked edges.
+        INPUT:
+            source: Starting vertex
+            target: Destination vertex
+            k: Most paths we return
+        OUTPUT:
+            List of up to k (path, cost) tuples sorted by cost, where path is the list of
+            vertices from source to target
+
+        Runtime -- O(kn ^ 3) - up to n spur searches for each of the k paths
+        '''
+
+        if k <= 0:
+            return []
+        t = self.index[target]
+        first = self.__spurPath(self.index[source], t, self.__emptyMask(), {})
+        if first is None:
+            return []
+        found = [first]
+        candidates = heap.Heap() # (cost, counter, path), the counter breaks ties
+        seen = {tuple(first[1])}
+        counter = 0
+        while len(found) < k:
+            __, path = found[-1]
+            rootCost = 0
+            for i in range(len(path) - 1):
+                blockedEdges = {}
+                for __, other in found:
+                    if len(other) > i + 1 and other[:i + 1] == path[:i + 1]:
+                        blockedEdges.setdefault(other[i], set()).add(other[i + 1])
+                        if not self.directed:
+                            blockedEdges.setdefault(other[i + 1], set()).add(other[i])
+                blocked = self.__emptyMask()
+                self.__mark(blocked, np.array(path[:i], dtype=np.int64))
+                blockedEdges = {u: np.array(sorted(vs), dtype=np.int64) for u, vs in blockedEdges.items()}
+                spurPath = self.__spurPath(path[i], t, blocked, blockedEdges)
+                if spurPath is not None:
+                    total = path[:i] + spurPath[1]
+                    if tuple(total) not in seen:
+                        seen.add(tuple(total))
+                        counter += 1
+                        candidates.insert((rootCost + spurPath[0], counter, total))
+                rootCost += float(self.weights[path[i], path[i + 1]])
+            if candidates.isEmpty():
+                break
+            cost, __, path = candidates.remove()
+            found.append((cost, path))
+        return [([self.vertexList[v] for v in path], cost) for cost, path in found]
+
+    def __spurPath(self, s, t, blocked, blockedEdges):
+        '''
+        (cost, list of ids) of the shortest path from s to t that avoids the blocked
+        vertices and edges, None if there is none.
+        '''
+
+        distance, predecessor = self.__scan(s, t, blocked=blocked, blockedEdges=blockedEdges)
+        if distance[t] == np.inf:
+            return None
+        return float(distance[t]), self.__walk(predecessor, t)
+
+    def bellmanFord(self, start):
+        '''
+        Queue based Bellman Ford's algorithm (see Graph.bellmanFord). Every vertex we
+        take off the queue relaxes its whole row at once.
+        INPUT:
+            start: Starting vertex
+        OUTPUT:
+            (distance, predecessor) arrays indexed by vertex id, just like distances
+
+        Raises ValueError if a negative cycle can be reached from start.
+
+        Runtime -- O(n ^ 3) in the worst case, usually much closer to O(n ^ 2)
+        '''
+
+        distance, predecessor, cycle = self.__spfa([self.index[start]])
+        if cycle:
+            raise ValueError('graph contains a negative cycle reachable from the start vertex')
+        return distance, predecessor
+
+    def findNegativeCycle(self):
+        '''
+        Looks for a negative cycle anywhere in our graph (see Graph.findNegativeCycle).
+        OUTPUT:
+            List of vertices on a negative cycle, empty if there is none
+        '''
+
+        __, __, cycle = self.__spfa(range(len(self.vertexList)))
+        return cycle
+
+    def johnson(self):
+        '''
+        Johnson's algorithm (see Graph.johnson). The potentials come from __spfa, the
+        Dijkstra's runs happen on the frozen CSR arrays.
+        OUTPUT:
+            (distance, nextHop) NumPy matrices indexed by vertex id
+
+        Raises ValueError if the graph has a negative cycle.
+        '''
+
+        potential, __, cycle = self.__spfa(range(len(self.vertexList)))
+        if cycle:
+            raise ValueError('graph contains a negative cycle')
+        frozen = self.freeze()
+        return allpairs.johnson(frozen.offsets, frozen.targets, frozen.weights, potential)
+
+    def __spfa(self, sources):
+        '''
+        The queue based Bellman Ford's algorithm behind bellmanFord, findNegativeCycle
+        and johnson (see Graph.__spfa). Every source starts at distance 0.
+        OUTPUT:
+            (distance, predecessor, cycle) where cycle is a list of vertices on a negative
+            cycle, empty if we did not find one
+        '''
+
+        n = len(self.vertexList)
+        distance = np.full(n, np.inf)
+        predecessor = np.full(n, -1, dtype=np.int64)
+        length = np.zeros(n, dtype=np.int64) # Number of edges on the path to every vertex
+        inQueue = bytearray(n)
+        queue = Queue.Queue()
+        for s in sources:
+            distance[s] = 0
+            inQueue[s] = True
+            queue.enque(s)
+        while not queue.isEmpty():
+            u = queue.deque()
+            inQueue[u] = False
+            ids = self.rowIds(u)
+            candidate = distance[u] + self.weights[u, ids]
+            better = candidate < distance[ids]
+            ids = ids[better]
+            if not len(ids):
+                continue
+            distance[ids] = candidate[better]
+            predecessor[ids] = u
+            length[ids] = length[u] + 1
+            if length[u] + 1 >= n:
+                cycle = self.__predecessorCycle(predecessor, int(ids[0]))
+                if cycle:
+                    return distance, predecessor, cycle
+            for v in ids.tolist():
+                if not inQueue[v]:
+                    inQueue[v] = True
+                    queue.enque(v)
+        return distance, predecessor, []
+
+    def __predecessorCycle(self, predecessor, v):
+        '''
+        Follows the predecessors from v until an id repeats (see Graph.__predecessorCycle).
+        OUTPUT:
+            List of vertices on the cycle, empty if the predecessors lead back to a source
+        '''
+
+        seen = set()
+        while v != -1 and v not in seen:
+            seen.add(v)
+            v = int(predecessor[v])
+        if v == -1:
+            return []
+        cycle = [v]
+        current = int(predecessor[v])
+        while current != v:
+            cycle.append(current)
+            current = int(predecessor[current])
+        cycle.reverse()
+        return [self.vertexList[u] for u in cycle]
+
+    def dynamicShortestPaths(self, source):
+        '''
+        Shortest path tree that is repaired after weight changes (see
+        Graph.dynamicShortestPaths). Our edges write their weight into the matrix and
+        compare equal when they join the same vertices, so tree.updateWeights takes
+        edges from areAdjacent just like it does for a Graph.
+        '''
+
+        return DynamicShortestPaths(self, source)
+
+    def contractionHierarchy(self, witnessLimit = 500):
+        '''
+        Contraction hierarchy for fast point to point queries, built straight from
+        edgeArrays (see Graph.contractionHierarchy).
+        '''
+
+        origins, destinations, weights = self.edgeArrays()
+        return ContractionHierarchy.fromEdges(self.vertexList, origins.tolist(), destinations.tolist(),
+                                              weights.tolist(), self.directed, witnessLimit)
+
+    def landmarkOracle(self, numLandmarks = 16, strategy = 'farthest'):
+        '''
+        Landmark distance oracle on the frozen graph (see Graph.landmarkOracle).
+        '''
+
+        return LandmarkOracle.fromGraph(self.freeze(), numLandmarks, strategy)
+
+    def flowNetwork(self):
+        '''
+        Residual network of our graph, using the weight of every edge as its capacity
+        (see Graph.flowNetwork).
+        OUTPUT:
+            (network, edges) where edges[i] is the edge behind the arcs 2i and 2i + 1
+        '''
+
+        origins, destinations, weights = self.edgeArrays()
+        vertices = self.vertexList
+        network = maxflow.FlowNetwork(len(vertices), origins.tolist(), destinations.tolist(),
+                                      weights.tolist(), self.directed)
+        edges = [self.__edge(vertices[u], vertices[v]) for u, v in zip(origins.tolist(), destinations.tolist())]
+        return network, edges
+
+    def maxFlow(self, source, sink, algorithm = 'dinic'):
+        '''
+        Maximum flow from source to sink and a minimum cut (see Graph.maxFlow).
+        OUTPUT:
+            (value, flows, cut) where flows maps every edge to its flow
+        '''
+
+        network, edges = self.flowNetwork()
+        s, t = self.index[source], self.index[sink]
+        if algorithm == 'dinic':
+            value, flows, reachable = network.dinic(s, t)
+        else:
+            value, flows, reachable = network.pushRelabel(s, t)
+        sourceSide = set(reachable)
+        cut = ([self.vertexList[u] for u in reachable],
+               [self.vertexList[u] for u in range(len(self.vertexList)) if u not in sourceSide])
+        return value, dict(zip(edges, flows)), cut
+
+    def mstKruskal(self):
+        '''
+        Kruskal's algorithm on the frozen graph (see Graph.mstKruskal).
+        OUTPUT:
+            Minimum spanning forest as a CSRGraph
+        '''
+
+        return self.freeze().mstKruskal()
+
+    def mstBoruvka(self, workers = 1):
+        '''
+        Borůvka's algorithm on the frozen graph (see Graph.mstBoruvka).
+        OUTPUT:
+            Minimum spanning forest as a CSRGraph
+        '''
+
+        return self.freeze().mstBoruvka(workers)
+
+    def multi_source_dijkstra(self, sources, workers = None):
+        '''
+        Dijkstra's algorithm from many sources in parallel on the frozen graph (see
+        Graph.multi_source_dijkstra).
+        '''
+
+        return self.freeze().multi_source_dijkstra(sources, workers)
+
+    def bfsLevels(self, source, alpha = 14, beta = 24):
+        '''
+        Direction optimizing breadth first search on the frozen graph (see
+        CSRGraph.bfsLevels).
+        '''
+
+        return self.freeze().bfsLevels(source, alpha, beta)
+
+    def linkAnalysis(self):
+        '''
+        PageRank, HITS and Katz centrality on the frozen graph (see Graph.linkAnalysis).
+        '''
+
+        return self.freeze().linkAnalysis()
+
+    def triangleCounter(self):
+        '''
+        Triangle counts and clustering coefficients on the frozen graph (see
+        Graph.triangleCounter).
+        '''
+
+        return self.freeze().triangleCounter()
+
+    def communityDetection(self):
+        '''
+        Label propagation and Louvain on the frozen graph (see Graph.communityDetection).
+        '''
+
+        return self.freeze().communityDetection()
+
+    @classmethod
+    def from_edge_list(cls, source, delimiter = None, weighted = True, directed = False,
+                       binary = False, frozen = False, keyType = None):
+        '''
+        Loads a graph from an edge list (see Graph.from_edge_list). We set all of the
+        bits and weights with a few vectorized NumPy calls. Since we have no multiedges,
+        an edge that shows up more than once keeps its last weight.
+        OUTPUT:
+            MatrixGraph (or CSRGraph if frozen)
+
+        Runtime -- O(n ^ 2 + mlg(m))
+        '''
+
+        keys, origins, destinations, weights = edgelist.readEdgeList(
+            source, delimiter, weighted, binary, keyType)
+        if frozen:
+            return CSRGraph.fromEdges([Vertex(key) for key in keys], origins, destinations,
+                                      weights, directed=directed)
+        matrix = cls(directed, len(keys))
+        for key in keys:
+            matrix.insertVertex(key)
+        matrix.__insertEdges(origins, destinations, weights)
+        return matrix
+
+    def __insertEdges(self, origins, destinations, weights):
+        '''
+        Sets the bits and weights of a batch of edges without keys. When a pair of
+        vertices shows up more than once, only its last edge is kept.
+        '''
+
+        origins = np.asarray(origins, dtype=np.int64)
+        destinations = np.asarray(destinations, dtype=np.int64)
+        weights = np.asarray(weights)
+        if not self.directed:
+            # Both directions of an edge next to each other, so the last edge wins in both
+            origins, destinations = np.column_stack((origins, destinations)).ravel(), np.column_stack((destinations, origins)).ravel()
+            weights = np.repeat(weights, 2)
+        pairs = origins * len(self.vertexList) + destinations
+        __, last = np.unique(pairs[::-1], return_index=True)
+        last = len(pairs) - 1 - last
+        origins = origins[last]
+        destinations = destinations[last]
+        np.bitwise_or.at(self.bits, (origins, destinations >> 3), (1 << (destinations & 7)).astype(np.uint8))
+        self.weights[origins, destinations] = weights[last]
+        self.components = None
+
+    def save(self, path):
+        '''
+        Freezes our graph and writes it to a binary snapshot (see Graph.save).
+        '''
+
+        self.freeze().save(path)
+
+    @staticmethod
+    def load(path, mmap = True):
+        '''
+        Loads a snapshot written by save as a CSRGraph (see Graph.load).
+        '''
+
+        return CSRGraph.load(path, mmap)
+
+    def floydWarshall(self, blockSize = None):
+        '''
+        Floyd Warshall's algorithm (see Graph.floydWarshall). We already have the
+        weights as a matrix, so building the distance matrix is a single np.where.
+        OUTPUT:
+            (distance, nextHop) NumPy matrices indexed by vertex id
+        '''
+
+        n = len(self.vertexList)
+        adjacent = np.unpackbits(self.bits[:n], axis=1, count=n, bitorder='little').astype(bool)
+        distance = np.where(adjacent, self.weights[:n, :n], np.inf).astype(np.float64)
+        nextHop = np.where(adjacent, np.arange(n)[None, :], -1).astype(np.int64)
+        diagonal = np.arange(n)
+        distance[diagonal, diagonal] = np.minimum(distance[diagonal, diagonal], 0)
+        nextHop[diagonal, diagonal] = diagonal
+        return allpairs.floydWarshall(distance, nextHop, blockSize)
+
+    def floydWarshallPath(self, nextHop, origin, destination):
+        '''
+        Turns the next hop matrix returned by floydWarshall into a list of vertices.
+        '''
+
+        path = allpairs.reconstructPath(nextHop, self.index[origin], self.index[destination])
+        return [self.vertexList[position] for position in path]
+
+    def __len__(self):
+        '''
+        Number of vertices in our graph
+        '''
+
+        return len(self.vertexList)
+
+    def __str__(self):
+        '''
+        String representation of our graph
+        '''
+
+        string = ''
+        for v in self.vertexList:
+            neighbors = [f'({adjvert}, Weight: {e.weight})' for e, adjvert in self.incidentPairs(v)]
+            string += f'{v}\nEdges: {neighbors}\n\n'
+        return string
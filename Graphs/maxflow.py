@@ -0,0 +1,304 @@
+from collections import deque
+
+'''
+Written by David Terpay
+Maximum flow and minimum cut. Think of every edge as a pipe whose weight is its capacity.
+The maximum flow is the most we can send from a source to a sink without going over the
+capacity of any edge, and by the max flow min cut theorem it equals the smallest total
+capacity of a set of edges whose removal separates the sink from the source.
+
+Every algorithm here works on the residual network: for every edge u -> v with capacity
+c and flow f we can still push c - f from u to v, and we can push f back from v to u
+(undoing flow). We store it in flat lists instead of objects:
+    head[a]: the vertex arc a points to
+    residual[a]: how much we can still push along arc a
+Edge i of the graph becomes the arcs 2i (forward) and 2i + 1 (backward), so the arc
+going the other way is always a ^ 1. An undirected edge can carry flow both ways, so
+both of its arcs start with the full capacity. The arcs leaving vertex u are
+arcs[first[u]:first[u + 1]], the same compressed layout csrgraph.py uses.
+
+Dinic's algorithm repeats two steps until the sink cannot be reached anymore:
+    1. A breadth first search from the source gives every vertex its level (distance in
+        edges through arcs with residual capacity left).
+    2. A depth first search sends as much flow as possible using only arcs that go from
+        one level to the next (a blocking flow). Every vertex remembers the arc it is
+        currently trying so we never look at a dead arc twice in the same phase.
+There are at most n phases, O(n ^ 2 m) in total and much faster in practice.
+
+Push relabel works on vertices instead of paths. We flood every edge leaving the source,
+which leaves extra flow (excess) on its neighbors, and then keep pushing excess downhill
+towards the sink. A vertex that has excess but no arc going downhill is lifted (relabeled)
+to one above its lowest neighbor. We always work on the highest active vertex, which
+bounds the work by O(n ^ 2 sqrt(m)). With the gap heuristic, when no vertex is left at
+some height h, nothing above h can reach the sink anymore, so we lift all of those
+vertices above n at once and their excess goes straight back to the source.
+
+Both return the same thing: the value of the flow, the flow on every edge, and the
+minimum cut (the vertices the source can still reach in the residual network, and the rest).
+'''
+
+
+class FlowNetwork():
+    def __init__(self, n, origins, destinations, capacities, directed = True):
+        '''
+        Builds the residual network.
+        INPUT:
+            n: Number of vertices (ids 0 to n - 1)
+            origins: Id of the first vertex of every edge
+            destinations: Id of the second vertex of every edge
+            capacities: Capacity of every edge
+            directed: If False every edge can carry flow in both directions
+
+        Raises ValueError if a capacity is negative.
+        '''
+
+        self.n = n
+        self.m = len(origins)
+        self.capacity = [float(c) for c in capacities]
+        if any(c < 0 for c in self.capacity):
+            raise ValueError('capacities have to be non negative')
+        self.head = []
+        self.residual = []
+        tails = []
+        for u, v, c in zip(origins, destinations, self.capacity):
+            self.head.extend((v, u))
+            self.residual.extend((c, 0.0 if directed else c))
+            tails.extend((u, v))
+        self.original = list(self.residual)
+
+        counts = [0] * (n + 1)
+        for u in tails:
+            counts[u + 1] += 1
+        for u in range(n):
+            counts[u + 1] += counts[u]
+        self.first = counts
+        self.arcs = [0] * len(tails)
+        position = list(counts[:n])
+        for a, u in enumerate(tails):
+            self.arcs[position[u]] = a
+            position[u] += 1
+
+    def reset(self):
+        '''
+        Removes all flow so the network can be solved again.
+        '''
+
+        self.residual = list(self.original)
+
+    def dinic(self, s, t):
+        '''
+        Dinic's algorithm.
+        INPUT:
+            s: Id of the source
+            t: Id of the sink
+        OUTPUT:
+            (value, flows, sourceSide) where flows[i] is the flow on edge i (negative if
+            an undirected edge carries flow from its destination to its origin) and
+            sourceSide is the list of ids on the source side of a minimum cut
+
+        Runtime -- O(n ^ 2 m)
+        '''
+
+        if s == t:
+            raise ValueError('source and sink have to be different')
+        head = self.head
+        residual = self.residual
+        first = self.first
+        arcs = self.arcs
+        value = 0.0
+        while True:
+            level = self.__levels(s)
+            if level[t] < 0:
+                break
+            current = list(first[:self.n])
+            # Iterative depth first search, path holds the arcs from s to the top vertex
+            path = []
+            u = s
+            while True:
+                if u == t:
+                    bottleneck = min(residual[a] for a in path)
+                    value += bottleneck
+                    retreat = len(path)
+                    for position, a in enumerate(path):
+                        residual[a] -= bottleneck
+                        residual[a ^ 1] += bottleneck
+                        if residual[a] == 0 and position < retreat:
+                            retreat = position
+                    del path[retreat:]
+                    u = head[path[-1]] if path else s
+                    continue
+                end = first[u + 1]
+                while current[u] < end:
+                    a = arcs[current[u]]
+                    if residual[a] > 0 and level[head[a]] == level[u] + 1:
+                        break
+                    current[u] += 1
+                if current[u] < end:
+                    path.append(arcs[current[u]])
+                    u = head[path[-1]]
+                    continue
+                # Dead end, nothing more goes through u in this phase
+                level[u] = -1
+                if not path:
+                    break
+                path.pop()
+                u = head[path[-1]] if path else s
+                current[u] += 1
+        return value, self.flows(), self.minCut(s)
+
+    def pushRelabel(self, s, t):
+        '''
+        Highest label push relabel with the gap heuristic. The heights start out as the
+        distances to the sink (a backwards breadth first search).
+        INPUT:
+            s: Id of the source
+            t: Id of the sink
+        OUTPUT:
+            (value, flows, sourceSide) just like dinic
+
+        Runtime -- O(n ^ 2 sqrt(m))
+        '''
+
+        if s == t:
+            raise ValueError('source and sink have to be different')
+        n = self.n
+        head = self.head
+        residual = self.residual
+        first = self.first
+        arcs = self.arcs
+        height = self.__heights(t)
+        height[s] = n
+        excess = [0.0] * n
+        count = [0] * (2 * n + 1) # Number of vertices at every height below n
+        for u in range(n):
+            if height[u] < n:
+                count[height[u]] += 1
+        buckets = [[] for __ in range(2 * n + 1)] # Active vertices by height
+        active = bytearray(n)
+        highest = 0
+
+        for index in range(first[s], first[s + 1]):
+            a = arcs[index]
+            pushed = residual[a]
+            if pushed > 0:
+                v = head[a]
+                residual[a] = 0
+                residual[a ^ 1] += pushed
+                excess[v] += pushed
+                excess[s] -= pushed
+                if v != t and v != s and not active[v]:
+                    active[v] = True
+                    buckets[height[v]].append(v)
+                    highest = max(highest, height[v])
+
+        current = list(first[:n])
+        while highest >= 0:
+            if not buckets[highest]:
+                highest -= 1
+                continue
+            u = buckets[highest].pop()
+            active[u] = False
+            # Discharge u
+            while excess[u] > 0:
+                if current[u] == first[u + 1]:
+                    old = height[u]
+                    lowest = 2 * n
+                    for index in range(first[u], first[u + 1]):
+                        a = arcs[index]
+                        if residual[a] > 0:
+                            lowest = min(lowest, height[head[a]])
+                    height[u] = lowest + 1
+                    current[u] = first[u]
+                    if height[u] < n:
+                        count[height[u]] += 1
+                    if old < n:
+                        count[old] -= 1
+                        if count[old] == 0 and self.__gap(old, height, count, buckets, active):
+                            highest = n + 1
+                    continue
+                a = arcs[current[u]]
+                v = head[a]
+                if residual[a] > 0 and height[u] == height[v] + 1:
+                    pushed = min(excess[u], residual[a])
+                    residual[a] -= pushed
+                    residual[a ^ 1] += pushed
+                    excess[u] -= pushed
+                    excess[v] += pushed
+                    if v != s and v != t and not active[v]:
+                        active[v] = True
+                        buckets[height[v]].append(v)
+                        highest = max(highest, height[v])
+                else:
+                    current[u] += 1
+        return excess[t], self.flows(), self.minCut(s)
+
+    def __gap(self, gap, height, count, buckets, active):
+        '''
+        No vertex is left at height gap, so every vertex between gap and n can no longer
+        reach the sink. We lift them all above n. Returns True if we moved an active vertex.
+        '''
+
+        n = self.n
+        moved = False
+        for u in range(n):
+            if gap < height[u] < n:
+                count[height[u]] -= 1
+                if active[u]:
+                    buckets[height[u]].remove(u)
+                    buckets[n + 1].append(u)
+                    moved = True
+                height[u] = n + 1
+        return moved
+
+    def __levels(self, s):
+        '''
+        Breadth first search from s through arcs with residual capacity.
+        '''
+
+        level = [-1] * self.n
+        level[s] = 0
+        queue = deque([s])
+        while queue:
+            u = queue.popleft()
+            for index in range(self.first[u], self.first[u + 1]):
+                a = self.arcs[index]
+                v = self.head[a]
+                if self.residual[a] > 0 and level[v] < 0:
+                    level[v] = level[u] + 1
+                    queue.append(v)
+        return level
+
+    def __heights(self, t):
+        '''
+        Distance of every vertex to t through arcs with residual capacity (n if t
+        cannot be reached).
+        '''
+
+        height = [self.n] * self.n
+        height[t] = 0
+        queue = deque([t])
+        while queue:
+            v = queue.popleft()
+            for index in range(self.first[v], self.first[v + 1]):
+                a = self.arcs[index]
+                u = self.head[a]
+                if self.residual[a ^ 1] > 0 and height[u] == self.n:
+                    height[u] = height[v] + 1
+                    queue.append(u)
+        return height
+
+    def flows(self):
+        '''
+        Flow on every edge: its capacity minus what is left on its forward arc.
+        '''
+
+        return [self.capacity[i] - self.residual[2 * i] for i in range(self.m)]
+
+    def minCut(self, s):
+        '''
+        Ids of the vertices s can reach in the residual network. The edges leaving this
+        set are a minimum cut once the flow is maximum.
+        '''
+
+        level = self.__levels(s)
+        return [u for u in range(self.n) if level[u] >= 0]
@@ -0,0 +1,96 @@
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import os
+import csrgraph # Used for Dijkstra's on the CSR arrays
+import snapshot # Used to map the arrays of a snapshot in every worker
+
+'''
+Written by David Terpay
+Runs Dijkstra's algorithm from many sources in parallel. Every run is independent,
+so we hand the sources out to a pool of worker processes (threads would not help
+since python only runs one thread at a time).
+
+Sending the graph along with every task would cost more than the search itself, so
+the CSR arrays (see csrgraph.py) are sent to every worker exactly once, when the worker
+starts, and stored in a module level variable. If the graph was loaded from a snapshot
+file we only send the path, and every worker maps the file itself, so all of the
+workers read the same physical pages. After that a task is just the id of a
+source vertex, and the answer is one array of n distances.
+
+We keep at most a few tasks per worker in flight and hand results back as soon as
+they finish. This keeps the pool busy without holding thousands of distance arrays
+in memory when the caller consumes them slower than we produce them.
+'''
+
+_graphArrays = None
+
+
+def _initializeWorker(offsets, targets, weights):
+    '''
+    Runs once in every worker process and stores the CSR arrays.
+    '''
+
+    global _graphArrays
+    _graphArrays = (offsets, targets, weights)
+
+
+def _mapWorker(path):
+    '''
+    Runs once in every worker process and maps the CSR arrays of a snapshot.
+    '''
+
+    global _graphArrays
+    _graphArrays = snapshot.loadArrays(path)
+
+
+def _distancesFrom(s):
+    '''
+    Task run by a worker. Returns the source id and its distance array.
+    '''
+
+    offsets, targets, weights = _graphArrays
+    distance, __ = csrgraph.dijkstraArrays(offsets, targets, weights, s)
+    return s, distance
+
+
+def multiSourceDijkstra(offsets, targets, weights, sources, workers = None, tasksPerWorker = 4, path = None):
+    '''
+    Runs Dijkstra's algorithm from every source.
+    INPUT:
+        offsets: CSR offsets
+        targets: CSR targets
+        weights: CSR weights
+        sources: Iterable of source vertex ids
+        workers: Number of worker processes (None uses every core, 1 runs
+            everything in this process)
+        tasksPerWorker: How many tasks per worker we keep in flight
+        path: Snapshot file holding the same arrays (workers map it instead of
+            receiving a copy of the arrays)
+    OUTPUT:
+        Generator of (source id, distance array) tuples in the order they finish
+    '''
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers == 1:
+        for s in sources:
+            yield s, csrgraph.dijkstraArrays(offsets, targets, weights, s)[0]
+        return
+
+    sources = iter(sources)
+    if path is None:
+        initializer, initargs = _initializeWorker, (offsets, targets, weights)
+    else:
+        initializer, initargs = _mapWorker, (path,)
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as pool:
+        running = set()
+        for s in sources:
+            running.add(pool.submit(_distancesFrom, s))
+            if len(running) >= workers * tasksPerWorker:
+                break
+        while running:
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+                following = next(sources, None)
+                if following is not None:
+                    running.add(pool.submit(_distancesFrom, following))
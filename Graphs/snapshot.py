@@ -0,0 +1,320 @@
+from array import array
+import mmap as mmapModule
+import numpy as np
+import json
+import struct
+import sys
+import csrgraph # The snapshot holds the arrays of a CSRGraph
+from vertex import Vertex
+
+'''
+Written by David Terpay
+Binary snapshots of a frozen graph. Building a large graph edge by edge (or even out
+of an edge list) can take minutes, but a CSRGraph (see csrgraph.py) is nothing more
+than a handful of flat arrays. If we write those arrays to a file exactly as they sit
+in memory, loading the graph again is just a matter of pointing at the file.
+
+Layout of a snapshot (everything is little endian):
+    header: 48 bytes
+        magic: 8 bytes, always b'PDSGRAPH'
+        version: uint32, FORMAT_VERSION
+        flags: uint32, bit 0 is set for directed graphs, bit 1 if edges have keys (and
+            so edge ids), bit 2 if targets are 8 byte integers, bit 3 if edge ids are 8
+            byte integers, bit 4 if weights are doubles
+        n: int64, number of vertices
+        slots: int64, length of the targets array (2m undirected, m directed)
+        keyTable: int64, number of bytes in the key table
+    key table: the vertex keys, then the edge keys if edges have keys (see encodeKeys)
+    offsets: int64 * (n + 1)
+    targets: int32 (or int64) * slots
+    edgeIds: int32 (or int64) * slots, only if edges have keys
+    weights: float32 (or float64) * slots
+    reverse offsets: int64 * (n + 1), only for directed graphs
+    reverse targets: int32 (or int64) * slots, only for directed graphs
+The arrays have the types the CSRGraph uses in memory (see csrgraph.py). The reverse
+arrays hold the edges entering every vertex (see CSRGraph.reverse). We save them so
+that loading a directed graph does not have to sort its edges again.
+Every array is padded so that it starts at a multiple of 8 bytes from the start of the file.
+
+When we load with mmap the arrays are never read into memory. We map the file and
+cast slices of the mapping into memoryviews of integers or floats, which the
+CSRGraph indexes exactly like array.array objects. The operating system only reads
+the pages we actually touch, and every process that maps the same file shares the
+same physical pages through the page cache. This is what makes the start up of a
+query server take milliseconds instead of minutes, and it is why multi source
+Dijkstra's workers map the file themselves instead of receiving a copy of the arrays.
+
+The keys are stored as data only (see encodeKeys), never pickled, so loading a snapshot
+from somewhere else cannot run any code. Keys can be None, booleans, integers, floats,
+strings, bytes, and tuples, lists or dictionaries of those.
+
+save -- O(n + m)
+load -- O(n) with mmap (only the key table is read), O(n + m) without
+'''
+
+MAGIC = b'PDSGRAPH'
+FORMAT_VERSION = 2
+_HEADER = struct.Struct('<8sIIqqq')
+_DIRECTED = 1
+_EDGE_KEYS = 2
+_WIDE_TARGETS = 4
+_WIDE_EDGE_IDS = 8
+_DOUBLE_WEIGHTS = 16
+_KEY_HEADER = struct.Struct('<qqq')
+_INTEGER_KEYS = 0
+_STRING_KEYS = 1
+_JSON_KEYS = 2
+
+
+def save(path, graph):
+    '''
+    Writes a CSRGraph to a snapshot file.
+    INPUT:
+        path: File we are writing
+        graph: CSRGraph we are saving
+    '''
+
+    n = len(graph.vertices)
+    slots = len(graph.targets)
+    keys = [v.getData() for v in graph.vertices]
+    edgeKeys = graph.keys if graph.edgeIds is not None else None
+    keyTable = encodeKeys(keys)
+    if edgeKeys is not None:
+        keyTable += encodeKeys(edgeKeys)
+    flags = _DIRECTED if graph.directed else 0
+    if edgeKeys is not None:
+        flags |= _EDGE_KEYS
+        if np.asarray(graph.edgeIds).itemsize == 8:
+            flags |= _WIDE_EDGE_IDS
+    if np.asarray(graph.targets).itemsize == 8:
+        flags |= _WIDE_TARGETS
+    if np.asarray(graph.weights).itemsize == 8:
+        flags |= _DOUBLE_WEIGHTS
+    layout = _layout(flags, n, slots)
+    values = [graph.offsets, graph.targets, graph.edgeIds, graph.weights]
+    if graph.directed:
+        values.extend(graph.reverse)
+    with open(path, 'wb') as snapshot:
+        snapshot.write(_HEADER.pack(MAGIC, FORMAT_VERSION, flags, n, slots, len(keyTable)))
+        snapshot.write(keyTable)
+        for array, (length, typecode) in zip(values, layout):
+            if typecode is not None:
+                data = np.asarray(array, dtype='<' + typecode).tobytes()
+                snapshot.write(data + bytes(-len(data) % 8))
+
+
+def load(path, mmap = True):
+    '''
+    Reads a snapshot file back into a CSRGraph. The vertices are new Vertex objects
+    holding the keys we saved.
+    INPUT:
+        path: File we are reading
+        mmap: Map the arrays instead of copying them into memory
+    OUTPUT:
+        CSRGraph
+    '''
+
+    header, keyTable, arrays = _open(path, mmap)
+    __, __, flags, __, __, __ = header
+    offsets, targets, edgeIds, weights = arrays[:4]
+    keys, used = decodeKeys(keyTable)
+    edgeKeys = decodeKeys(keyTable[used:])[0] if flags & _EDGE_KEYS else None
+    graph = csrgraph.CSRGraph([Vertex(key) for key in keys], offsets, targets, weights,
+                              edgeIds, edgeKeys, bool(flags & _DIRECTED), tuple(arrays[4:]) or None)
+    graph.path = path if mmap else None
+    return graph
+
+
+def loadArrays(path):
+    '''
+    Maps only the offsets, targets and weights of a snapshot. Worker processes use
+    this to share the pages of the file instead of receiving a copy of the arrays.
+    INPUT:
+        path: File we are reading
+    OUTPUT:
+        (offsets, targets, weights)
+    '''
+
+    __, __, (offsets, targets, __, weights, *__) = _open(path, True)
+    return offsets, targets, weights
+
+
+def encodeKeys(keys):
+    '''
+    Encodes a list of keys as data only, so that decoding it can never run code the way
+    unpickling can. We pick the most compact of three encodings:
+        integers: every key is an int that fits in 8 bytes, stored as an int64 array
+        strings: every key is a str, stored as int64 end offsets and the UTF-8 bytes
+        JSON: anything else. Tuples, bytes and dictionaries (which JSON does not have)
+            become {"tuple": [...]}, {"bytes": "hex"} and {"dict": [[key, value], ...]}.
+    The encoded table starts with its own header (encoding, number of keys, number of
+    bytes that follow) and is padded to 8 bytes, so tables can be written back to back.
+    INPUT:
+        keys: List of keys
+    OUTPUT:
+        bytes
+
+    Raises ValueError if a key holds something other than None, booleans, numbers,
+    strings, bytes, tuples, lists and dictionaries.
+    '''
+
+    if all(type(key) is int and -2 ** 63 <= key < 2 ** 63 for key in keys):
+        kind, payload = _INTEGER_KEYS, np.asarray(keys, dtype='<i8').tobytes()
+    elif all(type(key) is str for key in keys):
+        encoded = [key.encode('utf-8') for key in keys]
+        ends = np.cumsum([len(key) for key in encoded], dtype=np.int64)
+        kind, payload = _STRING_KEYS, ends.astype('<i8').tobytes() + b''.join(encoded)
+    else:
+        kind, payload = _JSON_KEYS, json.dumps([_toJson(key) for key in keys]).encode('utf-8')
+    payload += bytes(-len(payload) % 8)
+    return _KEY_HEADER.pack(kind, len(keys), len(payload)) + payload
+
+
+def decodeKeys(buffer):
+    '''
+    Decodes a table written by encodeKeys.
+    INPUT:
+        buffer: bytes or memoryview starting with the table
+    OUTPUT:
+        (list of keys, number of bytes the table used)
+
+    Raises ValueError if the table is damaged.
+    '''
+
+    if len(buffer) < _KEY_HEADER.size:
+        raise ValueError('the key table is truncated')
+    kind, count, length = _KEY_HEADER.unpack_from(buffer)
+    end = _KEY_HEADER.size + length
+    if count < 0 or length < 0 or len(buffer) < end:
+        raise ValueError('the key table is truncated')
+    payload = buffer[_KEY_HEADER.size:end]
+    if kind == _INTEGER_KEYS:
+        keys = np.frombuffer(payload, dtype='<i8', count=count).tolist()
+    elif kind == _STRING_KEYS:
+        ends = np.frombuffer(payload, dtype='<i8', count=count).tolist()
+        text = bytes(payload[8 * count:8 * count + (ends[-1] if count else 0)])
+        starts = [0] + ends[:-1]
+        if text.isascii(): # One character per byte, so we can slice the decoded string
+            text = text.decode('ascii')
+            keys = [text[start:stop] for start, stop in zip(starts, ends)]
+        else:
+            keys = [text[start:stop].decode('utf-8') for start, stop in zip(starts, ends)]
+    elif kind == _JSON_KEYS:
+        keys = [_fromJson(key) for key in json.loads(bytes(payload).rstrip(b'\0'))]
+        if len(keys) != count:
+            raise ValueError('the key table is damaged')
+    else:
+        raise ValueError(f'unknown key encoding {kind}')
+    return keys, end
+
+
+def _toJson(key):
+    '''
+    Turns a key into something json.dumps understands (see encodeKeys).
+    '''
+
+    if key is None or isinstance(key, (bool, int, float, str)):
+        return key
+    if isinstance(key, tuple):
+        return {'tuple': [_toJson(item) for item in key]}
+    if isinstance(key, list):
+        return [_toJson(item) for item in key]
+    if isinstance(key, (bytes, bytearray)):
+        return {'bytes': bytes(key).hex()}
+    if isinstance(key, dict):
+        return {'dict': [[_toJson(k), _toJson(v)] for k, v in key.items()]}
+    raise ValueError(f'cannot save a key of type {type(key).__name__}')
+
+
+def _fromJson(value):
+    '''
+    Inverse of _toJson.
+    '''
+
+    if isinstance(value, list):
+        return [_fromJson(item) for item in value]
+    if isinstance(value, dict):
+        if 'tuple' in value:
+            return tuple(_fromJson(item) for item in value['tuple'])
+        if 'bytes' in value:
+            return bytes.fromhex(value['bytes'])
+        if 'dict' in value:
+            return {_fromJson(k): _fromJson(v) for k, v in value['dict']}
+        raise ValueError('the key table is damaged')
+    return value
+
+
+def _layout(flags, n, slots):
+    '''
+    Length and typecode of every array in a snapshot, in the order they are stored. An
+    array the snapshot does not hold has typecode None.
+    '''
+
+    targetType = 'q' if flags & _WIDE_TARGETS else 'i'
+    edgeIdType = None
+    if flags & _EDGE_KEYS:
+        edgeIdType = 'q' if flags & _WIDE_EDGE_IDS else 'i'
+    layout = [(n + 1, 'q'), (slots, targetType), (slots, edgeIdType), (slots, 'd' if flags & _DOUBLE_WEIGHTS else 'f')]
+    if flags & _DIRECTED:
+        layout.extend(((n + 1, 'q'), (slots, targetType)))
+    return layout
+
+
+def _open(path, mmap):
+    '''
+    Checks the header of a snapshot and returns the header, the key table and the
+    arrays (offsets, targets, edgeIds or None, weights, and the reverse offsets and
+    targets of a directed graph).
+    '''
+
+    with open(path, 'rb') as snapshot:
+        if mmap:
+            buffer = memoryview(mmapModule.mmap(snapshot.fileno(), 0, access=mmapModule.ACCESS_READ))
+        else:
+            buffer = memoryview(snapshot.read())
+    if len(buffer) < _HEADER.size:
+        raise ValueError(f'{path} is not a graph snapshot')
+    header = _HEADER.unpack_from(buffer)
+    magic, version, flags, n, slots, keyTableLength = header
+    if magic != MAGIC:
+        raise ValueError(f'{path} is not a graph snapshot')
+    if version != FORMAT_VERSION:
+        raise ValueError(f'{path} has snapshot version {version}, expected {FORMAT_VERSION}')
+    layout = _layout(flags, n, slots)
+    sizes = [0 if typecode is None else _padded(length * struct.calcsize(typecode)) for length, typecode in layout]
+    position = _HEADER.size + keyTableLength
+    if len(buffer) != position + sum(sizes):
+        raise ValueError(f'{path} is truncated')
+
+    keyTable = buffer[_HEADER.size:position]
+    arrays = []
+    for (length, typecode), size in zip(layout, sizes):
+        if typecode is None:
+            arrays.append(None)
+            continue
+        arrays.append(_view(buffer[position:position + length * struct.calcsize(typecode)], typecode, mmap))
+        position += size
+    return header, keyTable, arrays
+
+
+def _padded(size):
+    '''
+    Rounds a number of bytes up to a multiple of 8.
+    '''
+
+    return size + (-size % 8)
+
+
+def _view(buffer, typecode, mmap):
+    '''
+    Interprets little endian bytes as integers ('i' or 'q') or floats ('f' or 'd').
+    Mapped files are cast in place, everything else is copied into an array.array.
+    '''
+
+    if sys.byteorder != 'little':
+        return csrgraph._asArray(typecode, np.frombuffer(buffer, dtype='<' + typecode))
+    if mmap:
+        return buffer.cast(typecode)
+    values = array(typecode)
+    values.frombytes(buffer)
+    return values
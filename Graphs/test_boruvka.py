@@ -0,0 +1,65 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import unittest
+import random
+import numpy as np
+from graph import Graph
+import boruvka
+
+'''
+Written by David Terpay
+Checks the parallel version of Borůvka's algorithm (see boruvka.py) against Kruskal's
+algorithm. Run it with python -m pytest from the root of the repository, or from this
+directory with
+    python -m unittest test_boruvka
+'''
+
+
+class TestParallelBoruvka(unittest.TestCase):
+    def setUp(self):
+        '''
+        Random graph with a few thousand vertices and distinct weights (so the minimum
+        spanning forest is unique). It has several connected components, and we split
+        its edges into many more chunks than there are workers, so every round of the
+        parallel version goes through the pool.
+        '''
+
+        rng = random.Random(7)
+        self.graph = Graph()
+        self.vertices = [self.graph.insertVertex(i) for i in range(3000)]
+        weights = rng.sample(range(10 ** 6), 12000)
+        for i, w in enumerate(weights):
+            u, v = rng.sample(range(2900), 2) # The last 100 vertices stay alone
+            self.graph.insertEdge(self.vertices[u], self.vertices[v], i, w)
+
+    def __edgeSet(self, tree):
+        '''
+        Sorted (key, key, weight) tuples of the edges of a tree.
+        '''
+
+        return sorted(tuple(sorted((e.origin.getData(), e.destination.getData()))) + (e.weight,)
+                      for e in tree.edges.toList())
+
+    def testMatchesKruskal(self):
+        kruskal = self.graph.mstKruskal()
+        parallel = self.graph.mstBoruvka(workers=2)
+        self.assertEqual(self.__edgeSet(parallel), self.__edgeSet(kruskal))
+        self.assertEqual(parallel.numConnectedComponents(), kruskal.numConnectedComponents())
+
+    def testUsesManyChunks(self):
+        index = self.graph.index
+        edges = self.graph.edges.toList()
+        origins = [index[e.origin] for e in edges]
+        destinations = [index[e.destination] for e in edges]
+        weights = [e.weight for e in edges]
+        single = boruvka.minimumSpanningForest(len(self.vertices), origins, destinations, weights)
+        parallel = boruvka.minimumSpanningForest(len(self.vertices), origins, destinations, weights,
+                                                 workers=3, chunkSize=500)
+        self.assertEqual(sorted(parallel.tolist()), sorted(single.tolist()))
+        self.assertAlmostEqual(float(np.asarray(weights)[parallel].sum()), self.graph.mstKruskal().sumWeights())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import unittest
+from graph import Graph
+
+'''
+Written by David Terpay
+Checks that self loops (an edge from a vertex to itself) keep the adjacency list in
+graph.py consistent, both when they are inserted one at a time and when a whole edge
+list is loaded with from_edge_list, and that the frozen copy reports edge 0 as an edge.
+Run it with python -m pytest from the root of the
+repository, or from this directory with
+    python -m unittest test_graph
+'''
+
+
+class TestSelfLoops(unittest.TestCase):
+    def setUp(self):
+        '''
+        Edge list with a self loop in front of a regular edge, the way real edge dumps
+        often have them.
+        '''
+
+        self.graph = Graph.from_edge_list(['a,a,1', 'a,b,2'], delimiter=',')
+        self.vertex = {v.getData(): v for v in self.graph.vertexList}
+
+    def testQueries(self):
+        a, b = self.vertex['a'], self.vertex['b']
+        distance, predecessor = self.graph.distances(a)
+        self.assertEqual(distance, [0, 2])
+        self.assertEqual(predecessor, [None, a])
+        self.assertEqual(self.graph.degree(a), 2)
+        self.assertEqual(self.graph.edges.length, 2)
+        self.assertEqual(self.graph.areAdjacent(a, a).weight, 1)
+        self.assertTrue(self.graph.cyclesExist())
+        self.assertEqual(len(self.graph.bfs()), 2)
+        self.assertEqual(self.graph.freeze().bfsOrder(), [a, b])
+        self.assertEqual(self.graph.mstKruskal().sumWeights(), 2)
+        self.assertEqual(len(self.graph.k_shortest_paths(a, b, 1)), 1)
+        self.assertEqual(self.graph.k_shortest_paths(a, b, 0), [])
+        self.assertEqual(self.graph.k_shortest_paths(a, b, -1), [])
+
+    def testRemoval(self):
+        a, b = self.vertex['a'], self.vertex['b']
+        self.graph.removeEdge(a, a)
+        self.assertIsNone(self.graph.areAdjacent(a, a))
+        self.assertEqual(self.graph.degree(a), 1)
+        self.assertFalse(self.graph.cyclesExist())
+        self.graph.insertEdge(a, a, None, 5)
+        self.graph.removeVertex(a)
+        self.assertEqual(self.graph.edges.length, 0)
+        self.assertEqual(self.graph.degree(b), 0)
+
+    def testDirected(self):
+        graph = Graph(directed=True)
+        v = graph.insertVertex(1)
+        graph.insertEdge(v, v, None, 1)
+        self.assertEqual((graph.outDegree(v), graph.inDegree(v)), (1, 1))
+        self.assertTrue(graph.cyclesExist())
+        graph.removeVertex(v)
+        self.assertEqual(graph.edges.length, 0)
+
+
+class TestFrozenEdges(unittest.TestCase):
+    def testFirstEdge(self):
+        '''
+        The edge with id 0 has to count as an edge even though 0 is falsy.
+        '''
+
+        graph = Graph()
+        a, b, c = (graph.insertVertex(x) for x in 'abc')
+        graph.insertEdge(a, b, 'ab', 1)
+        graph.insertEdge(b, c, 'bc', 2)
+        frozen = graph.freeze()
+        for origin, destination, key in ((a, b, 'ab'), (b, c, 'bc')):
+            self.assertTrue(frozen.areAdjacent(origin, destination))
+            self.assertEqual(frozen.edgeKey(frozen.edgeId(origin, destination)), key)
+        self.assertIn(0, frozen.edgeIds)
+        self.assertIsNone(frozen.areAdjacent(a, c))
+        self.assertIsNone(frozen.edgeId(a, c))
+        self.assertTrue(graph.freeze(keys=False).areAdjacent(a, b))
+        with self.assertRaises(ValueError):
+            graph.freeze(keys=False).edgeId(a, b)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+import numpy as np
+
+'''
+Written by David Terpay
+Triangle counting and clustering coefficients. The local clustering coefficient of a
+vertex is the fraction of pairs of its neighbors that are adjacent themselves:
+    c(v) = 2 * triangles(v) / (deg(v) * (deg(v) - 1))
+and the global one (transitivity) is three times the number of triangles divided by the
+number of paths of length two. Edge directions, weights, self loops and parallel edges
+play no role, so we first reduce the graph to a simple undirected one.
+
+A triangle is found by intersecting neighbor lists: u, v, w form a triangle if w is a
+neighbor of both u and v. Intersecting the full lists for every edge costs O(m * maxdeg),
+which is hopeless on a social graph with a few vertices of huge degree. Instead we use a
+degree ordered view of the graph:
+    1. Rank the vertices by degree (ties broken by id).
+    2. Keep every edge only in the direction from the lower ranked vertex to the higher
+        ranked one, and sort every list of neighbors (compressed like csrgraph.py).
+Every triangle u < v < w (by rank) is now found exactly once, through the edge u -> v and
+the vertex w in both lists. A vertex with k higher ranked neighbors has at least k
+neighbors of degree k or more, so no list is longer than sqrt(2m) and the total work is
+O(m^1.5).
+
+For the intersection itself we do not loop over the edges in python. For a chunk of edges
+u -> v we gather every w in the list of v at once (the wedges u -> v -> w), encode u -> w
+as the single number u * n + w, and look all of them up with np.searchsorted in the
+sorted codes of every edge of the view. This is the merge intersection of the two sorted
+lists, done for a whole chunk of edges with a couple of NumPy calls.
+
+Runtime -- O(m^1.5) -- (times lg(m) for the lookups)
+Memory -- O(n + m + chunkSize)
+'''
+
+
+class TriangleCounter():
+    def __init__(self, graph, chunkSize = 1 << 20):
+        '''
+        Builds the degree ordered view of a CSRGraph.
+        INPUT:
+            graph: CSRGraph (use Graph.triangleCounter to build one from a Graph)
+            chunkSize: Roughly how many wedges we check with one batch of NumPy calls
+        '''
+
+        self.vertices = graph.vertices
+        self.index = graph.index
+        self.chunkSize = chunkSize
+        n = len(graph.vertices)
+        offsets = np.asarray(graph.offsets, dtype=np.int64)
+        sources = np.repeat(np.arange(n, dtype=np.int64), np.diff(offsets))
+        targets = np.asarray(graph.targets, dtype=np.int64)
+
+        # Simple undirected edges u < v, every one of them once
+        low = np.minimum(sources, targets)
+        high = np.maximum(sources, targets)
+        keep = low != high
+        codes = np.unique(low[keep] * n + high[keep])
+        low, high = codes // max(n, 1), codes % max(n, 1)
+        self.degree = np.bincount(np.concatenate((low, high)), minlength=n)
+
+        # Degree ordering, every edge goes from the lower to the higher ranked vertex
+        rank = np.empty(n, dtype=np.int64)
+        rank[np.lexsort((np.arange(n), self.degree))] = np.arange(n)
+        forward = rank[low] < rank[high]
+        origins = np.where(forward, low, high)
+        destinations = np.where(forward, high, low)
+        order = np.lexsort((destinations, origins))
+        self.targets = destinations[order]
+        self.offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(origins, minlength=n), out=self.offsets[1:])
+        self.triangles = None
+
+    def vertexTriangles(self):
+        '''
+        Number of triangles every vertex is part of.
+        OUTPUT:
+            NumPy array indexed by vertex id
+
+        Runtime -- O(m^1.5)
+        '''
+
+        if self.triangles is None:
+            self.triangles = self.__count()
+        return self.triangles
+
+    def numTriangles(self):
+        '''
+        Number of triangles in the graph.
+        '''
+
+        return int(self.vertexTriangles().sum()) // 3
+
+    def localClustering(self):
+        '''
+        Local clustering coefficient of every vertex (0 for vertices with fewer than two
+        neighbors).
+        OUTPUT:
+            NumPy array indexed by vertex id
+        '''
+
+        pairs = self.degree * (self.degree - 1) / 2
+        return np.divide(self.vertexTriangles(), pairs, out=np.zeros(len(pairs)), where=pairs > 0)
+
+    def averageClustering(self):
+        '''
+        Average of the local clustering coefficients over every vertex.
+        '''
+
+        if not len(self.vertices):
+            return 0.0
+        return float(self.localClustering().mean())
+
+    def transitivity(self):
+        '''
+        Global clustering coefficient: 3 * triangles / paths of length two.
+        '''
+
+        paths = int((self.degree * (self.degree - 1) // 2).sum())
+        return 3 * self.numTriangles() / paths if paths else 0.0
+
+    def __count(self):
+        '''
+        Finds every triangle of the degree ordered view once and counts it for all three
+        of its vertices.
+        '''
+
+        n = len(self.vertices)
+        offsets, targets = self.offsets, self.targets
+        counts = np.zeros(n, dtype=np.int64)
+        if not len(targets):
+            return counts
+        sources = np.repeat(np.arange(n, dtype=np.int64), np.diff(offsets))
+        codes = sources * n + targets # Sorted since the lists are
+        outDegree = np.diff(offsets)
+        wedges = np.cumsum(outDegree[targets]) # Wedges up to and including every edge
+        start = 0
+        while start < len(targets):
+            end = int(np.searchsorted(wedges, wedges[start] - outDegree[targets[start]] + self.chunkSize, 'right'))
+            end = max(end, start + 1)
+            u, v = sources[start:end], targets[start:end]
+            width = outDegree[v]
+            total = int(width.sum())
+            if total:
+                slots = np.repeat(offsets[v] - (np.cumsum(width) - width), width) + np.arange(total)
+                w = targets[slots]
+                u, v = np.repeat(u, width), np.repeat(v, width)
+                wanted = u * n + w
+                found = np.searchsorted(codes, wanted)
+                closed = codes[np.minimum(found, len(codes) - 1)] == wanted
+                for ends in (u[closed], v[closed], w[closed]):
+                    counts += np.bincount(ends, minlength=n)
+            start = end
+        return counts
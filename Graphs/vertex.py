@@ -1,7 +1,6 @@
 import sys
 sys.path.append('../')
 from Linked_List import LinkedList
-import math
 '''
 Written by David Terpay
 This is a class that will represent our vertex. 
@@ -12,27 +11,12 @@ Our vertex will hold two things:
 class Vertex():
     def __init__(self, data, listEdge = None):
         '''
-        Our vertex stores the data and a linked list of edges
+        Our vertex stores the data and a linked list of edges. Any state an
+        algorithm needs (visited, weight, predecessor) is kept by the algorithm
+        itself, indexed by the id the graph gave this vertex.
         '''
 
         self.__data = data
-        self.predecessor = None
-        self.weight = math.inf
-        self.__visited = False
-    
-    def setVisited(self, var):
-        '''
-        Setter for encapsulated data
-        '''
-
-        self.__visited = var
-    
-    def getVisited(self):
-        '''
-        Getter for encapsulated data
-        '''
-
-        return self.__visited
 
     def getData(self):
         '''
@@ -47,12 +31,6 @@ class Vertex():
         '''
 
         return self.__data
-    
-    def __lt__(self, other):
-        return self.weight < other.weight
-
-    def __gt__(self, other):
-        return self.weight > other.weight
 
     def __str__(self):
         string = f'Data: {self.__data}'
@@ -1 +1,2 @@
 from Heaps import heap
+from Heaps import indexedheap
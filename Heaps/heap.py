@@ -55,7 +55,11 @@ class Heap():
         if self.size == self.capacity:
             self.growArray()
         if self.size == 0:
-            self.array.append(data)
+            # The array keeps its empty slots after we remove everything
+            if len(self.array) > 1:
+                self.array[1] = data
+            else:
+                self.array.append(data)
             self.size += 1
         else:
             self.size += 1
@@ -262,7 +266,7 @@ class Heap():
             True if empty, false if not.
         '''
 
-        return not self.array[1]
+        return self.size == 0
 
     def buildHeap(self, lst = None):
         '''
@@ -0,0 +1,220 @@
+'''
+Written by David Terpay
+This class is an indexed (min)heap, also known as an indexed priority queue.
+It works exactly like the heap in heap.py, the array is rooted at index 1 and
+the children of index i live at 2i and 2i + 1, but with two extra hash tables
+on the side:
+    1. position: maps every item (handle) to its index in the array
+    2. keys: maps every item (handle) to its current priority
+Because we always know where an item lives in the array, we never have to
+rebuild the heap when the priority of one item changes. We simply change
+the key and heapify up from the position of that item. This is exactly the
+operation Dijkstra's and Prim's algorithms need when they relax an edge.
+
+Items have to be hashable and can only be in the heap once. The priorities
+are stored next to the items instead of inside of them, so the same item can
+have different priorities in two different heaps at the same time.
+
+insert -- O(lg(n))
+pop_min -- O(lg(n))
+decrease_key -- O(lg(n))
+contains -- O(1)
+'''
+
+
+class IndexedHeap():
+    def __init__(self):
+        '''
+        We keep track of the array of items, the position of every item in
+        the array, the key (priority) of every item, and the size of the heap.
+        '''
+
+        self.array = [None]
+        self.position = {}
+        self.keys = {}
+        self.size = 0
+
+    def insert(self, item, key):
+        '''
+        Insert places the new item at the very end of the array and heapifies
+        up from there.
+        INPUT:
+            item: Handle we are inserting
+            key: Priority of the item
+        OUTPUT:
+            Heap with new item
+
+        Runtime -- O(lg(n)) -- Since heapifyUp runs in time proportional to the
+        height of the tree. Inserting items in sorted order costs O(1) each.
+        '''
+
+        if item in self.position:
+            raise KeyError(f'{item} is already in the heap')
+        self.size += 1
+        if self.size == len(self.array):
+            self.array.append(item)
+        else:
+            self.array[self.size] = item
+        self.position[item] = self.size
+        self.keys[item] = key
+        self.heapifyUp(self.size)
+
+    def contains(self, item):
+        '''
+        Checks whether an item is currently stored in the heap.
+        INPUT:
+            item: Handle we are looking for
+        OUTPUT:
+            True if the item is in the heap, false if not.
+
+        Runtime -- O(1) -- Hash table lookup.
+        '''
+
+        return item in self.position
+
+    def key(self, item):
+        '''
+        Returns the current priority of an item in the heap.
+        INPUT:
+            item: Handle we are looking for
+        OUTPUT:
+            Priority of the item
+        '''
+
+        return self.keys[item]
+
+    def decrease_key(self, item, key):
+        '''
+        Lowers the priority of an item that is already in the heap. Since the
+        key only gets smaller, the heap property can only be broken between the
+        item and its ancestors, so we only have to heapify up.
+        INPUT:
+            item: Handle whose priority we are lowering
+            key: New priority, must not be larger than the current one
+        OUTPUT:
+            Heap with the item moved to its new position
+
+        Runtime -- O(lg(n)) -- We might have to move the item up to the root.
+        '''
+
+        if key > self.keys[item]:
+            raise ValueError(f'new key {key} is larger than the current key {self.keys[item]}')
+        self.keys[item] = key
+        self.heapifyUp(self.position[item])
+
+    def peek(self):
+        '''
+        Returns the item with the smallest priority and its priority without
+        removing it.
+        OUTPUT:
+            (item, key) tuple
+        '''
+
+        if self.size == 0:
+            raise IndexError('peek from an empty heap')
+        item = self.array[1]
+        return item, self.keys[item]
+
+    def pop_min(self):
+        '''
+        Removes the item with the smallest priority. We swap the root with the
+        last item in the array, forget about the old root and heapify down.
+        INPUT: None
+        OUTPUT:
+            (item, key) tuple of the removed item
+
+        Runtime -- O(lg(n)) -- We might have to heapify down the entire height.
+        '''
+
+        if self.size == 0:
+            raise IndexError('pop from an empty heap')
+        item = self.array[1]
+        self.swap(1, self.size)
+        self.array[self.size] = None
+        self.size -= 1
+        del self.position[item]
+        key = self.keys.pop(item)
+        if self.size:
+            self.heapifyDown(1)
+        return item, key
+
+    def heapifyUp(self, index):
+        '''
+        Moves the item at index up while it is smaller than its parent. This is
+        done iteratively so that large heaps do not hit the recursion limit.
+        INPUT:
+            index: Index we are moving upwards with
+        OUTPUT:
+            Array that maintains the heap property
+        '''
+
+        keys = self.keys
+        array = self.array
+        while index > 1:
+            parent = index // 2
+            if keys[array[index]] < keys[array[parent]]:
+                self.swap(index, parent)
+                index = parent
+            else:
+                return
+
+    def heapifyDown(self, index=1):
+        '''
+        Moves the item at index down while it is larger than its smallest child.
+        INPUT:
+            index: Index we are moving downwards with
+        OUTPUT:
+            Array that maintains the heap property
+        '''
+
+        keys = self.keys
+        array = self.array
+        while index * 2 <= self.size:
+            child = index * 2
+            if child + 1 <= self.size and keys[array[child + 1]] < keys[array[child]]:
+                child += 1
+            if keys[array[child]] < keys[array[index]]:
+                self.swap(index, child)
+                index = child
+            else:
+                return
+
+    def swap(self, low, upper):
+        '''
+        Swaps the items stored at low and upper and updates their positions.
+        INPUT:
+            low: Lower index we want to swap.
+            upper: Upper index we want to swap.
+        OUTPUT:
+            Array with items swapped
+        '''
+
+        array = self.array
+        array[low], array[upper] = array[upper], array[low]
+        self.position[array[low]] = low
+        self.position[array[upper]] = upper
+
+    def isEmpty(self):
+        '''
+        Checks if heap is empty
+        INPUT: None
+        OUTPUT:
+            True if empty, false if not.
+        '''
+
+        return self.size == 0
+
+    def __contains__(self, item):
+        return self.contains(item)
+
+    def __len__(self):
+        return self.size
+
+    def __str__(self):
+        '''
+        String representation of our indexed heap. Shows the size and the
+        (item, key) pairs in array order.
+        '''
+
+        pairs = [(str(item), self.keys[item]) for item in self.array[1:self.size + 1]]
+        return 'Size is : ' + str(self.size) + '\nArray : ' + str(pairs)